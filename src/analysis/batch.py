@@ -0,0 +1,224 @@
+"""
+여러 경기 일괄 분석 모듈
+
+game_id 목록 또는 match_info 조건(날짜 범위, 팀, 라운드)으로 경기를 골라
+공용 프로세스 풀(src.analysis.process_pool)에서 병렬로 분석하고, 끝나는 순서대로 결과를 돌려줍니다 (API에서는 NDJSON 스트리밍).
+
+- 작업 단위는 경기 하나이며, 각 경기 데이터는 한 번만 읽습니다.
+  파티션/이벤트 저장소 디렉터리는 작업자가 해당 경기만 읽고,
+  raw_data.csv는 부모 프로세스가 선택된 경기 행만 한 번 골라 경기별로 나눠 줍니다.
+- 경기별 결과는 GET /analyze/{game_id} 응답과 같은 형식이며,
+  실패한 경기는 {"game_id", "error"} 한 줄로 대신합니다.
+"""
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Union
+import pandas as pd
+from pydantic import BaseModel, Field
+from src.data.models import MatchData
+from src.data.loader import load_raw_data, convert_kleague_to_match_data
+from src.analysis.turning_point import DETECTION_METHODS, detect_turning_points
+from src.analysis.bootstrap import MAX_REPLICATES, assign_bootstrap_confidence
+from src.analysis import process_pool
+from src.analysis.shape import team_shape_to_dict
+from src.analysis.possession import chain_metrics_to_dict
+from src.analysis.win_probability import compute_win_probability, win_probability_to_dict
+from src.explanation.generator import ExplanationGenerator
+from src.visualization.plotter import create_turning_point_details
+
+
+class BatchAnalysisRequest(BaseModel):
+    """
+    일괄 분석 요청
+
+    game_ids를 주면 그 경기만, 없으면 조건(date_from/date_to, team, game_day)에 맞는 경기를 분석합니다.
+    """
+    game_ids: Optional[List[int]] = Field(None, description="분석할 경기 ID 목록")
+    date_from: Optional[date] = Field(None, description="경기 날짜 시작 (포함)")
+    date_to: Optional[date] = Field(None, description="경기 날짜 끝 (포함)")
+    team: Optional[str] = Field(None, description="팀 이름 (한글 또는 영문, 홈/원정 모두)")
+    game_day: Optional[int] = Field(None, description="라운드 번호")
+    method: str = Field("rules", pattern=f"^({'|'.join(DETECTION_METHODS)})$", description="변곡점 탐지 방법")
+    win_probability: bool = Field(False, description="분 단위 승리 확률 곡선 포함 여부")
+    bootstrap: int = Field(0, ge=0, le=MAX_REPLICATES, description="변곡점 신뢰도 계산용 부트스트랩 복제본 수")
+    shape_indicators: bool = Field(False, description="팀 대형 변화도 변곡점 지표로 사용 (rules 방법만)")
+
+    def analysis_options(self) -> dict:
+        return {
+            'method': self.method,
+            'win_probability': self.win_probability,
+            'bootstrap': self.bootstrap,
+            'shape_indicators': self.shape_indicators,
+        }
+
+
+def select_game_ids(match_info: pd.DataFrame, request: BatchAnalysisRequest) -> List[int]:
+    """요청 조건에 맞는 경기 ID (경기 날짜 순, game_ids를 주면 그 순서 유지)"""
+    if request.game_ids is not None:
+        return list(dict.fromkeys(int(game_id) for game_id in request.game_ids))
+
+    selected = pd.Series(True, index=match_info.index)
+    game_dates = pd.to_datetime(match_info['game_date']).dt.date
+    if request.date_from is not None:
+        selected &= game_dates >= request.date_from
+    if request.date_to is not None:
+        selected &= game_dates <= request.date_to
+    if request.game_day is not None:
+        selected &= match_info['game_day'] == request.game_day
+    if request.team is not None:
+        team_columns = ['home_team_name', 'home_team_name_ko', 'away_team_name', 'away_team_name_ko']
+        selected &= match_info[team_columns].eq(request.team).any(axis=1)
+
+    games = match_info[selected].sort_values(['game_date', 'game_id'])
+    return games['game_id'].astype(int).tolist()
+
+
+def match_analysis_result(
+    match_data: MatchData,
+    method: str = 'rules',
+    win_probability: bool = False,
+    bootstrap: int = 0,
+    shape_indicators: bool = False
+) -> dict:
+    """경기 분석 결과 (변곡점 탐지, 설명, 상세 정보 - GET /analyze/{game_id} 응답 형식)"""
+    # 변곡점 탐지
+    turning_points = detect_turning_points(match_data, method, use_shape=shape_indicators)
+    if bootstrap:
+        assign_bootstrap_confidence(
+            match_data, turning_points, bootstrap, method=method, use_shape=shape_indicators
+        )
+
+    # 설명 생성
+    explanation_gen = ExplanationGenerator()
+
+    # 각 변곡점에 대한 설명 개선
+    for tp in turning_points:
+        team_name = (
+            match_data.home_team if tp.team_advantage == 'home'
+            else match_data.away_team
+        )
+        tp.explanation = explanation_gen.generate_explanation(tp, team_name)
+
+    # 전체 요약
+    summary = explanation_gen.generate_summary(
+        turning_points,
+        match_data.home_team,
+        match_data.away_team
+    )
+
+    # 변곡점 상세 정보
+    turning_point_details = [
+        create_turning_point_details(
+            tp,
+            match_data.home_team if tp.team_advantage == 'home' else match_data.away_team
+        )
+        for tp in turning_points
+    ]
+
+    result = {
+        "match_id": match_data.match_id,
+        "home_team": match_data.home_team,
+        "away_team": match_data.away_team,
+        "match_date": match_data.match_date.isoformat(),
+        "final_score": match_data.final_score,
+        "summary": summary,
+        "turning_points_count": len(turning_points),
+        "turning_points": turning_point_details,
+        "team_shape": team_shape_to_dict(match_data),
+        "possession": chain_metrics_to_dict(match_data)
+    }
+    if win_probability:
+        result["win_probability"] = win_probability_to_dict(compute_win_probability(match_data))
+    return result
+
+
+def analyze_game(
+    raw_data_path: str,
+    match_row: pd.DataFrame,
+    game_id: int,
+    options: dict,
+    rows: Optional[pd.DataFrame] = None
+) -> dict:
+    """
+    경기 하나 분석 (프로세스 풀 작업 단위, 실패해도 예외 대신 오류 결과 반환)
+
+    match_row는 부모 프로세스가 한 번 읽은 match_info에서 고른 해당 경기 행입니다.
+    rows를 주면 그 행을, 없으면 raw_data_path에서 해당 경기만 읽습니다.
+    """
+    try:
+        if match_row.empty:
+            raise FileNotFoundError(game_id)
+        if rows is None:
+            rows = load_raw_data(raw_data_path, game_id)
+        if rows.empty:
+            raise FileNotFoundError(game_id)
+        match_data = convert_kleague_to_match_data(rows, match_row, game_id)
+        return match_analysis_result(match_data, **options)
+    except FileNotFoundError:
+        return {"game_id": game_id, "error": f"경기 ID {game_id}를 찾을 수 없습니다."}
+    except Exception as e:
+        return {"game_id": game_id, "error": str(e) or type(e).__name__}
+
+
+async def iter_batch_analysis(
+    raw_data_path: Union[str, Path],
+    match_info: pd.DataFrame,
+    game_ids: List[int],
+    options: dict
+) -> AsyncIterator[dict]:
+    """
+    경기들을 공용 프로세스 풀에서 병렬 분석하고 끝나는 순서대로 결과 반환
+
+    match_info는 호출자가 한 번 읽은 표이며, 작업자에는 해당 경기 행만 넘깁니다.
+    풀에는 작업자 수만큼만 경기를 넣어 두어 다른 기능(렌더링 작업 등)이 풀을 함께 쓸 수 있게 합니다.
+    이벤트 루프를 막지 않으며, 소비자가 중간에 멈추면(클라이언트 연결 끊김 등) 남은 작업을 취소합니다.
+    """
+    from src.data.incremental import read_game_rows
+
+    raw_data_path = str(raw_data_path)
+    if not game_ids:
+        return
+
+    # raw_data.csv는 선택된 경기 행만 한 번 골라 읽고, 디렉터리는 작업자가 경기별로 읽음
+    from_directory = Path(raw_data_path).is_dir()
+    games = {}
+    if not from_directory:
+        rows = await asyncio.to_thread(read_game_rows, raw_data_path, game_ids)
+        games = dict(tuple(rows.groupby('game_id'))) if not rows.empty else {}
+
+    match_rows = dict(tuple(match_info[match_info['game_id'].isin(game_ids)].groupby('game_id')))
+    pending = iter(game_ids)
+    in_flight = {}
+
+    def submit_next():
+        game_id = next(pending, None)
+        if game_id is None:
+            return
+        future = process_pool.submit(
+            analyze_game, raw_data_path, match_rows.get(game_id, match_info.iloc[:0]), game_id, options,
+            None if from_directory else games.get(game_id, pd.DataFrame())
+        )
+        in_flight[asyncio.wrap_future(future)] = (game_id, future)
+
+    # 공용 풀은 선입선출이므로 작업자 수만큼만 넣어 두고 하나가 끝날 때마다 다음 경기를 제출
+    # (큰 일괄 분석이 나중에 들어온 렌더링 작업 앞을 막지 않도록)
+    for _ in range(process_pool.PROCESS_POOL_WORKERS):
+        submit_next()
+
+    try:
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for completed in done:
+                game_id, _ = in_flight.pop(completed)
+                submit_next()
+                try:
+                    result = completed.result()
+                except BrokenProcessPool:
+                    # 작업자 프로세스가 죽으면 해당 경기는 실패로 보고 (풀은 다음 제출 때 교체)
+                    result = {"game_id": game_id, "error": "분석 프로세스가 비정상 종료되었습니다."}
+                yield result
+    finally:
+        for _, future in in_flight.values():
+            future.cancel()
@@ -0,0 +1,134 @@
+"""
+변곡점 부트스트랩 신뢰도
+
+구간 안의 이벤트를 재표집(포아송 부트스트랩: 이벤트마다 Poisson(1) 가중치)한 복제본 수백 개를
+(복제본, 팀, 구간, 필드) 배열 하나로 만들고, 지표 계산과 변곡점 규칙을 복제본 축 위에서 한 번에 평가합니다.
+각 변곡점의 confidence는 해당 구간 경계에서 규칙이 다시 변곡점을 확정한 복제본의 비율입니다.
+
+대형 지표(use_shape=True)로 탐지했다면 복제본도 같은 규칙 목록(INDICATOR_RULES + SHAPE_INDICATOR_RULES)으로 평가합니다.
+대형 지표는 위치 좌표의 볼록 껍질이라 복제본마다 다시 계산하지 않고, 관측값을 모든 복제본에 그대로 씁니다.
+
+규칙 기반(rules) 변곡점에만 신뢰도를 매깁니다. 변화점 탐지(cusum/pelt) 변곡점은
+구간 경계에 있지 않아 규칙의 확정 비율로 대신할 수 없으므로 confidence를 None으로 둡니다.
+"""
+from typing import List, Optional
+import numpy as np
+from src.data.models import MatchData, TurningPoint
+from src.analysis.metrics import (
+    get_event_arrays,
+    derive_window_metrics,
+    calculate_momentum_array,
+)
+from src.analysis.turning_point import (
+    WINDOW_SIZE,
+    INDICATOR_RULES,
+    SHAPE_INDICATOR_RULES,
+    evaluate_turning_point_rules,
+)
+from src.analysis.shape import get_team_shape, shape_metric_arrays
+
+# 기본/최대 복제본 수 (API 요청 상한)
+DEFAULT_REPLICATES = 200
+MAX_REPLICATES = 500
+MATCH_LENGTH = 90
+
+
+def bootstrap_window_sums(
+    match_data: MatchData,
+    n_replicates: int = DEFAULT_REPLICATES,
+    seed: Optional[int] = 0,
+    window_size: int = WINDOW_SIZE,
+    match_length: int = MATCH_LENGTH
+) -> np.ndarray:
+    """
+    포아송 부트스트랩 구간 합계
+
+    이벤트를 (팀, 구간) 순으로 정렬한 뒤, 필드마다 복제본별 Poisson(1) 가중치를 곱한
+    (복제본, 이벤트) 배열을 np.add.reduceat으로 구간별로 합칩니다.
+    (복제본, 이벤트, 필드) 배열을 만들지 않으므로 추가 메모리는 복제본 × 이벤트 수 정도입니다.
+
+    Returns:
+        (복제본, 팀(2), 구간, 필드) 배열 - build_window_sum_array와 같은 구간 정의
+    """
+    arrays = get_event_arrays(match_data)
+    n_windows = (match_length + window_size - 1) // window_size
+    minute = arrays['minute']
+    team = arrays['team']
+
+    valid = (team >= 0) & (minute >= 0) & (minute < match_length)
+    flat = team[valid].astype(np.int64) * n_windows + minute[valid] // window_size
+    sums = arrays['sums'][valid]
+    n_events, n_fields = sums.shape
+
+    rng = np.random.default_rng(seed)
+    weights = rng.poisson(1.0, size=(n_replicates, n_events)).astype(np.float64)
+
+    grouped = np.zeros((n_replicates, 2 * n_windows, n_fields))
+    if n_events:
+        order = np.argsort(flat, kind='stable')
+        flat, weights, sums = flat[order], weights[:, order], sums[order]
+        # 비어 있지 않은 (팀, 구간)마다 시작 위치
+        bin_starts = np.flatnonzero(np.r_[True, flat[1:] != flat[:-1]])
+        bins = flat[bin_starts]
+        for field in range(n_fields):
+            grouped[:, bins, field] = np.add.reduceat(weights * sums[:, field], bin_starts, axis=1)
+    return grouped.reshape(n_replicates, 2, n_windows, n_fields)
+
+
+def bootstrap_confirmation_rate(
+    match_data: MatchData,
+    n_replicates: int = DEFAULT_REPLICATES,
+    seed: Optional[int] = 0,
+    use_shape: bool = False
+) -> np.ndarray:
+    """
+    구간 경계별 변곡점 확정 비율
+
+    Args:
+        use_shape: 탐지 때처럼 팀 대형 지표 규칙도 평가 (대형 지표는 관측값 고정)
+
+    Returns:
+        (구간 - 1,) 배열 - i번째 값은 (i+1)번째 구간 시작 시점에 변곡점이 확정된 복제본 비율
+    """
+    window_sums = bootstrap_window_sums(match_data, n_replicates, seed)
+    metrics = derive_window_metrics(window_sums)
+    momentum = calculate_momentum_array(metrics)
+
+    rules = INDICATOR_RULES
+    if use_shape:
+        replicate_shape = (n_replicates,) + window_sums.shape[1:3]
+        for name, values in shape_metric_arrays(get_team_shape(match_data, WINDOW_SIZE)).items():
+            metrics[name] = np.broadcast_to(values, replicate_shape)
+        rules = INDICATOR_RULES + SHAPE_INDICATOR_RULES
+    confirmed, _ = evaluate_turning_point_rules(metrics, momentum, rules=rules)
+    return confirmed.mean(axis=0)
+
+
+def assign_bootstrap_confidence(
+    match_data: MatchData,
+    turning_points: List[TurningPoint],
+    n_replicates: int = DEFAULT_REPLICATES,
+    seed: Optional[int] = 0,
+    method: str = 'rules',
+    use_shape: bool = False
+) -> List[TurningPoint]:
+    """
+    변곡점 목록에 부트스트랩 신뢰도(confidence, 0~1) 설정
+
+    method/use_shape는 변곡점을 탐지할 때 쓴 값을 그대로 넘깁니다.
+    method가 'rules'가 아니면(cusum/pelt) 재표집으로 같은 탐지기를 다시 돌리지 않으므로
+    confidence를 None으로 둡니다.
+    """
+    if method != 'rules':
+        for tp in turning_points:
+            tp.confidence = None
+        return turning_points
+    if not turning_points:
+        return turning_points
+
+    rates = bootstrap_confirmation_rate(match_data, n_replicates, seed, use_shape)
+    for tp in turning_points:
+        boundary = int(round(tp.minute / WINDOW_SIZE))
+        index = min(max(boundary - 1, 0), len(rates) - 1)
+        tp.confidence = round(float(rates[index]), 4)
+    return turning_points
@@ -0,0 +1,243 @@
+"""
+변곡점 임계값/모멘텀 가중치 보정(calibration) 도구
+
+시즌 전체 경기의 5분 구간 합계를 (경기, 팀, 구간, 필드) 텐서로 한 번만 만들어 두고,
+수천 개의 임계값/가중치 조합을 배열 연산으로 한꺼번에 평가합니다.
+실행 시간은 조합 수 × 배열 연산에 비례하며, 조합마다 CSV를 다시 읽지 않습니다.
+
+사용법:
+    python -m src.analysis.calibration raw_data.csv match_info.csv --tensor season_windows.npz
+"""
+import argparse
+import itertools
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.data.models import MatchData
+from src.data.loader import iter_matches
+from src.analysis.metrics import (
+    MOMENTUM_WEIGHTS,
+    derive_window_metrics,
+    get_window_sum_array,
+    momentum_feature_array,
+)
+from src.analysis.turning_point import (
+    INDICATOR_RULES,
+    TURNING_POINT_THRESHOLDS,
+    WINDOW_SIZE,
+)
+
+# 기본 탐색 범위
+DEFAULT_THRESHOLD_GRID: Dict[str, List[float]] = {
+    'momentum_change': [10, 15, 20, 25, 30],
+    'xg': [0.2, 0.3, 0.4],
+    'shots': [1, 2, 3],
+    'opponent_half_events': [2, 3, 4],
+    'defense_avg_x': [3, 5, 7],
+    'pass_success_rate': [10, 15, 20],
+    'min_indicators': [1, 2, 3],
+}
+DEFAULT_WEIGHT_GRID: Dict[str, List[float]] = {
+    'possession': [10, 20, 30],
+    'xg': [5, 10, 20],
+    'forward_passes': [15],
+    'opponent_half_events': [20],
+    'pass_success_rate': [15],
+}
+
+# 한 번에 평가할 조합 수 (메모리 사용량 조절)
+DEFAULT_BATCH_SIZE = 256
+
+
+class SeasonWindowTensor:
+    """
+    시즌 구간 텐서
+
+    - game_ids: (경기,)
+    - window_sums: (경기, 팀(2), 구간, 필드) - 필드 순서는 WINDOW_SUM_FIELDS
+    """
+
+    def __init__(self, game_ids: np.ndarray, window_sums: np.ndarray):
+        self.game_ids = game_ids
+        self.window_sums = window_sums
+
+    @classmethod
+    def from_matches(cls, matches: Sequence[MatchData]) -> 'SeasonWindowTensor':
+        game_ids = np.array([md.match_id for md in matches])
+        window_sums = np.stack([get_window_sum_array(md, WINDOW_SIZE) for md in matches])
+        return cls(game_ids, window_sums)
+
+    def save(self, path: Union[str, Path]):
+        np.savez_compressed(path, game_ids=self.game_ids, window_sums=self.window_sums)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'SeasonWindowTensor':
+        with np.load(path) as data:
+            return cls(data['game_ids'], data['window_sums'])
+
+
+def build_combinations(grid: Dict[str, List[float]]) -> Tuple[List[str], np.ndarray]:
+    """격자 딕셔너리의 모든 조합을 (조합 수, 항목 수) 배열로 변환"""
+    names = list(grid)
+    combos = np.array(list(itertools.product(*(grid[name] for name in names))), dtype=np.float64)
+    return names, combos
+
+
+def evaluate_combinations(
+    tensor: SeasonWindowTensor,
+    thresholds: np.ndarray,
+    weights: np.ndarray,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, np.ndarray]:
+    """
+    임계값/가중치 조합별 변곡점 수와 실제 득점과의 상관관계를 벡터화하여 계산
+
+    Args:
+        thresholds: (조합 수, 7) - 열 순서는 TURNING_POINT_THRESHOLDS
+        weights: (조합 수, 5) - 열 순서는 MOMENTUM_WEIGHTS
+        batch_size: 한 번에 평가할 조합 수
+
+    Returns:
+        조합별 배열 딕셔너리
+        - turning_points: 전체 변곡점 수
+        - per_match: 경기당 평균 변곡점 수
+        - goal_correlation: 변곡점 여부와 해당 구간 득점 여부의 피어슨 상관계수
+        - goal_hit_rate: 변곡점 구간 중 득점이 나온 비율
+    """
+    metrics = derive_window_metrics(tensor.window_sums)
+
+    # 조합과 무관한 값은 한 번만 계산
+    features = momentum_feature_array(metrics)                       # (경기, 구간, 5)
+    changes = np.stack([
+        np.abs(np.diff(metrics[name], axis=-1)).max(axis=-2)
+        for _, name in INDICATOR_RULES
+    ], axis=-1)                                                       # (경기, 구간-1, 지표)
+    goals = (metrics['goals'].sum(axis=-2)[:, 1:] > 0).astype(np.float64)  # (경기, 구간-1)
+
+    threshold_names = list(TURNING_POINT_THRESHOLDS)
+    indicator_columns = [threshold_names.index(name) for _, name in INDICATOR_RULES]
+    momentum_column = threshold_names.index('momentum_change')
+    min_indicator_column = threshold_names.index('min_indicators')
+
+    n_matches = features.shape[0]
+    n_combos = len(thresholds)
+    counts = np.empty(n_combos)
+    correlation = np.empty(n_combos)
+    hit_rate = np.empty(n_combos)
+
+    goal_mean = goals.mean()
+    goal_std = goals.std()
+
+    for start in range(0, n_combos, batch_size):
+        t = thresholds[start:start + batch_size]
+        w = weights[start:start + batch_size]
+
+        momentum = np.clip(np.einsum('mwk,ck->cmw', features, w), -100, 100)
+        candidates = np.abs(np.diff(momentum, axis=-1)) >= t[:, momentum_column, None, None]
+        indicator_count = (
+            changes[None] >= t[:, None, None, indicator_columns]
+        ).sum(axis=-1)
+        confirmed = candidates & (indicator_count >= t[:, min_indicator_column, None, None])
+
+        flat = confirmed.reshape(len(t), -1).astype(np.float64)
+        total = flat.sum(axis=1)
+        counts[start:start + len(t)] = total
+
+        tp_mean = flat.mean(axis=1)
+        tp_std = flat.std(axis=1)
+        covariance = (flat * goals.ravel()).mean(axis=1) - tp_mean * goal_mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation[start:start + len(t)] = np.where(
+                (tp_std > 0) & (goal_std > 0), covariance / (tp_std * goal_std), 0.0
+            )
+            hit_rate[start:start + len(t)] = np.where(
+                total > 0, (flat * goals.ravel()).sum(axis=1) / total, 0.0
+            )
+
+    return {
+        'turning_points': counts,
+        'per_match': counts / max(n_matches, 1),
+        'goal_correlation': correlation,
+        'goal_hit_rate': hit_rate,
+    }
+
+
+def _complete_grid(
+    grid: Dict[str, List[float]],
+    current: Dict[str, float]
+) -> Dict[str, List[float]]:
+    """격자를 current의 항목 순서로 정렬하고, 빠진 항목은 현재 값으로 고정"""
+    return {name: list(grid.get(name, [value])) for name, value in current.items()}
+
+
+def run_calibration(
+    tensor: SeasonWindowTensor,
+    threshold_grid: Optional[Dict[str, List[float]]] = None,
+    weight_grid: Optional[Dict[str, List[float]]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> pd.DataFrame:
+    """
+    임계값 격자 × 가중치 격자 전체 조합을 평가하여 결과 표 반환
+
+    지정하지 않은 항목은 현재 값(TURNING_POINT_THRESHOLDS, MOMENTUM_WEIGHTS)으로 고정됩니다.
+    결과는 득점 상관계수 내림차순으로 정렬됩니다.
+    """
+    threshold_grid = _complete_grid(
+        DEFAULT_THRESHOLD_GRID if threshold_grid is None else threshold_grid,
+        TURNING_POINT_THRESHOLDS
+    )
+    weight_grid = _complete_grid(
+        DEFAULT_WEIGHT_GRID if weight_grid is None else weight_grid,
+        MOMENTUM_WEIGHTS
+    )
+
+    threshold_names, threshold_combos = build_combinations(threshold_grid)
+    weight_names, weight_combos = build_combinations(weight_grid)
+
+    # 임계값 조합 × 가중치 조합 데카르트 곱
+    t_index, w_index = np.meshgrid(
+        np.arange(len(threshold_combos)), np.arange(len(weight_combos)), indexing='ij'
+    )
+    thresholds = threshold_combos[t_index.ravel()]
+    weights = weight_combos[w_index.ravel()]
+
+    scores = evaluate_combinations(tensor, thresholds, weights, batch_size)
+
+    table = pd.concat([
+        pd.DataFrame(thresholds, columns=[f"threshold_{name}" for name in threshold_names]),
+        pd.DataFrame(weights, columns=[f"weight_{name}" for name in weight_names]),
+        pd.DataFrame(scores),
+    ], axis=1)
+    return table.sort_values('goal_correlation', ascending=False, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="변곡점 임계값/모멘텀 가중치 격자 탐색")
+    parser.add_argument('raw_data_path', help="raw_data.csv, 파티션 또는 이벤트 저장소 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('--tensor', help="시즌 구간 텐서 캐시(.npz) 경로 - 있으면 재사용, 없으면 생성 후 저장")
+    parser.add_argument('--top', type=int, default=20, help="출력할 상위 조합 수")
+    parser.add_argument('--output', help="전체 결과 CSV 저장 경로")
+    args = parser.parse_args()
+
+    if args.tensor and Path(args.tensor).exists():
+        tensor = SeasonWindowTensor.load(args.tensor)
+    else:
+        tensor = SeasonWindowTensor.from_matches(
+            list(iter_matches(args.raw_data_path, args.match_info_path))
+        )
+        if args.tensor:
+            tensor.save(args.tensor)
+
+    print(f"경기 {len(tensor.game_ids)}개 구간 텐서: {tensor.window_sums.shape}")
+    table = run_calibration(tensor)
+    print(f"조합 {len(table)}개 평가 완료")
+    print(table.head(args.top).to_string(index=False))
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+변화점(change-point) 기반 변곡점 탐지 모듈
+
+고정된 5분 구간끼리만 비교하는 규칙 기반 탐지는 완만한 변화나 구간 경계에 걸친 변화를 놓칩니다.
+이 모듈은 초 단위 타임라인(src.analysis.timeline)의 세밀한 모멘텀 시계열에
+변화점 탐지 알고리즘을 적용합니다.
+
+- cusum: 양방향 CUSUM (O(n))
+- pelt: 가지치기 기반 정확한 분할(PELT, 평균 변화 가우시안 비용)
+
+detect_turning_points(match_data, method='cusum' | 'pelt')로 선택할 수 있습니다.
+
+벤치마크:
+    python -m src.analysis.changepoint raw_data.csv match_info.csv
+"""
+import argparse
+import time
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from src.data.models import MatchData, TimeWindowMetrics, TurningPoint
+from src.analysis.timeline import get_event_timeline
+from src.analysis.turning_point import (
+    INDICATOR_RULES,
+    evaluate_turning_point_rules,
+    generate_simple_explanation,
+)
+
+# 모멘텀 시계열 설정: 10초 해상도, 직전 2분 이동 구간
+SERIES_RESOLUTION = 10.0
+SERIES_WINDOW_SECONDS = 120.0
+# 변곡 전/후 지표 비교 구간 (초)
+COMPARE_WINDOW_SECONDS = 300.0
+# 변화점 사이 최소 간격 (구간 수, 10초 × 18 = 3분)
+MIN_SEGMENT_BINS = 18
+
+CHANGEPOINT_METHODS = ('cusum', 'pelt')
+
+
+def momentum_series(
+    match_data: MatchData,
+    resolution: float = SERIES_RESOLUTION,
+    window_seconds: float = SERIES_WINDOW_SECONDS
+) -> Dict[str, np.ndarray]:
+    """
+    변화점 탐지에 사용할 세밀한 모멘텀 시계열
+
+    Returns:
+        {'momentum': (구간,), 'period': (구간,), 'start': (구간,) 피리어드 내 시작 시각(초)}
+    """
+    timeline = get_event_timeline(match_data, resolution)
+    return {
+        'momentum': timeline.momentum(window_seconds),
+        'period': timeline.bin_period,
+        'start': timeline.bin_start,
+    }
+
+
+def cusum_changepoints(
+    series: np.ndarray,
+    threshold: float = 5.0,
+    drift: float = 0.5,
+    min_segment: int = MIN_SEGMENT_BINS
+) -> List[int]:
+    """
+    양방향 CUSUM 변화점 탐지 (O(n))
+
+    시계열을 표준화한 뒤 현재 구간 평균 대비 누적 편차가 threshold(표준편차 단위)를 넘으면
+    변화점으로 기록하고, 누적합이 시작된 지점을 변화 위치로 사용합니다.
+    """
+    n = len(series)
+    if n < 2 * min_segment:
+        return []
+    scale = series.std() or 1.0
+    z = (series - series.mean()) / scale
+
+    changepoints = []
+    segment_start = 0
+    segment_sum = 0.0
+    positive = negative = 0.0
+    positive_start = negative_start = 0
+
+    for i in range(n):
+        segment_sum += z[i]
+        mean = segment_sum / (i - segment_start + 1)
+        # 구간 초반에는 기준 평균이 불안정하므로 누적하지 않음
+        if i - segment_start < min_segment:
+            positive_start = negative_start = i
+            continue
+
+        if positive <= 0:
+            positive_start = i
+        if negative <= 0:
+            negative_start = i
+        positive = max(0.0, positive + z[i] - mean - drift)
+        negative = max(0.0, negative - z[i] + mean - drift)
+
+        if positive > threshold or negative > threshold:
+            change = positive_start if positive > threshold else negative_start
+            if change - segment_start >= min_segment and n - change >= min_segment:
+                changepoints.append(change)
+            segment_start = change
+            segment_sum = z[change:i + 1].sum()
+            positive = negative = 0.0
+
+    return changepoints
+
+
+def pelt_changepoints(
+    series: np.ndarray,
+    penalty: Optional[float] = None,
+    min_segment: int = MIN_SEGMENT_BINS
+) -> List[int]:
+    """
+    PELT (Pruned Exact Linear Time) 변화점 탐지 - 평균 변화 가우시안 비용
+
+    구간 비용은 누적합으로 O(1)에 계산하며, 가지치기로 평균 O(n)에 동작합니다.
+    penalty를 지정하지 않으면 BIC 형태(2 × 분산 × log n)를 사용합니다.
+    """
+    n = len(series)
+    if n < 2 * min_segment:
+        return []
+    if penalty is None:
+        penalty = 2.0 * max(series.var(), 1e-9) * np.log(n)
+
+    s1 = np.concatenate([[0.0], np.cumsum(series)])
+    s2 = np.concatenate([[0.0], np.cumsum(series ** 2)])
+
+    def cost(start: np.ndarray, end: int) -> np.ndarray:
+        length = end - start
+        total = s1[end] - s1[start]
+        return (s2[end] - s2[start]) - total ** 2 / length
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0], dtype=np.int64)
+
+    for end in range(min_segment, n + 1):
+        valid = candidates[end - candidates >= min_segment]
+        if len(valid) == 0:
+            continue
+        totals = best[valid] + cost(valid, end) + penalty
+        k = int(np.argmin(totals))
+        best[end] = totals[k]
+        previous[end] = valid[k]
+
+        # 가지치기: 앞으로도 최적이 될 수 없는 후보 제거
+        keep = best[valid] + cost(valid, end) <= best[end]
+        pending = candidates[end - candidates < min_segment]
+        candidates = np.concatenate([valid[keep], pending, [end - min_segment + 1]])
+        candidates = np.unique(candidates[candidates >= 0])
+
+    changepoints = []
+    end = n
+    while end > 0:
+        start = int(previous[end])
+        if start > 0:
+            changepoints.append(start)
+        end = start
+    return sorted(changepoints)
+
+
+def find_changepoints(
+    match_data: MatchData,
+    method: str = 'cusum'
+) -> List[int]:
+    """
+    피리어드별로 변화점을 탐지하여 타임라인 구간 번호 목록 반환
+
+    피리어드 경계를 넘는 구간은 비교하지 않습니다.
+    """
+    if method not in CHANGEPOINT_METHODS:
+        raise ValueError(f"지원하지 않는 변화점 탐지 방법입니다: {method}")
+
+    series = momentum_series(match_data)
+    momentum = series['momentum']
+    changepoints = []
+    for period in np.unique(series['period']):
+        bins = np.flatnonzero(series['period'] == period)
+        values = momentum[bins]
+        if method == 'cusum':
+            found = cusum_changepoints(values)
+        else:
+            found = pelt_changepoints(values)
+        changepoints.extend(int(bins[0] + b) for b in found)
+    return changepoints
+
+
+def _to_window_metrics(
+    metrics: Dict[str, np.ndarray],
+    team_index: int,
+    team: str,
+    minute_start: int,
+    minute_end: int
+) -> TimeWindowMetrics:
+    return TimeWindowMetrics(
+        minute_start=minute_start,
+        minute_end=minute_end,
+        team=team,
+        possession=float(metrics['possession'][team_index]),
+        shots=int(metrics['shots'][team_index]),
+        xg=float(metrics['xg'][team_index]),
+        forward_passes=int(metrics['forward_passes'][team_index]),
+        opponent_half_events=int(metrics['opponent_half_events'][team_index]),
+        defense_avg_x=float(metrics['defense_avg_x'][team_index]),
+        pass_success_rate=float(metrics['pass_success_rate'][team_index])
+    )
+
+
+def detect_changepoint_turning_points(
+    match_data: MatchData,
+    method: str = 'cusum'
+) -> List[TurningPoint]:
+    """
+    변화점 탐지 결과를 TurningPoint 목록으로 변환
+
+    각 변화점의 직전/직후 5분(피리어드 경계 내) 지표를 비교하여
+    규칙 기반 탐지와 같은 지표(indicators)와 변화 유형을 채웁니다.
+    """
+    changepoints = find_changepoints(match_data, method)
+    if not changepoints:
+        return []
+
+    timeline = get_event_timeline(match_data, SERIES_RESOLUTION)
+    before = timeline.window_metrics(COMPARE_WINDOW_SECONDS, leading=False)
+    after = timeline.window_metrics(COMPARE_WINDOW_SECONDS, leading=True)
+    momentum_after = timeline.momentum(COMPARE_WINDOW_SECONDS, leading=True)
+    momentum_before = timeline.momentum(COMPARE_WINDOW_SECONDS, leading=False)
+    bin_minutes = timeline.bin_minutes
+
+    cp = np.array(changepoints)
+    # (변화점, 팀, 전/후) 형태로 쌓아 지표 규칙을 한 번에 평가 (모멘텀 후보 조건은 변화점으로 대체)
+    pair_metrics = {
+        name: np.stack([before[name][:, cp], after[name][:, cp]], axis=-1).transpose(1, 0, 2)
+        for name in before
+    }
+    pair_momentum = np.stack([momentum_before[cp], momentum_after[cp]], axis=-1)
+    _, indicator_masks = evaluate_turning_point_rules(
+        pair_metrics, pair_momentum, {'momentum_change': 0}
+    )
+
+    turning_points = []
+    window_minutes = int(COMPARE_WINDOW_SECONDS // 60)
+    for k, b in enumerate(cp):
+        minute = int(bin_minutes[b])
+        indicators = [
+            name for j, (name, _) in enumerate(INDICATOR_RULES) if indicator_masks[k, j, 0]
+        ]
+        team_advantage = 'home' if momentum_after[b] > 0 else 'away'
+        team_index = 0 if team_advantage == 'home' else 1
+        team_name = match_data.home_team if team_advantage == 'home' else match_data.away_team
+
+        if 'xG_change' in indicators or 'shots_surge' in indicators:
+            change_type = 'attack_surge'
+        elif 'defense_line_shift' in indicators:
+            change_type = 'defense_breakdown'
+        else:
+            change_type = 'momentum_shift'
+
+        prev = {
+            side: _to_window_metrics(
+                {name: values[:, b] for name, values in before.items()}, i, team,
+                max(0, minute - window_minutes), minute
+            )
+            for i, (side, team) in enumerate([('home', match_data.home_team), ('away', match_data.away_team)])
+        }
+        curr = {
+            side: _to_window_metrics(
+                {name: values[:, b] for name, values in after.items()}, i, team,
+                minute, minute + window_minutes
+            )
+            for i, (side, team) in enumerate([('home', match_data.home_team), ('away', match_data.away_team)])
+        }
+
+        explanation = generate_simple_explanation(
+            minute=minute,
+            team_advantage=team_advantage,
+            indicators=indicators,
+            prev_home=prev['home'],
+            prev_away=prev['away'],
+            curr_home=curr['home'],
+            curr_away=curr['away'],
+            home_team=match_data.home_team,
+            away_team=match_data.away_team
+        )
+
+        turning_points.append(TurningPoint(
+            minute=minute,
+            period=int(timeline.bin_period[b]),
+            time_seconds=float(timeline.bin_start[b]),
+            team_advantage=team_advantage,
+            change_type=change_type,
+            indicators=indicators,
+            explanation=explanation,
+            metrics_before=prev[team_advantage],
+            metrics_after=curr[team_advantage]
+        ))
+
+    return turning_points
+
+
+def _agreement(reference: List[int], detected: List[int], tolerance: int = 5) -> float:
+    """reference 변곡점 중 detected에 tolerance(분) 이내로 대응되는 비율"""
+    if not reference:
+        return 1.0 if not detected else 0.0
+    detected = np.array(detected)
+    if len(detected) == 0:
+        return 0.0
+    return float(np.mean([np.min(np.abs(detected - m)) <= tolerance for m in reference]))
+
+
+def benchmark_detectors(
+    matches: Sequence[MatchData],
+    methods: Sequence[str] = ('rules',) + CHANGEPOINT_METHODS
+) -> pd.DataFrame:
+    """
+    탐지 방법별 실행 시간과 규칙 기반 탐지와의 일치도 비교
+
+    방법마다 파생 캐시가 빈 경기 복사본에서 시간을 재므로, 먼저 실행된 방법만
+    공용 캐시(이벤트 배열, 타임라인 등) 생성 비용을 떠안지 않습니다.
+
+    Returns:
+        방법별 (경기당 실행 시간(ms), 경기당 변곡점 수, recall/precision 기준 일치도) 표
+    """
+    from src.analysis.turning_point import detect_turning_points
+
+    results = {method: [] for method in methods}
+    timings = {method: 0.0 for method in methods}
+    for match_data in matches:
+        for method in methods:
+            # events 리스트를 새로 만들면 분 인덱스/파생 캐시가 모두 무효화됨 (이벤트 객체는 공유)
+            cold = match_data.model_copy(update={'events': list(match_data.events)})
+            start = time.perf_counter()
+            found = detect_turning_points(cold, method=method)
+            timings[method] += time.perf_counter() - start
+            results[method].append([tp.minute for tp in found])
+
+    rows = []
+    for method in methods:
+        rows.append({
+            'method': method,
+            'ms_per_match': timings[method] / max(len(matches), 1) * 1000,
+            'turning_points_per_match': np.mean([len(r) for r in results[method]]) if matches else 0.0,
+            # 규칙 기반 변곡점을 얼마나 찾았는지 / 찾은 변곡점이 규칙 기반과 얼마나 겹치는지
+            'recall_vs_rules': np.mean([
+                _agreement(ref, det) for ref, det in zip(results['rules'], results[method])
+            ]) if 'rules' in results and matches else np.nan,
+            'precision_vs_rules': np.mean([
+                _agreement(det, ref) for ref, det in zip(results['rules'], results[method])
+            ]) if 'rules' in results and matches else np.nan,
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    from src.data.loader import iter_matches
+
+    parser = argparse.ArgumentParser(description="변곡점 탐지 방법 벤치마크 (규칙 vs CUSUM vs PELT)")
+    parser.add_argument('raw_data_path', help="raw_data.csv, 파티션 또는 이벤트 저장소 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('--limit', type=int, help="평가할 경기 수")
+    args = parser.parse_args()
+
+    matches = list(iter_matches(args.raw_data_path, args.match_info_path))
+    if args.limit:
+        matches = matches[:args.limit]
+    print(benchmark_detectors(matches).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
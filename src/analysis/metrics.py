@@ -1,24 +1,31 @@
 """
 경기 지표 계산 모듈
 """
+import numpy as np
 import pandas as pd
-from typing import List
-from src.data.models import MatchEvent, TimeWindowMetrics
+from typing import Dict, List, Optional, Union
+from src.data.models import MatchData, MatchEvent, TimeWindowMetrics
 
 
 def calculate_time_window_metrics(
-    events: List[MatchEvent],
+    events: Union[MatchData, List[MatchEvent]],
     team: str,
     minute_start: int,
     minute_end: int
 ) -> TimeWindowMetrics:
     """
     5분 단위 지표 계산
+
+    events에 MatchData를 넘기면 분 단위 인덱스로 구간 이벤트를 조회하므로
+    전체 이벤트를 스캔하지 않습니다. (이벤트 리스트도 기존처럼 지원)
     """
-    window_events = [
-        e for e in events
-        if e.team == team and minute_start <= e.minute < minute_end
-    ]
+    if isinstance(events, MatchData):
+        window_events = events.window_events(minute_start, minute_end, team)
+    else:
+        window_events = [
+            e for e in events
+            if e.team == team and minute_start <= e.minute < minute_end
+        ]
     
     if not window_events:
         return TimeWindowMetrics(
@@ -35,7 +42,10 @@ def calculate_time_window_metrics(
         )
     
     # 점유율 (이벤트 수 기반 근사치)
-    total_events = len([e for e in events if minute_start <= e.minute < minute_end])
+    if isinstance(events, MatchData):
+        total_events = events.count_window_events(minute_start, minute_end)
+    else:
+        total_events = len([e for e in events if minute_start <= e.minute < minute_end])
     possession = (len(window_events) / total_events * 100) if total_events > 0 else 0
     
     # 슈팅 및 xG
@@ -120,3 +130,249 @@ def calculate_momentum_score(
     # -100 ~ 100 범위로 제한
     return max(-100, min(100, momentum))
 
+
+
+# 구간 합계 배열의 필드 순서 (마지막 축)
+WINDOW_SUM_FIELDS = (
+    'events',
+    'shots',
+    'xg',
+    'forward_passes',
+    'opponent_half_events',
+    'defense_x_sum',
+    'defense_count',
+    'passes',
+    'successful_passes',
+    'goals',
+)
+
+
+def build_event_arrays(match_data: MatchData) -> Dict[str, np.ndarray]:
+    """
+    MatchEvent 목록을 열(column) 단위 NumPy 배열로 변환
+
+    calculate_time_window_metrics와 동일한 규칙으로 이벤트별 기여값을 미리 계산해 두므로
+    이후 구간 집계는 bincount/누적합만으로 처리할 수 있습니다.
+    결과는 MatchData.get_derived로 경기당 1회만 생성하여 재사용하세요.
+    """
+    events = match_data.events
+    n = len(events)
+
+    team = np.full(n, -1, dtype=np.int8)
+    period = np.empty(n, dtype=np.int8)
+    time_seconds = np.empty(n, dtype=np.float64)
+    minute = np.empty(n, dtype=np.int32)
+    x = np.full(n, np.nan)
+    y = np.full(n, np.nan)
+    sums = np.zeros((n, len(WINDOW_SUM_FIELDS)), dtype=np.float64)
+
+    for i, e in enumerate(events):
+        if e.team == match_data.home_team:
+            team[i] = 0
+        elif e.team == match_data.away_team:
+            team[i] = 1
+
+        minute[i] = e.minute
+        # 초 단위 정보가 없는 데이터(샘플 등)는 분 값으로 피리어드/시간을 복원
+        p = e.period if e.period is not None else (1 if e.minute < 45 else 2)
+        period[i] = p
+        time_seconds[i] = (
+            e.time_seconds if e.time_seconds is not None
+            else (e.minute - 45 * (p - 1)) * 60.0
+        )
+
+        row = sums[i]
+        row[0] = 1.0
+        if e.x is not None:
+            x[i] = e.x
+        if e.y is not None:
+            y[i] = e.y
+
+        if e.event_type == 'shot':
+            row[1] = 1.0
+            row[2] = e.xg or 0.0
+            if e.metadata and e.metadata.get('result_name') == 'Goal':
+                row[9] = 1.0
+        elif e.event_type == 'pass':
+            row[7] = 1.0
+            if e.success is True:
+                row[8] = 1.0
+            if e.x is not None:
+                if e.metadata and 'end_x' in e.metadata:
+                    end_x = e.metadata.get('end_x')
+                    if end_x is not None and end_x > e.x:
+                        row[3] = 1.0
+                elif e.success:
+                    row[3] = 1.0
+        elif e.event_type == 'defense' and e.x is not None:
+            row[5] = e.x
+            row[6] = 1.0
+
+        if e.x is not None and e.x > 50:
+            row[4] = 1.0
+
+    return {
+        'team': team,
+        'period': period,
+        'time_seconds': time_seconds,
+        'minute': minute,
+        'x': x,
+        'y': y,
+        'sums': sums,
+    }
+
+
+def get_event_arrays(match_data: MatchData) -> Dict[str, np.ndarray]:
+    """경기별 열 배열 (MatchData에 캐시)"""
+    return match_data.get_derived('event_arrays', build_event_arrays)
+
+
+def derive_window_metrics(window_sums: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    구간 합계 배열(..., 팀(2), 구간, 필드)로부터 TimeWindowMetrics와 같은 지표 배열 계산
+
+    앞쪽 축은 자유롭게 추가할 수 있습니다 (경기, 복제본 등).
+    반환 배열의 모양은 (..., 2, 구간)입니다.
+    """
+    f = {name: window_sums[..., i] for i, name in enumerate(WINDOW_SUM_FIELDS)}
+    team_events = f['events']
+    total_events = team_events.sum(axis=-2, keepdims=True)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        possession = np.where(total_events > 0, team_events / total_events * 100, 0.0)
+        defense_avg_x = np.where(
+            f['defense_count'] > 0, f['defense_x_sum'] / f['defense_count'], 50.0
+        )
+        pass_success_rate = np.where(
+            f['passes'] > 0, f['successful_passes'] / f['passes'] * 100, 0.0
+        )
+
+    # 이벤트가 없는 구간은 calculate_time_window_metrics와 동일하게 기본값 사용
+    empty = team_events == 0
+    return {
+        'possession': np.where(empty, 0.0, possession),
+        'shots': f['shots'],
+        'xg': f['xg'],
+        'forward_passes': f['forward_passes'],
+        'opponent_half_events': f['opponent_half_events'],
+        'defense_avg_x': np.where(empty, 50.0, defense_avg_x),
+        'pass_success_rate': np.where(empty, 0.0, pass_success_rate),
+        'goals': f['goals'],
+    }
+
+
+# 모멘텀 점수 가중치(점수 배분)와 정규화 기준 - calculate_momentum_score와 동일
+MOMENTUM_WEIGHTS: Dict[str, float] = {
+    'possession': 20,
+    'xg': 10,
+    'forward_passes': 15,
+    'opponent_half_events': 20,
+    'pass_success_rate': 15,
+}
+MOMENTUM_SCALES: Dict[str, float] = {
+    'possession': 100,
+    'xg': 1,
+    'forward_passes': 10,
+    'opponent_half_events': 10,
+    'pass_success_rate': 100,
+}
+
+
+def momentum_feature_array(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    모멘텀 계산용 정규화된 홈-원정 차이 배열 (..., 구간, 지표) - 지표 순서는 MOMENTUM_WEIGHTS
+    """
+    return np.stack([
+        (metrics[name][..., 0, :] - metrics[name][..., 1, :]) / MOMENTUM_SCALES[name]
+        for name in MOMENTUM_WEIGHTS
+    ], axis=-1)
+
+
+def calculate_momentum_array(
+    metrics: Dict[str, np.ndarray],
+    weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """
+    calculate_momentum_score의 벡터화 버전
+
+    metrics는 derive_window_metrics 결과 (팀 축 = -2, 0: 홈, 1: 원정)
+    weights를 지정하면 MOMENTUM_WEIGHTS 대신 사용합니다 (일부만 지정 가능)
+    """
+    applied = dict(MOMENTUM_WEIGHTS)
+    if weights:
+        applied.update(weights)
+
+    momentum = 0.0
+    for name, weight in applied.items():
+        values = metrics[name]
+        momentum = momentum + (values[..., 0, :] - values[..., 1, :]) / MOMENTUM_SCALES[name] * weight
+
+    # -100 ~ 100 범위로 제한
+    return np.clip(momentum, -100, 100)
+
+
+def build_window_sum_array(
+    match_data: MatchData,
+    window_size: int = 5,
+    match_length: int = 90
+) -> np.ndarray:
+    """
+    고정 분 단위 구간([0, 5), [5, 10), ...)별 합계 배열 계산
+
+    calculate_time_window_metrics를 구간/팀마다 호출하는 대신
+    모든 구간과 양 팀을 한 번의 bincount로 집계합니다.
+
+    Returns:
+        (팀(2), 구간, 필드) 배열 - 필드 순서는 WINDOW_SUM_FIELDS
+    """
+    arrays = get_event_arrays(match_data)
+    n_windows = (match_length + window_size - 1) // window_size
+    minute = arrays['minute']
+    team = arrays['team']
+
+    valid = (team >= 0) & (minute >= 0) & (minute < match_length)
+    flat = team[valid].astype(np.int64) * n_windows + minute[valid] // window_size
+    sums = arrays['sums'][valid]
+
+    result = np.empty((2, n_windows, len(WINDOW_SUM_FIELDS)))
+    for k in range(len(WINDOW_SUM_FIELDS)):
+        result[:, :, k] = np.bincount(
+            flat, weights=sums[:, k], minlength=2 * n_windows
+        ).reshape(2, n_windows)
+    return result
+
+
+def get_window_sum_array(
+    match_data: MatchData,
+    window_size: int = 5,
+    match_length: int = 90
+) -> np.ndarray:
+    """경기별 분 단위 구간 합계 배열 (MatchData에 캐시)"""
+    return match_data.get_derived(
+        f'window_sums_{window_size}_{match_length}',
+        lambda md: build_window_sum_array(md, window_size, match_length)
+    )
+
+
+def window_metrics_from_arrays(
+    metrics: Dict[str, np.ndarray],
+    team_index: int,
+    window_index: int,
+    team: str,
+    window_size: int = 5,
+    match_length: int = 90
+) -> TimeWindowMetrics:
+    """derive_window_metrics 결과의 (팀, 구간) 한 칸을 TimeWindowMetrics로 변환"""
+    minute_start = window_index * window_size
+    return TimeWindowMetrics(
+        minute_start=minute_start,
+        minute_end=min(minute_start + window_size, match_length),
+        team=team,
+        possession=float(metrics['possession'][team_index, window_index]),
+        shots=int(metrics['shots'][team_index, window_index]),
+        xg=float(metrics['xg'][team_index, window_index]),
+        forward_passes=int(metrics['forward_passes'][team_index, window_index]),
+        opponent_half_events=int(metrics['opponent_half_events'][team_index, window_index]),
+        defense_avg_x=float(metrics['defense_avg_x'][team_index, window_index]),
+        pass_success_rate=float(metrics['pass_success_rate'][team_index, window_index])
+    )
@@ -48,12 +48,8 @@ def extract_player_activities(
         else match_data.away_team
     )
     
-    # 해당 시간대의 이벤트 필터링
-    window_events = [
-        e for e in match_data.events
-        if minute_start <= e.minute < minute_end
-        and e.team == target_team
-    ]
+    # 해당 시간대의 이벤트 조회 (분 단위 인덱스)
+    window_events = match_data.window_events(minute_start, minute_end, target_team)
     
     # 선수별 활동 수집
     player_activities: Dict[str, PlayerActivity] = {}
@@ -194,12 +190,10 @@ def analyze_pass_network(
         else match_data.away_team
     )
     
-    # 해당 시간대의 성공한 패스만 필터링
+    # 해당 시간대의 성공한 패스만 필터링 (분 단위 인덱스로 구간 조회)
     window_events = [
-        e for e in match_data.events
-        if minute_start <= e.minute < minute_end
-        and e.team == target_team
-        and e.event_type == 'pass'
+        e for e in match_data.window_events(minute_start, minute_end, target_team)
+        if e.event_type == 'pass'
         and e.success is True
     ]
     
@@ -0,0 +1,383 @@
+"""
+점유 체인(possession chain) 분할 모듈
+
+이벤트 수 비율로 근사하던 점유율 대신, 시간순 이벤트를 한 번 훑어(선형 시간)
+같은 팀이 공을 연속으로 소유한 구간(체인)으로 나눕니다.
+
+체인이 끊기는 경우:
+- 피리어드가 바뀔 때
+- 이벤트 팀이 바뀔 때
+- 직전 이벤트가 Out / Offside (볼 데드) 또는 슈팅일 때
+- 현재 이벤트가 Goal Kick / Throw-In (재개)일 때
+
+체인은 경기별 열(column) 배열로 저장(MatchData에 캐시)되므로 구간별 시간 점유율,
+체인 xG, 빌드업 속도를 다시 분할하지 않고 경기/시즌 단위로 집계할 수 있습니다.
+경기 단위(GET /analyze/{game_id}의 possession)와 시즌 단위 집계 모두
+aggregate_chains_by_window → derive_chain_window_metrics로 같은 지표를 계산합니다.
+수집 단계(src.data.ingest / src.data.incremental)에서 파티션 옆 chains/ 디렉터리에
+경기별 체인 배열(game_{id}.npz)을 저장하며, 시즌 집계는 이를 읽기만 합니다.
+
+사용법:
+    python -m src.analysis.possession data/partitions/chains
+    python -m src.analysis.possession data/partitions/chains --raw-data raw_data.csv --match-info match_info.csv
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+import numpy as np
+import pandas as pd
+from src.data.models import MatchData
+from src.analysis.metrics import get_event_arrays
+
+# 체인을 끝내는 이벤트 / 새 체인을 시작하는 재개 이벤트 (K리그 type_name)
+CHAIN_END_TYPES = ('Out', 'Offside')
+CHAIN_RESTART_TYPES = ('Goal Kick', 'Throw-In')
+
+# 체인 결과 코드
+CHAIN_OUTCOMES = ('turnover', 'out', 'shot', 'goal', 'period_end')
+
+# 구간 집계 필드 (팀, 구간, 필드)
+CHAIN_WINDOW_FIELDS = ('chains', 'possession_seconds', 'chain_xg', 'progression', 'duration', 'shot_chains')
+
+# API 응답/시즌 집계에 내보내는 체인 구간 지표 (derive_chain_window_metrics 키)
+CHAIN_WINDOW_METRICS = (
+    'chains', 'time_possession', 'mean_possession_seconds', 'chain_xg', 'build_up_speed', 'shot_rate',
+)
+
+# 파티션 디렉터리 안의 경기별 체인 배열 디렉터리
+CHAINS_DIR = 'chains'
+
+
+def segment_possession_chains(match_data: MatchData) -> Dict[str, np.ndarray]:
+    """
+    경기 이벤트를 점유 체인으로 분할
+
+    Returns:
+        체인별 열 배열 딕셔너리
+        - team: 0(홈) / 1(원정)
+        - period, start_minute
+        - start_time, end_time: 피리어드 내 첫/마지막 이벤트 시각(초)
+        - possession_seconds: 다음 체인 시작까지 공을 소유한 시간(초)
+        - n_events, start_x, end_x, progression(end_x - start_x)
+        - shots, xg, outcome(CHAIN_OUTCOMES 인덱스)
+        - event_chain: 이벤트별 체인 번호 (팀 미상 이벤트는 -1, 원래 이벤트 순서)
+    """
+    arrays = get_event_arrays(match_data)
+    events = match_data.events
+    type_names = np.array([
+        (e.metadata or {}).get('type_name') or '' for e in events
+    ], dtype=object)
+    end_x = np.array([
+        (e.metadata or {}).get('end_x') if e.event_type == 'pass' else None
+        for e in events
+    ], dtype=float)
+
+    # 팀을 알 수 있는 이벤트만 (피리어드, 시각) 순으로 정렬
+    valid = np.flatnonzero(arrays['team'] >= 0)
+    order = valid[np.lexsort((arrays['time_seconds'][valid], arrays['period'][valid]))]
+
+    team = arrays['team'][order]
+    period = arrays['period'][order]
+    time_seconds = arrays['time_seconds'][order]
+    minute = arrays['minute'][order]
+    x = arrays['x'][order]
+    types = type_names[order]
+    last_x = np.where(np.isnan(end_x[order]), x, end_x[order])
+    shots = arrays['sums'][order, 1]
+    xg = arrays['sums'][order, 2]
+    goals = arrays['sums'][order, 9]
+
+    n = len(order)
+    starts = np.ones(n, dtype=bool)
+    if n > 1:
+        starts[1:] = (
+            (period[1:] != period[:-1]) |
+            (team[1:] != team[:-1]) |
+            np.isin(types[:-1], CHAIN_END_TYPES) |
+            (shots[:-1] > 0) |
+            np.isin(types[1:], CHAIN_RESTART_TYPES)
+        )
+    chain_id = np.cumsum(starts) - 1
+    first = np.flatnonzero(starts)
+    last = np.append(first[1:], n)[:len(first)] - 1
+    n_chains = len(first)
+
+    # 좌표가 없는 이벤트는 건너뛰고 체인 안 첫/마지막 유효 좌표를 사용 (없으면 NaN)
+    positions = np.arange(n)
+    next_valid = np.minimum.accumulate(np.where(np.isnan(x), n, positions)[::-1])[::-1]
+    prev_valid = np.maximum.accumulate(np.where(np.isnan(last_x), -1, positions))
+    start_index = next_valid[first]
+    end_index = prev_valid[last]
+    start_x = np.where(start_index <= last, x[np.minimum(start_index, n - 1)], np.nan)
+    chain_end_x = np.where(end_index >= first, last_x[np.maximum(end_index, 0)], np.nan)
+
+    chain_period = period[first]
+    start_time = time_seconds[first]
+    end_time = time_seconds[last]
+    # 같은 피리어드의 다음 체인 시작까지가 소유 시간
+    next_start = np.append(start_time[1:], np.nan)
+    same_period_next = np.append(chain_period[1:] == chain_period[:-1], False)
+    possession_seconds = np.where(same_period_next, next_start - start_time, end_time - start_time)
+
+    chain_shots = np.bincount(chain_id, weights=shots, minlength=n_chains)
+    chain_goals = np.bincount(chain_id, weights=goals, minlength=n_chains)
+
+    outcome = np.where(same_period_next, CHAIN_OUTCOMES.index('turnover'), CHAIN_OUTCOMES.index('period_end'))
+    outcome = np.where(np.isin(types[last], CHAIN_END_TYPES), CHAIN_OUTCOMES.index('out'), outcome)
+    outcome = np.where(chain_shots > 0, CHAIN_OUTCOMES.index('shot'), outcome)
+    outcome = np.where(chain_goals > 0, CHAIN_OUTCOMES.index('goal'), outcome)
+
+    event_chain = np.full(len(events), -1, dtype=np.int64)
+    event_chain[order] = chain_id
+
+    return {
+        'team': team[first].astype(np.int8),
+        'period': chain_period.astype(np.int8),
+        'start_minute': minute[first],
+        'start_time': start_time,
+        'end_time': end_time,
+        'possession_seconds': np.maximum(possession_seconds, 0.0),
+        'n_events': np.diff(np.append(first, n)),
+        'start_x': start_x,
+        'end_x': chain_end_x,
+        'progression': chain_end_x - start_x,
+        'shots': chain_shots,
+        'xg': np.bincount(chain_id, weights=xg, minlength=n_chains),
+        'outcome': outcome.astype(np.int8),
+        'event_chain': event_chain,
+    }
+
+
+def get_possession_chains(match_data: MatchData) -> Dict[str, np.ndarray]:
+    """경기별 점유 체인 (MatchData에 캐시)"""
+    return match_data.get_derived('possession_chains', segment_possession_chains)
+
+
+def aggregate_chains_by_window(
+    chains: Dict[str, np.ndarray],
+    window_size: int = 5,
+    match_length: int = 90
+) -> np.ndarray:
+    """
+    체인을 시작 분 기준 고정 구간으로 집계 (match_length 이후에 시작한 체인은 마지막 구간)
+
+    Args:
+        chains: get_possession_chains / load_possession_chains 형식의 체인 열 배열
+
+    Returns:
+        (팀(2), 구간, 필드) 배열 - 필드 순서는 CHAIN_WINDOW_FIELDS
+    """
+    n_windows = (match_length + window_size - 1) // window_size
+    window = np.clip(chains['start_minute'] // window_size, 0, n_windows - 1)
+    flat = chains['team'].astype(np.int64) * n_windows + window
+    duration = chains['end_time'] - chains['start_time']
+
+    values = {
+        'chains': np.ones(len(flat)),
+        'possession_seconds': chains['possession_seconds'],
+        'chain_xg': chains['xg'],
+        'progression': np.nan_to_num(chains['progression']),
+        'duration': duration,
+        'shot_chains': np.isin(
+            chains['outcome'], [CHAIN_OUTCOMES.index('shot'), CHAIN_OUTCOMES.index('goal')]
+        ).astype(float),
+    }
+    result = np.empty((2, n_windows, len(CHAIN_WINDOW_FIELDS)))
+    for k, name in enumerate(CHAIN_WINDOW_FIELDS):
+        result[:, :, k] = np.bincount(
+            flat, weights=values[name], minlength=2 * n_windows
+        ).reshape(2, n_windows)
+    return result
+
+
+def derive_chain_window_metrics(window_sums: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    체인 구간 합계(..., 팀(2), 구간, 필드)로부터 구간 지표 계산
+
+    팀 축의 두 값은 같은 경기(또는 같은 경기들)의 서로 상대 팀이어야 시간 점유율이 맞습니다.
+
+    Returns:
+        - chains: 체인 수
+        - time_possession: 시간 기준 점유율 (%)
+        - mean_possession_seconds: 체인 평균 소유 시간 (초)
+        - chain_xg: 체인 xG 합계
+        - build_up_speed: 체인 평균 전진 속도 (x 좌표/초)
+        - shot_rate: 슈팅(득점 포함)으로 끝난 체인 비율
+    """
+    f = {name: window_sums[..., i] for i, name in enumerate(CHAIN_WINDOW_FIELDS)}
+    total_seconds = f['possession_seconds'].sum(axis=-2, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        time_possession = np.where(total_seconds > 0, f['possession_seconds'] / total_seconds * 100, 0.0)
+        mean_possession_seconds = np.where(f['chains'] > 0, f['possession_seconds'] / f['chains'], 0.0)
+        build_up_speed = np.where(f['duration'] > 0, f['progression'] / f['duration'], 0.0)
+        shot_rate = np.where(f['chains'] > 0, f['shot_chains'] / f['chains'], 0.0)
+    return {
+        'chains': f['chains'],
+        'time_possession': time_possession,
+        'mean_possession_seconds': mean_possession_seconds,
+        'chain_xg': f['chain_xg'],
+        'build_up_speed': build_up_speed,
+        'shot_rate': shot_rate,
+    }
+
+
+def get_chain_window_metrics(match_data: MatchData, window_size: int = 5) -> Dict[str, np.ndarray]:
+    """경기별 체인 구간 지표 (팀(2), 구간) - derive_chain_window_metrics 결과"""
+    return derive_chain_window_metrics(
+        aggregate_chains_by_window(get_possession_chains(match_data), window_size)
+    )
+
+
+def chain_metrics_to_dict(match_data: MatchData, window_size: int = 5) -> Dict[str, dict]:
+    """API 응답용 체인 구간 지표 {'window_starts': [...], 'home': {지표: [...]}, 'away': {...}}"""
+    metrics = get_chain_window_metrics(match_data, window_size)
+    n_windows = metrics['chains'].shape[-1]
+    rounded = {name: np.round(metrics[name], 3) for name in CHAIN_WINDOW_METRICS}
+    rounded['chains'] = metrics['chains'].astype(int)
+    return {
+        'window_starts': (np.arange(n_windows) * window_size).tolist(),
+        'home': {name: values[0].tolist() for name, values in rounded.items()},
+        'away': {name: values[1].tolist() for name, values in rounded.items()},
+    }
+
+
+def _chain_frame(
+    game_id: Union[int, str],
+    home_team: str,
+    away_team: str,
+    chains: Dict[str, np.ndarray]
+) -> pd.DataFrame:
+    columns = {key: values for key, values in chains.items() if key != 'event_chain'}
+    frame = pd.DataFrame(columns)
+    frame.insert(0, 'game_id', int(game_id))
+    frame.insert(1, 'team_name', np.where(frame['team'] == 0, home_team, away_team))
+    frame['outcome'] = pd.Categorical.from_codes(frame['outcome'], categories=list(CHAIN_OUTCOMES))
+    return frame
+
+
+def chain_path(chain_dir: Union[str, Path], game_id: int) -> Path:
+    """경기별 체인 배열 파일 경로"""
+    return Path(chain_dir) / f"game_{int(game_id)}.npz"
+
+
+def save_possession_chains(chain_dir: Union[str, Path], match_data: MatchData) -> Path:
+    """경기 체인 배열을 팀 이름과 함께 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = chain_path(chain_dir, match_data.match_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.npz.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(
+            f,
+            home_team=np.array(match_data.home_team),
+            away_team=np.array(match_data.away_team),
+            **get_possession_chains(match_data),
+        )
+    tmp_path.replace(path)
+    return path
+
+
+def load_possession_chains(chain_dir: Union[str, Path], game_id: int) -> Dict[str, np.ndarray]:
+    """
+    저장된 경기 체인 배열 로드 (get_possession_chains와 같은 키 + home_team/away_team)
+
+    Raises:
+        FileNotFoundError: 해당 경기 체인 파일이 없는 경우
+    """
+    path = chain_path(chain_dir, game_id)
+    if not path.exists():
+        raise FileNotFoundError(f"경기 체인 파일을 찾을 수 없습니다: {path}")
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def load_season_chain_table(
+    chain_dir: Union[str, Path],
+    game_ids: Optional[Iterable[int]] = None
+) -> pd.DataFrame:
+    """저장된 경기별 체인 배열을 다시 분할하지 않고 하나의 표로 합침 (game_ids 미지정 시 전체)"""
+    if game_ids is None:
+        game_ids = sorted(int(path.stem.split('_', 1)[1]) for path in Path(chain_dir).glob('game_*.npz'))
+    frames = []
+    for game_id in game_ids:
+        chains = load_possession_chains(chain_dir, game_id)
+        home_team, away_team = str(chains.pop('home_team')), str(chains.pop('away_team'))
+        frames.append(_chain_frame(game_id, home_team, away_team, chains))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _table_chains(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """체인 표(한 경기)를 aggregate_chains_by_window 입력 형식의 열 배열로 변환"""
+    chains = {column: frame[column].to_numpy() for column in frame.columns if column != 'outcome'}
+    chains['outcome'] = frame['outcome'].cat.codes.to_numpy()
+    return chains
+
+
+def summarize_season_chains(
+    chains: Union[pd.DataFrame, str, Path],
+    window_size: int = 5
+) -> pd.DataFrame:
+    """
+    시즌 체인을 (팀, 구간)별로 집계
+
+    경기별로 aggregate_chains_by_window 합계를 만든 뒤, 팀마다 자기 합계와 그 경기들의 상대 팀 합계를
+    (팀, 상대) 축으로 더해 derive_chain_window_metrics로 경기 단위와 같은 지표를 계산합니다.
+
+    Args:
+        chains: 저장된 체인 디렉터리(load_season_chain_table로 읽음) 또는 이미 만든 체인 표
+
+    Returns:
+        팀/구간별 CHAIN_WINDOW_METRICS (체인 수, 시간 점유율, 평균 소유 시간, 체인 xG 합계, 빌드업 속도, 슈팅 연결 비율)
+    """
+    table = chains if isinstance(chains, pd.DataFrame) else load_season_chain_table(chains)
+    columns = ['team_name', 'window_start', *CHAIN_WINDOW_METRICS]
+    if table.empty:
+        return pd.DataFrame(columns=columns)
+
+    # {팀: (팀, 상대) 구간 합계}
+    team_sums: Dict[str, np.ndarray] = {}
+    for _, game in table.groupby('game_id', sort=False):
+        sums = aggregate_chains_by_window(_table_chains(game), window_size)
+        names = game.drop_duplicates('team').set_index('team')['team_name']
+        for side, name in names.items():
+            pair = sums[[side, 1 - side]]
+            team_sums[name] = team_sums[name] + pair if name in team_sums else pair
+
+    teams = sorted(team_sums)
+    metrics = derive_chain_window_metrics(np.stack([team_sums[name] for name in teams]))
+    n_windows = metrics['chains'].shape[-1]
+    summary = pd.DataFrame({
+        'team_name': np.repeat(teams, n_windows),
+        'window_start': np.tile(np.arange(n_windows) * window_size, len(teams)),
+        **{name: metrics[name][:, 0].ravel() for name in CHAIN_WINDOW_METRICS},
+    })
+    summary['chains'] = summary['chains'].astype(int)
+    return summary[summary['chains'] > 0].reset_index(drop=True)[columns]
+
+
+def main():
+    from src.data.loader import iter_matches
+
+    parser = argparse.ArgumentParser(description="경기별 점유 체인 시즌 집계 (저장된 체인 배열 사용)")
+    parser.add_argument('chain_dir', help="경기별 체인 배열 디렉터리 (예: data/partitions/chains)")
+    parser.add_argument('--raw-data', help="지정 시 이 경로(raw_data.csv, 파티션 또는 이벤트 저장소)의 경기를 분할해 먼저 저장")
+    parser.add_argument('--match-info', help="--raw-data와 함께 사용할 match_info.csv 경로")
+    args = parser.parse_args()
+
+    if args.raw_data:
+        if not args.match_info:
+            parser.error("--raw-data에는 --match-info가 필요합니다.")
+        saved = sum(
+            1 for match_data in iter_matches(args.raw_data, args.match_info)
+            if save_possession_chains(args.chain_dir, match_data)
+        )
+        print(f"{saved}경기 체인 저장 완료: {args.chain_dir}")
+
+    table = load_season_chain_table(args.chain_dir)
+    if table.empty:
+        parser.error(f"저장된 체인이 없습니다: {args.chain_dir}")
+    print(f"체인 {len(table)}개 로드 완료")
+    print(summarize_season_chains(table).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
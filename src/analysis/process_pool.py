@@ -0,0 +1,50 @@
+"""
+공용 프로세스 풀
+
+일괄 분석(src.analysis.batch), 라운드 대시보드(src.visualization.dashboard),
+렌더링 작업 큐(src.api.jobs)가 프로세스 하나에 풀 하나만 만들어 함께 씁니다.
+기능마다 CPU 수만큼 풀을 따로 두면 서버 프로세스 하나에 작업자 프로세스가 몇 배로 생기므로,
+작업자 수는 TURNING_POINT_PROCESS_WORKERS(기본값: CPU 수) 하나로 제한합니다.
+
+작업은 submit()으로 제출합니다. 작업자 프로세스가 죽어(OOM 등) 풀을 쓸 수 없게 되면
+그 풀에서 실행 중이던 작업은 BrokenProcessPool로 실패하고, 다음 제출 때 새 풀로 교체합니다.
+"""
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+PROCESS_POOL_WORKERS = max(1, int(os.environ.get("TURNING_POINT_PROCESS_WORKERS", os.cpu_count() or 1)))
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """공용 프로세스 풀 (첫 사용 때 만들고 이후 재사용)"""
+    global _PROCESS_POOL
+    with _LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+        return _PROCESS_POOL
+
+
+def replace_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """쓸 수 없게 된 풀을 새 풀로 교체 (다른 스레드가 이미 교체했으면 그 풀 반환)"""
+    global _PROCESS_POOL
+    with _LOCK:
+        if _PROCESS_POOL is broken or _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+        pool = _PROCESS_POOL
+    broken.shutdown(wait=False, cancel_futures=True)
+    return pool
+
+
+def submit(fn, *args) -> Future:
+    """공용 풀에 작업 제출 (풀이 이미 깨져 있으면 새 풀로 교체한 뒤 제출)"""
+    pool = get_process_pool()
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        return replace_broken_pool(pool).submit(fn, *args)
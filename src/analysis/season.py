@@ -0,0 +1,319 @@
+"""
+시즌 팀/선수 집계 모듈
+
+경기마다 한 번만 계산한 기여분(contribution) 표 두 개를 디렉터리에 저장해 두고,
+새 경기가 추가되면 그 경기의 행만 계산해 교체(upsert)합니다.
+시즌 요약은 경기를 다시 로드하지 않고 기여분 표를 groupby로 집계해 만듭니다.
+
+- team_windows.csv: (경기, 팀, 5분 구간)별 팀 시점 모멘텀, xG, 슈팅, 점유율, 득점, 유리한 변곡점 수
+- player_impacts.csv: (경기, 변곡점, 선수)별 변곡점 기여도 점수와 활동 통계
+
+사용법:
+    python -m src.analysis.season raw_data.csv match_info.csv --season-dir season
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from src.data.models import MatchData, TurningPoint
+from src.analysis.metrics import (
+    get_window_sum_array,
+    derive_window_metrics,
+    calculate_momentum_array,
+)
+from src.analysis.turning_point import WINDOW_SIZE, detect_turning_points_batch
+from src.analysis.player_analysis import extract_player_activities, calculate_player_impact_score
+
+TEAM_WINDOWS_FILE = 'team_windows.csv'
+PLAYER_IMPACTS_FILE = 'player_impacts.csv'
+
+# 팀 기여분 표에 저장하는 구간 지표 (derive_window_metrics 키)
+TEAM_WINDOW_METRICS = ('xg', 'shots', 'possession', 'forward_passes', 'goals')
+
+TEAM_WINDOW_COLUMNS = [
+    'game_id', 'team_name', 'opponent', 'side', 'window_start', 'momentum',
+    *TEAM_WINDOW_METRICS, 'turning_points_for',
+]
+PLAYER_IMPACT_COLUMNS = [
+    'game_id', 'turning_point_minute', 'team_name', 'player_name', 'impact_score',
+    'shots', 'xg', 'passes', 'forward_passes', 'defense_actions', 'opponent_half_events',
+]
+
+
+def team_window_rows(
+    match_data: MatchData,
+    turning_points: List[TurningPoint],
+    window_size: int = WINDOW_SIZE
+) -> pd.DataFrame:
+    """
+    경기 하나의 팀 기여분 행 (팀 2개 × 구간)
+
+    모멘텀은 해당 팀 시점(원정 팀은 부호 반전)으로 저장합니다.
+    """
+    metrics = derive_window_metrics(get_window_sum_array(match_data, window_size))
+    momentum = calculate_momentum_array(metrics)
+    n_windows = len(momentum)
+
+    turning_point_counts = np.zeros((2, n_windows), dtype=np.int64)
+    for tp in turning_points:
+        side = 0 if tp.team_advantage == 'home' else 1
+        turning_point_counts[side, min(max(tp.minute // window_size, 0), n_windows - 1)] += 1
+
+    teams = (match_data.home_team, match_data.away_team)
+    frames = [
+        pd.DataFrame({
+            'game_id': int(match_data.match_id),
+            'team_name': teams[side],
+            'opponent': teams[1 - side],
+            'side': ('home', 'away')[side],
+            'window_start': np.arange(n_windows) * window_size,
+            'momentum': np.round(sign * momentum, 2),
+            **{name: np.round(metrics[name][side], 4) for name in TEAM_WINDOW_METRICS},
+            'turning_points_for': turning_point_counts[side],
+        })
+        for side, sign in enumerate((1.0, -1.0))
+    ]
+    return pd.concat(frames, ignore_index=True)[TEAM_WINDOW_COLUMNS]
+
+
+def player_impact_rows(
+    match_data: MatchData,
+    turning_points: List[TurningPoint]
+) -> pd.DataFrame:
+    """경기 하나의 선수 기여분 행 (변곡점 × 유리한 팀 선수)"""
+    rows = [
+        {
+            'game_id': int(match_data.match_id),
+            'turning_point_minute': tp.minute,
+            'team_name': activity.team,
+            'player_name': player_name,
+            'impact_score': calculate_player_impact_score(activity),
+            'shots': activity.shots,
+            'xg': round(activity.xg_contribution, 4),
+            'passes': activity.passes,
+            'forward_passes': activity.forward_passes,
+            'defense_actions': activity.defense_actions,
+            'opponent_half_events': activity.opponent_half_events,
+        }
+        for tp in turning_points
+        for player_name, activity in extract_player_activities(match_data, tp).items()
+    ]
+    return pd.DataFrame(rows, columns=PLAYER_IMPACT_COLUMNS)
+
+
+class SeasonAggregates:
+    """
+    경기별 기여분 표와 시즌 요약
+
+    - team_windows: TEAM_WINDOW_COLUMNS 표
+    - player_impacts: PLAYER_IMPACT_COLUMNS 표
+    """
+
+    def __init__(
+        self,
+        team_windows: Optional[pd.DataFrame] = None,
+        player_impacts: Optional[pd.DataFrame] = None
+    ):
+        self.team_windows = (
+            pd.DataFrame(columns=TEAM_WINDOW_COLUMNS) if team_windows is None else team_windows
+        )
+        self.player_impacts = (
+            pd.DataFrame(columns=PLAYER_IMPACT_COLUMNS) if player_impacts is None else player_impacts
+        )
+
+    @property
+    def game_ids(self) -> set:
+        return set(self.team_windows['game_id'].astype(int))
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def upsert(self, matches: Sequence[MatchData], turning_points: Optional[List[List[TurningPoint]]] = None):
+        """
+        경기 기여분 추가 (이미 있는 경기는 행 전체를 새 값으로 교체)
+
+        Args:
+            turning_points: 경기별 변곡점 (None이면 detect_turning_points_batch로 탐지)
+        """
+        if not matches:
+            return
+        if turning_points is None:
+            turning_points = detect_turning_points_batch(list(matches))
+
+        new_ids = [int(md.match_id) for md in matches]
+        team_frames = [self.team_windows[~self.team_windows['game_id'].isin(new_ids)]]
+        player_frames = [self.player_impacts[~self.player_impacts['game_id'].isin(new_ids)]]
+        for md, tps in zip(matches, turning_points):
+            team_frames.append(team_window_rows(md, tps))
+            player_frames.append(player_impact_rows(md, tps))
+
+        self.team_windows = pd.concat(
+            [frame for frame in team_frames if not frame.empty], ignore_index=True
+        ).reindex(columns=TEAM_WINDOW_COLUMNS)
+        player_frames = [frame for frame in player_frames if not frame.empty]
+        self.player_impacts = (
+            pd.concat(player_frames, ignore_index=True).reindex(columns=PLAYER_IMPACT_COLUMNS)
+            if player_frames else pd.DataFrame(columns=PLAYER_IMPACT_COLUMNS)
+        )
+
+    def remove(self, game_ids: Iterable[int]):
+        """경기 기여분 행 삭제 (원본에서 사라진 경기 등)"""
+        game_ids = [int(game_id) for game_id in game_ids]
+        self.team_windows = self.team_windows[~self.team_windows['game_id'].isin(game_ids)].reset_index(drop=True)
+        self.player_impacts = self.player_impacts[~self.player_impacts['game_id'].isin(game_ids)].reset_index(drop=True)
+
+    def team_summary(self, minute_from: int = 0, minute_to: int = 90) -> pd.DataFrame:
+        """
+        팀별 시즌 요약 (minute_from <= 구간 시작 < minute_to 구간만)
+
+        Returns:
+            팀별 경기 수, 평균 모멘텀, 경기당 xG/슈팅/득점, 평균 점유율, 유리한 변곡점 수
+        """
+        table = self.team_windows
+        table = table[(table['window_start'] >= minute_from) & (table['window_start'] < minute_to)]
+        if table.empty:
+            return pd.DataFrame(columns=[
+                'team_name', 'games', 'mean_momentum', 'xg_per_game', 'shots_per_game',
+                'goals_per_game', 'mean_possession', 'turning_points_for',
+            ])
+
+        per_game = table.groupby(['team_name', 'game_id']).agg(
+            momentum=('momentum', 'mean'),
+            xg=('xg', 'sum'),
+            shots=('shots', 'sum'),
+            goals=('goals', 'sum'),
+            possession=('possession', 'mean'),
+            turning_points_for=('turning_points_for', 'sum'),
+        )
+        summary = per_game.groupby('team_name').agg(
+            games=('momentum', 'size'),
+            mean_momentum=('momentum', 'mean'),
+            xg_per_game=('xg', 'mean'),
+            shots_per_game=('shots', 'mean'),
+            goals_per_game=('goals', 'mean'),
+            mean_possession=('possession', 'mean'),
+            turning_points_for=('turning_points_for', 'sum'),
+        )
+        return summary.round(3).sort_values('mean_momentum', ascending=False).reset_index()
+
+    def player_summary(self, team_name: Optional[str] = None, top: Optional[int] = None) -> pd.DataFrame:
+        """
+        선수별 시즌 변곡점 기여도 요약 (총 기여도 내림차순)
+
+        Returns:
+            선수별 팀, 관여한 변곡점 수, 경기 수, 총/평균 기여도, xG, 전진 패스
+        """
+        table = self.player_impacts
+        if team_name is not None:
+            table = table[table['team_name'] == team_name]
+        summary = table.groupby(['player_name', 'team_name']).agg(
+            turning_points=('impact_score', 'size'),
+            games=('game_id', 'nunique'),
+            total_impact=('impact_score', 'sum'),
+            mean_impact=('impact_score', 'mean'),
+            xg=('xg', 'sum'),
+            forward_passes=('forward_passes', 'sum'),
+        )
+        summary = summary.round(3).sort_values('total_impact', ascending=False).reset_index()
+        return summary.head(top) if top else summary
+
+    def save(self, season_dir: Union[str, Path]):
+        season_dir = Path(season_dir)
+        season_dir.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+        for frame, name in [(self.team_windows, TEAM_WINDOWS_FILE), (self.player_impacts, PLAYER_IMPACTS_FILE)]:
+            tmp_path = season_dir / f"{name}.tmp"
+            frame.to_csv(tmp_path, index=False)
+            tmp_path.replace(season_dir / name)
+
+    @classmethod
+    def load(cls, season_dir: Union[str, Path]) -> 'SeasonAggregates':
+        """
+        Raises:
+            FileNotFoundError: 집계 파일이 없는 경우
+        """
+        season_dir = Path(season_dir)
+        return cls(
+            pd.read_csv(season_dir / TEAM_WINDOWS_FILE),
+            pd.read_csv(season_dir / PLAYER_IMPACTS_FILE),
+        )
+
+
+def update_season_aggregates(
+    season_dir: Union[str, Path],
+    raw_data_path: str,
+    match_info_path: str,
+    game_ids: Optional[Iterable[int]] = None
+) -> SeasonAggregates:
+    """
+    저장된 시즌 집계를 증분 갱신
+
+    game_ids를 주면 해당 경기만 다시 계산해 교체하고(변경된 경기 재수집 등),
+    없으면 match_info에 있지만 아직 집계되지 않은 경기만 계산합니다.
+    """
+    from src.data.loader import iter_matches, load_match_info
+
+    season_dir = Path(season_dir)
+    if (season_dir / TEAM_WINDOWS_FILE).exists():
+        aggregates = SeasonAggregates.load(season_dir)
+    else:
+        aggregates = SeasonAggregates()
+
+    if game_ids is None:
+        known = aggregates.game_ids
+        game_ids = [
+            int(game_id) for game_id in load_match_info(match_info_path)['game_id']
+            if int(game_id) not in known
+        ]
+    game_ids = list(game_ids)
+    if game_ids or not (season_dir / TEAM_WINDOWS_FILE).exists():
+        aggregates.upsert(list(iter_matches(raw_data_path, match_info_path, game_ids)))
+        aggregates.save(season_dir)
+    return aggregates
+
+
+# 프로세스 내 집계 캐시 {디렉터리: (파일 수정 시각, 집계)}
+_AGGREGATES_CACHE: Dict[str, tuple] = {}
+
+
+def open_season_aggregates(season_dir: Union[str, Path]) -> SeasonAggregates:
+    """
+    프로세스당 한 번만 로드해 재사용하는 시즌 집계
+
+    집계는 CLI나 증분 수집(src.data.incremental)으로 미리 만들어 두며, 여기서는 생성하지 않습니다.
+    집계 파일이 갱신되면(증분 수집 등) 다음 조회 시 다시 로드합니다.
+
+    Raises:
+        FileNotFoundError: 집계 파일이 아직 없는 경우
+    """
+    season_dir = Path(season_dir)
+    paths = [season_dir / TEAM_WINDOWS_FILE, season_dir / PLAYER_IMPACTS_FILE]
+    missing = [path for path in paths if not path.exists()]
+    if missing:
+        raise FileNotFoundError(f"시즌 집계 파일이 없습니다: {missing[0]}")
+
+    mtime = max(path.stat().st_mtime for path in paths)
+    cached = _AGGREGATES_CACHE.get(str(season_dir))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    aggregates = SeasonAggregates.load(season_dir)
+    _AGGREGATES_CACHE[str(season_dir)] = (mtime, aggregates)
+    return aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시즌 팀/선수 집계 증분 갱신")
+    parser.add_argument('raw_data_path', help="raw_data.csv, 파티션 또는 이벤트 저장소 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('--season-dir', default='season', help="집계 저장 디렉터리")
+    args = parser.parse_args()
+
+    aggregates = update_season_aggregates(args.season_dir, args.raw_data_path, args.match_info_path)
+    print(f"경기 {len(aggregates)}개 집계 완료: {args.season_dir}")
+    print(aggregates.team_summary().to_string(index=False))
+    print(aggregates.player_summary(top=10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+팀 대형(team shape) 지표 모듈
+
+5분 구간마다 팀 이벤트 좌표로 대형 지표를 계산합니다.
+
+- centroid_x, centroid_y: 무게중심
+- width: 좌우 폭 (y 범위)
+- depth: 앞뒤 깊이 (x 범위)
+- compactness: 무게중심까지의 평균 거리 (작을수록 촘촘함)
+- hull_area: 볼록 껍질(convex hull) 면적 (0-100 좌표 기준)
+
+여러 경기의 모든 (경기, 팀, 구간) 그룹을 하나의 좌표 배열로 합쳐 bincount/reduceat로 한 번에 처리하며,
+볼록 껍질은 Akl–Toussaint 사각형으로 내부 점을 벡터 연산으로 먼저 걸러낸 뒤
+남은 소수의 점에만 monotone chain을 적용합니다.
+"""
+from typing import Dict, List, Sequence
+import numpy as np
+from src.data.models import MatchData
+from src.analysis.metrics import get_event_arrays
+
+# 지표 순서 (..., 필드)
+SHAPE_FIELDS = ('centroid_x', 'centroid_y', 'width', 'depth', 'compactness', 'hull_area')
+
+
+def _cross(o: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """벡터 (a - o) × (b - o)의 z 성분"""
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def _hull_area(points: np.ndarray) -> float:
+    """monotone chain 볼록 껍질 + 신발끈 공식 면적 (points는 (x, y) 기준 정렬됨)"""
+    if len(points) < 3:
+        return 0.0
+
+    def turn(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    pts = points.tolist()
+    lower: List[list] = []
+    for p in pts:
+        while len(lower) >= 2 and turn(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper: List[list] = []
+    for p in reversed(pts):
+        while len(upper) >= 2 and turn(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    hull = np.array(lower[:-1] + upper[:-1])
+    if len(hull) < 3:
+        return 0.0
+    x, y = hull[:, 0], hull[:, 1]
+    return float(0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def shape_metrics_from_points(
+    x: np.ndarray,
+    y: np.ndarray,
+    group: np.ndarray,
+    n_groups: int
+) -> np.ndarray:
+    """
+    그룹별 대형 지표 계산
+
+    Args:
+        x, y: 좌표 (결측 없음)
+        group: 점별 그룹 번호 (0 ~ n_groups - 1)
+
+    Returns:
+        (그룹, 필드) 배열 - 필드 순서는 SHAPE_FIELDS, 점이 없는 그룹은 무게중심 50, 나머지 0
+    """
+    result = np.zeros((n_groups, len(SHAPE_FIELDS)))
+    result[:, 0:2] = 50.0
+    if len(x) == 0:
+        return result
+
+    order = np.argsort(group, kind='stable')
+    x, y, group = x[order], y[order], group[order]
+    counts = np.bincount(group, minlength=n_groups)
+    present = np.flatnonzero(counts)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[present]
+
+    cx = np.bincount(group, weights=x, minlength=n_groups)[present] / counts[present]
+    cy = np.bincount(group, weights=y, minlength=n_groups)[present] / counts[present]
+    centroid = np.zeros((n_groups, 2))
+    centroid[present] = np.column_stack([cx, cy])
+    distance = np.hypot(x - centroid[group, 0], y - centroid[group, 1])
+
+    result[present, 0] = cx
+    result[present, 1] = cy
+    result[present, 2] = np.maximum.reduceat(y, starts) - np.minimum.reduceat(y, starts)
+    result[present, 3] = np.maximum.reduceat(x, starts) - np.minimum.reduceat(x, starts)
+    result[present, 4] = np.bincount(group, weights=distance, minlength=n_groups)[present] / counts[present]
+
+    # Akl–Toussaint: 그룹별 극점(좌/하/우/상) 사각형 안쪽 점은 껍질이 될 수 없으므로 제거
+    points = np.column_stack([x, y])
+    extremes = np.empty((n_groups, 4, 2))
+    for k, (values, reducer) in enumerate([
+        (x, np.minimum), (y, np.minimum), (x, np.maximum), (y, np.maximum)
+    ]):
+        target = np.full(n_groups, np.nan)
+        target[present] = reducer.reduceat(values, starts)
+        # 그룹 안에서 극값을 갖는 첫 점
+        is_extreme = values == target[group]
+        first = np.full(n_groups, len(x))
+        np.minimum.at(first, group[is_extreme], np.flatnonzero(is_extreme))
+        extremes[present, k] = points[first[present]]
+
+    quad = extremes[group]  # (점, 4, 2)
+    inside = np.ones(len(x), dtype=bool)
+    for k in range(4):
+        inside &= _cross(quad[:, k], quad[:, (k + 1) % 4], points) > 0
+    keep = ~inside
+
+    candidate_points = points[keep]
+    candidate_group = group[keep]
+    sort = np.lexsort((candidate_points[:, 1], candidate_points[:, 0], candidate_group))
+    candidate_points = candidate_points[sort]
+    bounds = np.searchsorted(candidate_group[sort], np.arange(n_groups + 1))
+    for g in present:
+        result[g, 5] = _hull_area(candidate_points[bounds[g]:bounds[g + 1]])
+    return result
+
+
+def _match_points(
+    match_data: MatchData,
+    window_size: int,
+    match_length: int
+):
+    """경기의 (x, y, 팀 × 구간 그룹) 좌표 배열"""
+    arrays = get_event_arrays(match_data)
+    n_windows = (match_length + window_size - 1) // window_size
+    team = arrays['team']
+    minute = arrays['minute']
+    valid = (
+        (team >= 0) & (minute >= 0) & (minute < match_length) &
+        ~np.isnan(arrays['x']) & ~np.isnan(arrays['y'])
+    )
+    group = team[valid].astype(np.int64) * n_windows + minute[valid] // window_size
+    return arrays['x'][valid], arrays['y'][valid], group, 2 * n_windows
+
+
+def compute_team_shape_batch(
+    matches: Sequence[MatchData],
+    window_size: int = 5,
+    match_length: int = 90
+) -> np.ndarray:
+    """
+    여러 경기의 팀 대형 지표를 한 번에 계산
+
+    Returns:
+        (경기, 팀(2), 구간, 필드) 배열 - 필드 순서는 SHAPE_FIELDS
+    """
+    n_windows = (match_length + window_size - 1) // window_size
+    groups_per_match = 2 * n_windows
+    xs, ys, groups = [], [], []
+    for i, md in enumerate(matches):
+        x, y, group, _ = _match_points(md, window_size, match_length)
+        xs.append(x)
+        ys.append(y)
+        groups.append(group + i * groups_per_match)
+
+    n_groups = len(matches) * groups_per_match
+    if not matches:
+        return np.zeros((0, 2, n_windows, len(SHAPE_FIELDS)))
+    metrics = shape_metrics_from_points(
+        np.concatenate(xs), np.concatenate(ys), np.concatenate(groups), n_groups
+    )
+    return metrics.reshape(len(matches), 2, n_windows, len(SHAPE_FIELDS))
+
+
+def get_team_shape(match_data: MatchData, window_size: int = 5) -> np.ndarray:
+    """경기별 팀 대형 지표 (팀(2), 구간, 필드) - MatchData에 캐시"""
+    return match_data.get_derived(
+        f'team_shape_{window_size}',
+        lambda md: compute_team_shape_batch([md], window_size)[0]
+    )
+
+
+def shape_metric_arrays(shape: np.ndarray) -> Dict[str, np.ndarray]:
+    """(..., 필드) 대형 배열을 derive_window_metrics와 같은 이름별 딕셔너리로 변환"""
+    return {name: shape[..., k] for k, name in enumerate(SHAPE_FIELDS)}
+
+
+def team_shape_to_dict(match_data: MatchData, window_size: int = 5) -> Dict[str, dict]:
+    """API 응답용 팀 대형 지표 {'window_starts': [...], 'home': {지표: [...]}, 'away': {...}}"""
+    shape = get_team_shape(match_data, window_size)
+    metrics = shape_metric_arrays(np.round(shape, 2))
+    return {
+        'window_starts': (np.arange(shape.shape[1]) * window_size).tolist(),
+        'home': {name: values[0].tolist() for name, values in metrics.items()},
+        'away': {name: values[1].tolist() for name, values in metrics.items()},
+    }
@@ -0,0 +1,226 @@
+"""
+유사 경기 검색 인덱스
+
+경기별 5분 구간 모멘텀 곡선(compute_window_momentum)을 고정 길이 벡터(-1 ~ 1)로 정규화해
+(경기, 구간) 행렬 하나로 메모리에 들고 있다가, 질의 벡터와의 거리를 행렬 연산으로 한 번에 계산합니다.
+
+- euclidean: 유클리드 거리
+- lb_keogh: DTW 하한(LB_Keogh) - 시점이 조금 어긋난 비슷한 흐름도 가깝게 평가
+
+사용법:
+    python -m src.analysis.similarity raw_data.csv match_info.csv --output similarity_index.npz
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Union
+import numpy as np
+from src.data.models import MatchData
+from src.analysis.turning_point import compute_window_momentum
+
+SIMILARITY_METRICS = ('euclidean', 'lb_keogh')
+# LB_Keogh 포락선 폭 (구간 수)
+DEFAULT_WARPING_WINDOW = 1
+
+
+def momentum_vector(match_data: MatchData) -> np.ndarray:
+    """경기 모멘텀 곡선을 -1 ~ 1 범위 고정 길이 벡터로 변환 (홈 팀 기준)"""
+    _, momentum = compute_window_momentum(match_data)
+    return np.asarray(momentum, dtype=np.float64) / 100.0
+
+
+def _envelope(vectors: np.ndarray, radius: int):
+    """각 시점 ±radius 범위의 (상한, 하한) 포락선"""
+    padded = np.pad(vectors, ((0, 0), (radius, radius)), mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1, axis=1)
+    return windows.max(axis=-1), windows.min(axis=-1)
+
+
+class MomentumIndex:
+    """
+    메모리 내 유사 경기 인덱스
+
+    - game_ids: (경기,)
+    - vectors: (경기, 구간) 정규화된 모멘텀 벡터
+    - home_teams, away_teams: (경기,)
+    """
+
+    def __init__(
+        self,
+        game_ids: np.ndarray,
+        vectors: np.ndarray,
+        home_teams: np.ndarray,
+        away_teams: np.ndarray,
+        warping_window: int = DEFAULT_WARPING_WINDOW
+    ):
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        self.vectors = np.asarray(vectors, dtype=np.float64)
+        self.home_teams = np.asarray(home_teams, dtype=object)
+        self.away_teams = np.asarray(away_teams, dtype=object)
+        self.warping_window = warping_window
+        self._rebuild()
+
+    def _rebuild(self):
+        """질의 시 반복 계산하지 않도록 위치 사전, 제곱 노름, 포락선을 미리 계산"""
+        self._positions = {int(game_id): i for i, game_id in enumerate(self.game_ids)}
+        self._squared_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+        if len(self.vectors):
+            self._upper, self._lower = _envelope(self.vectors, self.warping_window)
+        else:
+            self._upper = self._lower = self.vectors
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def __contains__(self, game_id: int) -> bool:
+        return int(game_id) in self._positions
+
+    @classmethod
+    def from_matches(cls, matches: Sequence[MatchData]) -> 'MomentumIndex':
+        index = cls(np.empty(0, dtype=np.int64), np.empty((0, 0)), [], [])
+        index.upsert(matches)
+        return index
+
+    def upsert(self, matches: Sequence[MatchData]):
+        """경기 추가 (이미 있는 경기는 새 벡터로 교체)"""
+        if not matches:
+            return
+        new_ids = np.array([int(md.match_id) for md in matches], dtype=np.int64)
+        new_vectors = np.stack([momentum_vector(md) for md in matches])
+        keep = ~np.isin(self.game_ids, new_ids)
+
+        old_vectors = self.vectors[keep] if len(self.vectors) else np.empty((0, new_vectors.shape[1]))
+        self.game_ids = np.concatenate([self.game_ids[keep], new_ids])
+        self.vectors = np.concatenate([old_vectors, new_vectors])
+        self.home_teams = np.concatenate([self.home_teams[keep], [md.home_team for md in matches]])
+        self.away_teams = np.concatenate([self.away_teams[keep], [md.away_team for md in matches]])
+        self._rebuild()
+
+    def remove(self, game_ids: Iterable[int]):
+        """경기 삭제 (인덱스에 없는 경기는 무시)"""
+        keep = ~np.isin(self.game_ids, np.fromiter((int(game_id) for game_id in game_ids), dtype=np.int64))
+        self.game_ids = self.game_ids[keep]
+        self.vectors = self.vectors[keep]
+        self.home_teams = self.home_teams[keep]
+        self.away_teams = self.away_teams[keep]
+        self._rebuild()
+
+    def distances(self, query: np.ndarray, metric: str = 'euclidean') -> np.ndarray:
+        """질의 벡터와 인덱스 전체 경기의 거리 (경기,)"""
+        if metric == 'euclidean':
+            squared = self._squared_norms - 2 * self.vectors @ query + query @ query
+            return np.sqrt(np.maximum(squared, 0.0))
+        if metric == 'lb_keogh':
+            above = np.maximum(query - self._upper, 0.0)
+            below = np.maximum(self._lower - query, 0.0)
+            return np.sqrt(np.einsum('ij,ij->i', above, above) + np.einsum('ij,ij->i', below, below))
+        raise ValueError(f"지원하지 않는 거리 방식입니다: {metric}")
+
+    def query(
+        self,
+        game_id: int,
+        k: int = 5,
+        metric: str = 'euclidean',
+        allow_mirror: bool = False
+    ) -> List[Dict]:
+        """
+        경기 ID로 흐름이 비슷한 상위 k개 경기 검색 (자기 자신 제외)
+
+        Args:
+            allow_mirror: 홈/원정을 뒤집은 흐름(벡터 부호 반전)도 비슷한 것으로 인정
+
+        Raises:
+            KeyError: 인덱스에 없는 경기인 경우
+        """
+        position = self._positions[int(game_id)]
+        query = self.vectors[position]
+        distances = self.distances(query, metric)
+        mirrored = np.zeros(len(distances), dtype=bool)
+        if allow_mirror:
+            mirror_distances = self.distances(-query, metric)
+            mirrored = mirror_distances < distances
+            distances = np.where(mirrored, mirror_distances, distances)
+        distances[position] = np.inf
+
+        k = min(k, len(distances) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [
+            {
+                'game_id': int(self.game_ids[i]),
+                'home_team': str(self.home_teams[i]),
+                'away_team': str(self.away_teams[i]),
+                'distance': round(float(distances[i]), 4),
+                'mirrored': bool(mirrored[i]),
+            }
+            for i in top
+        ]
+
+    def save(self, path: Union[str, Path]):
+        """인덱스 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 완성된 파일만 봄)"""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                game_ids=self.game_ids,
+                vectors=self.vectors,
+                home_teams=self.home_teams.astype(str),
+                away_teams=self.away_teams.astype(str),
+                warping_window=self.warping_window,
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'MomentumIndex':
+        with np.load(path) as data:
+            return cls(
+                data['game_ids'], data['vectors'], data['home_teams'], data['away_teams'],
+                int(data['warping_window'])
+            )
+
+
+# 프로세스 내 인덱스 캐시 {경로: (파일 수정 시각, 인덱스)}
+_INDEX_CACHE: Dict[str, tuple] = {}
+
+
+def open_similarity_index(index_path: Union[str, Path]) -> MomentumIndex:
+    """
+    프로세스당 한 번만 로드해 재사용하는 인덱스
+
+    인덱스는 CLI나 증분 수집(src.data.incremental)으로 미리 만들어 두며, 여기서는 생성하지 않습니다.
+    인덱스 파일이 갱신되면 다음 조회 시 다시 로드합니다.
+
+    Raises:
+        FileNotFoundError: 인덱스 파일이 아직 없는 경우
+    """
+    path = Path(index_path)
+    if not path.exists():
+        raise FileNotFoundError(f"유사 경기 인덱스가 없습니다: {path}")
+
+    mtime = path.stat().st_mtime
+    cached = _INDEX_CACHE.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    index = MomentumIndex.load(path)
+    _INDEX_CACHE[str(path)] = (mtime, index)
+    return index
+
+
+def main():
+    from src.data.loader import iter_matches
+
+    parser = argparse.ArgumentParser(description="유사 경기 검색 인덱스 생성")
+    parser.add_argument('raw_data_path', help="raw_data.csv, 파티션 또는 이벤트 저장소 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('--output', default='similarity_index.npz', help="인덱스 저장 경로")
+    args = parser.parse_args()
+
+    index = MomentumIndex.from_matches(list(iter_matches(args.raw_data_path, args.match_info_path)))
+    index.save(args.output)
+    print(f"경기 {len(index)}개 인덱스 저장 완료: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
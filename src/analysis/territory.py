@@ -0,0 +1,160 @@
+"""
+영역 지배(territory control) 격자 모듈
+
+경기장을 격자(기본 50 × 34)로 나누고, 5분 구간마다 각 칸을 최근 행동이 더 밀집한 팀에 배정합니다.
+
+- 원정 팀 좌표는 홈 팀 공격 방향 기준으로 뒤집어(x → 100 - x, y → 100 - y) 한 경기장에 겹칩니다.
+- 팀별 밀도는 가우시안 커널 합이며, 구간 끝에 가까운 행동일수록 가중치가 큽니다(최근성).
+- 커널이 x/y로 분리되므로 (팀, 구간)마다 격자 전체를 (y 칸, 점) @ (점, x 칸) 행렬 곱 한 번으로 계산합니다.
+
+dominance = (홈 밀도 - 원정 밀도) / (홈 밀도 + 원정 밀도) ∈ [-1, 1] (양수: 홈 우세)
+"""
+from typing import Dict, Optional
+import numpy as np
+from src.data.models import MatchData
+from src.analysis.metrics import get_event_arrays
+
+# 격자 크기 (x 칸 수, y 칸 수) - 105 x 68m 경기장 비율
+GRID_SHAPE = (50, 34)
+# 커널 폭 (0-100 좌표 단위)
+KERNEL_BANDWIDTH = 6.0
+# 최근성 가중치 시간 상수 (초)
+RECENCY_SECONDS = 120.0
+# 두 팀 밀도 합이 이 값보다 작은 칸은 중립 (dominance 0, control -1)
+MIN_DENSITY = 1e-3
+
+
+def _cell_centers(n_cells: int) -> np.ndarray:
+    return (np.arange(n_cells) + 0.5) * (100.0 / n_cells)
+
+
+def build_territory_grid(
+    match_data: MatchData,
+    window_size: int = 5,
+    match_length: int = 90,
+    grid_shape: tuple = GRID_SHAPE,
+    bandwidth: float = KERNEL_BANDWIDTH,
+    recency_seconds: float = RECENCY_SECONDS
+) -> Dict[str, np.ndarray]:
+    """
+    구간별 팀 밀도와 지배 격자 계산
+
+    Returns:
+        - window_starts: (구간,)
+        - density: (팀(2), 구간, y 칸, x 칸) - 홈 공격 방향 기준 좌표
+        - dominance: (구간, y 칸, x 칸) [-1, 1], 양수는 홈 우세
+        - control: (구간, y 칸, x 칸) 0(홈) / 1(원정) / -1(중립)
+    """
+    arrays = get_event_arrays(match_data)
+    n_x, n_y = grid_shape
+    n_windows = (match_length + window_size - 1) // window_size
+
+    team = arrays['team']
+    minute = arrays['minute']
+    valid = (
+        (team >= 0) & (minute >= 0) & (minute < match_length) &
+        ~np.isnan(arrays['x']) & ~np.isnan(arrays['y'])
+    )
+    team = team[valid].astype(np.int64)
+    x = arrays['x'][valid]
+    y = arrays['y'][valid]
+    # 원정 팀 좌표를 홈 공격 방향 기준으로 반전
+    away = team == 1
+    x = np.where(away, 100.0 - x, x)
+    y = np.where(away, 100.0 - y, y)
+
+    window = minute[valid] // window_size
+    group = team * n_windows + window
+
+    # 최근성: 구간 끝 시각과의 차이 (분 단위 시계 + 피리어드 내 초)
+    clock = minute[valid] * 60.0 + np.mod(arrays['time_seconds'][valid], 60.0)
+    window_end = (window + 1) * window_size * 60.0
+    weights = np.exp(-np.clip(window_end - clock, 0.0, None) / recency_seconds)
+
+    # 분리 가능한 가우시안 커널: (점, x 칸), (점, y 칸)
+    kernel_x = np.exp(-0.5 * ((_cell_centers(n_x)[None, :] - x[:, None]) / bandwidth) ** 2)
+    kernel_y = np.exp(-0.5 * ((_cell_centers(n_y)[None, :] - y[:, None]) / bandwidth) ** 2)
+
+    # 그룹(팀, 구간)별 밀도 격자 = (y 칸, 점) @ (점, x 칸)
+    n_groups = 2 * n_windows
+    order = np.argsort(group, kind='stable')
+    bounds = np.searchsorted(group[order], np.arange(n_groups + 1))
+    weighted_y = (kernel_y * weights[:, None])[order]
+    kernel_x = kernel_x[order]
+    density = np.zeros((n_groups, n_y, n_x))
+    for g in range(n_groups):
+        start, end = bounds[g], bounds[g + 1]
+        if end > start:
+            density[g] = weighted_y[start:end].T @ kernel_x[start:end]
+    density = density.reshape(2, n_windows, n_y, n_x)
+
+    total = density[0] + density[1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dominance = np.where(total > MIN_DENSITY, (density[0] - density[1]) / total, 0.0)
+    control = np.where(total > MIN_DENSITY, np.where(dominance >= 0, 0, 1), -1).astype(np.int8)
+
+    return {
+        'window_starts': np.arange(n_windows) * window_size,
+        'density': density,
+        'dominance': dominance,
+        'control': control,
+    }
+
+
+def get_territory_grid(match_data: MatchData, window_size: int = 5) -> Dict[str, np.ndarray]:
+    """경기별 영역 지배 격자 (MatchData에 캐시)"""
+    return match_data.get_derived(
+        f'territory_{window_size}',
+        lambda md: build_territory_grid(md, window_size)
+    )
+
+
+def territory_for_team(dominance: np.ndarray, team_advantage: str) -> np.ndarray:
+    """
+    지배 격자를 해당 팀 공격 방향 기준으로 변환 (양수: 해당 팀 우세)
+
+    이벤트 좌표가 팀별 공격 방향 기준이므로 원정 팀 시점에서는 격자를 뒤집고 부호를 바꿉니다.
+    """
+    if team_advantage == 'home':
+        return dominance
+    return -dominance[..., ::-1, ::-1]
+
+
+def territory_to_dict(
+    match_data: MatchData,
+    minute: Optional[int] = None,
+    window_size: int = 5
+) -> dict:
+    """
+    API 응답용 영역 지배 격자
+
+    minute를 주면 해당 분이 속한 구간 하나만, 아니면 모든 구간을 반환합니다.
+    격자는 [y 칸][x 칸] 순서이며 홈 팀 공격 방향(x 증가) 기준입니다.
+    """
+    territory = get_territory_grid(match_data, window_size)
+    window_starts = territory['window_starts']
+    dominance = territory['dominance']
+    control = territory['control']
+
+    if minute is not None:
+        index = min(max(minute // window_size, 0), len(window_starts) - 1)
+        window_starts = window_starts[index:index + 1]
+        dominance = dominance[index:index + 1]
+        control = control[index:index + 1]
+
+    home_share = np.mean(control == 0, axis=(1, 2))
+    away_share = np.mean(control == 1, axis=(1, 2))
+    return {
+        'grid_shape': {'x': GRID_SHAPE[0], 'y': GRID_SHAPE[1]},
+        'orientation': f"{match_data.home_team} 공격 방향 기준 (x 증가)",
+        'windows': [
+            {
+                'minute_start': int(start),
+                'minute_end': int(start + window_size),
+                'home_control_share': round(float(home), 4),
+                'away_control_share': round(float(away), 4),
+                'dominance': np.round(grid, 3).tolist(),
+            }
+            for start, home, away, grid in zip(window_starts, home_share, away_share, dominance)
+        ],
+    }
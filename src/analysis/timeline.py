@@ -0,0 +1,237 @@
+"""
+초 단위 경기 타임라인 모듈
+
+이벤트의 원본 시간(period_id, time_seconds)을 그대로 사용하여
+임의 해상도(예: 10초)의 구간으로 집계하고, 누적합으로 임의 길이의 구간 지표를 계산합니다.
+구간은 피리어드 경계를 넘지 않으므로 전반 추가시간이 후반 초반과 섞이지 않습니다.
+"""
+from typing import Dict, Optional, Tuple
+import numpy as np
+from src.data.models import MatchData
+from src.analysis.metrics import (
+    WINDOW_SUM_FIELDS,
+    get_event_arrays,
+    derive_window_metrics,
+    calculate_momentum_array,
+)
+
+# 피리어드 기본 길이 (초) - 추가시간은 실제 마지막 이벤트 시각까지 구간을 늘려 포함
+PERIOD_LENGTH_SECONDS = 45 * 60
+
+
+class EventTimeline:
+    """
+    피리어드 경계를 인식하는 고정 해상도 누적합 타임라인
+
+    - counts: (팀(2), 필드, 구간) 구간별 합계
+    - cumulative: (팀(2), 필드, 구간 + 1) 누적합 (구간 [a, b)의 합 = cumulative[..., b] - cumulative[..., a])
+    - bin_period / bin_start: 각 구간의 피리어드와 피리어드 내 시작 시각(초)
+    """
+
+    def __init__(
+        self,
+        resolution: float,
+        counts: np.ndarray,
+        bin_period: np.ndarray,
+        bin_start: np.ndarray
+    ):
+        self.resolution = resolution
+        self.counts = counts
+        self.bin_period = bin_period
+        self.bin_start = bin_start
+        self.cumulative = np.concatenate(
+            [np.zeros(counts.shape[:-1] + (1,)), np.cumsum(counts, axis=-1)], axis=-1
+        )
+
+        # 각 구간이 속한 피리어드의 [첫 구간, 마지막 구간 + 1) 경계
+        n_bins = len(bin_period)
+        change = np.flatnonzero(np.diff(bin_period)) + 1
+        starts = np.concatenate([[0], change])
+        ends = np.concatenate([change, [n_bins]])
+        segment = np.repeat(np.arange(len(starts)), ends - starts)
+        self.period_first_bin = starts[segment]
+        self.period_end_bin = ends[segment]
+
+    @property
+    def n_bins(self) -> int:
+        return len(self.bin_period)
+
+    @property
+    def bin_minutes(self) -> np.ndarray:
+        """각 구간 시작 시각을 경기 분(float)으로 표현 (후반은 45분부터 시작)"""
+        return (self.bin_period - 1) * 45 + self.bin_start / 60.0
+
+    def locate(self, period: int, time_seconds: float) -> int:
+        """피리어드 내 시각(초)이 속한 구간 번호"""
+        in_period = np.flatnonzero(self.bin_period == period)
+        if len(in_period) == 0:
+            return 0
+        offset = int(time_seconds // self.resolution)
+        return int(in_period[min(max(offset, 0), len(in_period) - 1)])
+
+    def _window_bounds(self, window_seconds: float, leading: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+        """각 구간 경계 기준 직전(직후) 창의 [시작, 끝) 구간 번호와 전체 창 길이(구간 수)"""
+        width = max(1, int(round(window_seconds / self.resolution)))
+        bins = np.arange(self.n_bins)
+        if leading:
+            start = bins
+            end = np.minimum(bins + width, self.period_end_bin)
+        else:
+            end = bins
+            start = np.maximum(bins - width, self.period_first_bin)
+        return start, end, width
+
+    def window_sums(
+        self,
+        window_seconds: float,
+        leading: bool = False,
+        normalize: bool = False
+    ) -> np.ndarray:
+        """
+        각 구간 경계 기준 직전(또는 직후) window_seconds 동안의 합계
+
+        피리어드 경계에서 잘리므로 서로 다른 피리어드의 이벤트가 섞이지 않습니다.
+
+        Args:
+            normalize: True면 피리어드 경계에서 잘린 창의 합계를 window_seconds 길이로 환산
+
+        Returns:
+            (팀(2), 구간, 필드) 배열
+        """
+        start, end, width = self._window_bounds(window_seconds, leading)
+        sums = np.swapaxes(self.cumulative[..., end] - self.cumulative[..., start], -1, -2)
+        if normalize:
+            sums = sums * (width / np.maximum(end - start, 1))[:, None]
+        return sums
+
+    def window_metrics(
+        self,
+        window_seconds: float,
+        leading: bool = False,
+        normalize: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """window_sums를 TimeWindowMetrics 지표 배열(팀, 구간)로 변환"""
+        return derive_window_metrics(self.window_sums(window_seconds, leading, normalize))
+
+    def momentum(
+        self,
+        window_seconds: float = 300.0,
+        leading: bool = False,
+        normalize: bool = False
+    ) -> np.ndarray:
+        """각 구간 경계 기준 직전(직후) window_seconds 구간의 모멘텀 점수 (구간,)"""
+        return calculate_momentum_array(self.window_metrics(window_seconds, leading, normalize))
+
+    def shift_scores(self, window_seconds: float = 300.0) -> np.ndarray:
+        """
+        각 구간 경계에서의 모멘텀 변화량 |직후 모멘텀 - 직전 모멘텀|
+
+        피리어드 경계에서 잘린 직전/직후 창은 합계를 전체 길이로 환산해 비교하고,
+        한쪽 창이 비어 있는 경계(피리어드 시작/끝)는 NaN으로 둡니다
+        (빈 창과 비교하면 변화량이 부풀어 피리어드 시작이 항상 선택됨).
+        """
+        scores = np.abs(
+            self.momentum(window_seconds, leading=True, normalize=True) -
+            self.momentum(window_seconds, leading=False, normalize=True)
+        )
+        before_start, before_end, _ = self._window_bounds(window_seconds, leading=False)
+        after_start, after_end, _ = self._window_bounds(window_seconds, leading=True)
+        empty = (before_end == before_start) | (after_end == after_start)
+        return np.where(empty, np.nan, scores)
+
+
+def build_event_timeline(match_data: MatchData, resolution: float = 10.0) -> EventTimeline:
+    """
+    경기 이벤트를 resolution(초) 단위 구간으로 집계
+
+    모든 팀/필드/구간 합계를 한 번의 bincount로 계산합니다.
+    """
+    arrays = get_event_arrays(match_data)
+    period = arrays['period'].astype(np.int64)
+    time_seconds = np.maximum(arrays['time_seconds'], 0.0)
+    team = arrays['team'].astype(np.int64)
+
+    # 피리어드별 구간 수: 기본 45분, 추가시간은 마지막 이벤트까지 포함
+    periods = np.unique(period) if len(period) else np.array([1, 2])
+    periods = np.union1d(periods, [1, 2])
+    bins_per_period = []
+    for p in periods:
+        last = time_seconds[period == p].max() if np.any(period == p) else 0.0
+        length = max(PERIOD_LENGTH_SECONDS, last + 1e-9)
+        bins_per_period.append(int(np.ceil(length / resolution)))
+    bins_per_period = np.array(bins_per_period)
+    period_offset = np.concatenate([[0], np.cumsum(bins_per_period)[:-1]])
+    n_bins = int(bins_per_period.sum())
+
+    bin_period = np.repeat(periods, bins_per_period)
+    bin_start = (np.arange(n_bins) - np.repeat(period_offset, bins_per_period)) * resolution
+
+    # 이벤트 → (팀, 구간) 평탄화 인덱스
+    period_pos = np.searchsorted(periods, period)
+    event_bin = period_offset[period_pos] + np.minimum(
+        (time_seconds // resolution).astype(np.int64), bins_per_period[period_pos] - 1
+    )
+    valid = team >= 0
+    flat = team[valid] * n_bins + event_bin[valid]
+    sums = arrays['sums'][valid]
+
+    n_fields = len(WINDOW_SUM_FIELDS)
+    counts = np.empty((2, n_fields, n_bins))
+    for k in range(n_fields):
+        counts[:, k, :] = np.bincount(
+            flat, weights=sums[:, k], minlength=2 * n_bins
+        ).reshape(2, n_bins)
+
+    return EventTimeline(resolution, counts, bin_period, bin_start.astype(np.float64))
+
+
+def get_event_timeline(match_data: MatchData, resolution: float = 10.0) -> EventTimeline:
+    """경기별 타임라인 (MatchData에 해상도별로 캐시)"""
+    return match_data.get_derived(
+        f'timeline_{resolution}',
+        lambda md: build_event_timeline(md, resolution)
+    )
+
+
+def locate_shift_second(
+    match_data: MatchData,
+    minute: int,
+    search_minutes: float = 2.5,
+    window_seconds: float = 300.0,
+    resolution: float = 10.0
+) -> Tuple[Optional[int], Optional[float]]:
+    """
+    분 단위로 탐지된 변곡 시점 주변에서 모멘텀 변화가 가장 큰 초 단위 시점 탐색
+
+    탐색 범위는 기본적으로 5분 구간의 절반(앞뒤 2.5분)이라 이웃한 구간 경계의 변곡점과
+    범위가 겹치지 않으므로, 연속된 두 변곡점이 같은 초로 정해지지 않습니다.
+
+    Args:
+        minute: 분 단위 변곡 시점 (구간 시작 분)
+        search_minutes: 앞뒤로 탐색할 범위 (분)
+        window_seconds: 변화량 비교에 사용할 직전/직후 구간 길이 (초)
+
+    Returns:
+        (피리어드, 피리어드 내 시각(초)) - 탐색 범위에 비교할 수 있는 구간이 없으면 (None, None)
+    """
+    timeline = get_event_timeline(match_data, resolution)
+    scores = match_data.get_derived(
+        f'shift_scores_{resolution}_{window_seconds}',
+        lambda md: timeline.shift_scores(window_seconds)
+    )
+
+    bin_minutes = timeline.bin_minutes
+    # 분 값이 45 미만이면 전반, 이상이면 후반 구간에서만 탐색 (피리어드 경계 인식)
+    period = 1 if minute < 45 else 2
+    mask = (
+        (timeline.bin_period == period) &
+        (bin_minutes >= minute - search_minutes) &
+        (bin_minutes < minute + search_minutes) &
+        ~np.isnan(scores)
+    )
+    candidates = np.flatnonzero(mask)
+    if len(candidates) == 0:
+        return None, None
+
+    best = candidates[np.argmax(scores[candidates])]
+    return int(timeline.bin_period[best]), float(timeline.bin_start[best])
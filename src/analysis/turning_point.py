@@ -1,14 +1,114 @@
 """
 변곡점 탐지 알고리즘
 """
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from src.data.models import (
     MatchData, TimeWindowMetrics, MomentumScore, TurningPoint
 )
-from src.analysis.metrics import calculate_time_window_metrics, calculate_momentum_score
+from src.analysis.metrics import (
+    get_window_sum_array,
+    derive_window_metrics,
+    calculate_momentum_array,
+    window_metrics_from_arrays,
+)
+from src.analysis.timeline import locate_shift_second
+from src.analysis.shape import get_team_shape, shape_metric_arrays
+
+# 구간 길이 (분)
+WINDOW_SIZE = 5
+
+# 변곡점 판단 임계값
+TURNING_POINT_THRESHOLDS: Dict[str, float] = {
+    'momentum_change': 20,       # 후보 선정: 모멘텀 변화량
+    'xg': 0.3,                   # xG 변화량
+    'shots': 2,                  # 슈팅 수 변화량
+    'opponent_half_events': 3,   # 상대 진영 이벤트 변화량
+    'defense_avg_x': 5,          # 수비 평균 x 좌표 변화량
+    'pass_success_rate': 15,     # 패스 성공률 변화량 (%p)
+    'min_indicators': 2,         # 변곡점 확정에 필요한 지표 수
+}
+
+# 변곡점 탐지 방법 ('rules' 외에는 src.analysis.changepoint)
+DETECTION_METHODS = ('rules', 'cusum', 'pelt')
+
+# (지표 이름, 비교할 지표 배열) - 순서가 TurningPoint.indicators 순서
+INDICATOR_RULES: List[Tuple[str, str]] = [
+    ('xG_change', 'xg'),
+    ('shots_surge', 'shots'),
+    ('attack_zone_change', 'opponent_half_events'),
+    ('defense_line_shift', 'defense_avg_x'),
+    ('pass_pattern_change', 'pass_success_rate'),
+]
+
+# 선택 지표: 팀 대형 변화 (src.analysis.shape, use_shape=True일 때만 사용)
+SHAPE_INDICATOR_RULES: List[Tuple[str, str]] = [
+    ('shape_centroid_shift', 'centroid_x'),
+    ('shape_area_change', 'hull_area'),
+]
+SHAPE_THRESHOLDS: Dict[str, float] = {
+    'centroid_x': 8,       # 무게중심 x 변화량
+    'hull_area': 1500,     # 볼록 껍질 면적 변화량 (0-100 좌표 기준)
+}
 
 
-def detect_turning_points(match_data: MatchData) -> List[TurningPoint]:
+def evaluate_turning_point_rules(
+    metrics: Dict[str, np.ndarray],
+    momentum: np.ndarray,
+    thresholds: Optional[Dict[str, float]] = None,
+    rules: Optional[List[Tuple[str, str]]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    모든 연속 구간 쌍의 변곡점 규칙을 배열 연산으로 한 번에 평가
+
+    앞쪽 축(경기, 복제본 등)은 자유롭게 추가할 수 있습니다.
+
+    Args:
+        metrics: derive_window_metrics 결과 (..., 팀(2), 구간)
+        momentum: 구간별 모멘텀 (..., 구간)
+        thresholds: TURNING_POINT_THRESHOLDS 형식 (일부만 지정 가능)
+        rules: 평가할 (지표 이름, 지표 배열) 목록 (기본값 INDICATOR_RULES)
+
+    Returns:
+        - confirmed: (..., 구간 - 1) 변곡점 확정 여부 (i번째 값은 i+1번째 구간)
+        - indicators: (..., 지표 수, 구간 - 1) 지표별 충족 여부 (rules 순서)
+    """
+    rules = INDICATOR_RULES if rules is None else rules
+    limits = {**TURNING_POINT_THRESHOLDS, **SHAPE_THRESHOLDS}
+    if thresholds:
+        limits.update(thresholds)
+
+    # 1. 모멘텀 변화량 후보
+    candidates = np.abs(np.diff(momentum, axis=-1)) >= limits['momentum_change']
+
+    # 2. 지표별 변화량 (홈/원정 중 하나라도 임계값 이상)
+    indicators = np.stack([
+        np.any(np.abs(np.diff(metrics[name], axis=-1)) >= limits[name], axis=-2)
+        for _, name in rules
+    ], axis=-2)
+
+    confirmed = candidates & (indicators.sum(axis=-2) >= limits['min_indicators'])
+    return confirmed, indicators
+
+
+def compute_window_momentum(match_data: MatchData) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    5분 단위 구간 시작 분과 모멘텀 점수 배열
+
+    Returns:
+        (구간 시작 분 배열, 모멘텀 배열)
+    """
+    metrics = derive_window_metrics(get_window_sum_array(match_data, WINDOW_SIZE))
+    momentum = calculate_momentum_array(metrics)
+    minutes = np.arange(len(momentum)) * WINDOW_SIZE
+    return minutes, momentum
+
+
+def detect_turning_points(
+    match_data: MatchData,
+    method: str = 'rules',
+    use_shape: bool = False
+) -> List[TurningPoint]:
     """
     경기 전체에서 변곡점 탐지
     
@@ -17,114 +117,126 @@ def detect_turning_points(match_data: MatchData) -> List[TurningPoint]:
     2. 공격 지역 점유 변화
     3. 수비 이벤트 평균 위치 변화
     4. 연속적인 패스 성공/실패 패턴 변화
+
+    Args:
+        method: 'rules' (5분 구간 규칙, 기본값) 또는 'cusum' / 'pelt'
+            (세밀한 모멘텀 시계열 변화점 탐지, src.analysis.changepoint)
+        use_shape: 팀 대형 변화(SHAPE_INDICATOR_RULES)도 지표로 사용 ('rules'에만 적용)
     """
-    events = match_data.events
-    turning_points = []
-    
-    # 5분 단위로 지표 계산
-    time_windows = []
-    for minute in range(0, 90, 5):
-        minute_end = min(minute + 5, 90)
-        
-        home_metrics = calculate_time_window_metrics(
-            events, match_data.home_team, minute, minute_end
-        )
-        away_metrics = calculate_time_window_metrics(
-            events, match_data.away_team, minute, minute_end
+    if method == 'rules':
+        return detect_turning_points_batch([match_data], use_shape)[0]
+    if method not in DETECTION_METHODS:
+        raise ValueError(f"지원하지 않는 변곡점 탐지 방법입니다: {method}")
+
+    from src.analysis.changepoint import detect_changepoint_turning_points
+    return detect_changepoint_turning_points(match_data, method)
+
+
+def detect_turning_points_batch(
+    matches: List[MatchData],
+    use_shape: bool = False
+) -> List[List[TurningPoint]]:
+    """
+    여러 경기의 변곡점을 한 번에 탐지
+
+    모든 경기의 5분 구간 지표를 (경기, 팀, 구간) 배열로 쌓아 규칙을 한 번에 평가하고,
+    확정된 구간에 대해서만 TimeWindowMetrics/설명/TurningPoint를 생성합니다.
+
+    Args:
+        use_shape: 팀 대형 지표(무게중심, 볼록 껍질 면적) 변화도 지표로 사용
+    """
+    if not matches:
+        return []
+
+    # (경기, 팀, 구간, 필드)
+    window_sums = np.stack([get_window_sum_array(md, WINDOW_SIZE) for md in matches])
+    metrics = derive_window_metrics(window_sums)
+    momentum = calculate_momentum_array(metrics)
+
+    rules = INDICATOR_RULES
+    if use_shape:
+        shape = np.stack([get_team_shape(md, WINDOW_SIZE) for md in matches])
+        metrics.update(shape_metric_arrays(shape))
+        rules = INDICATOR_RULES + SHAPE_INDICATOR_RULES
+    confirmed, indicator_masks = evaluate_turning_point_rules(metrics, momentum, rules=rules)
+
+    results: List[List[TurningPoint]] = [[] for _ in matches]
+    for match_index, pair_index in zip(*np.nonzero(confirmed)):
+        match_data = matches[match_index]
+        i = pair_index + 1  # 변화 후 구간
+        indicators = [
+            name for k, (name, _) in enumerate(rules)
+            if indicator_masks[match_index, k, pair_index]
+        ]
+        turning_point = build_turning_point(
+            match_data,
+            {key: values[match_index] for key, values in metrics.items()},
+            float(momentum[match_index, i]),
+            i,
+            indicators
         )
-        
-        momentum = calculate_momentum_score(home_metrics, away_metrics)
-        
-        time_windows.append({
-            'minute': minute,
-            'home_metrics': home_metrics,
-            'away_metrics': away_metrics,
-            'momentum': momentum
-        })
+        results[match_index].append(turning_point)
+
+    return results
+
+
+def build_turning_point(
+    match_data: MatchData,
+    metrics: Dict[str, np.ndarray],
+    curr_momentum: float,
+    window_index: int,
+    indicators: List[str]
+) -> TurningPoint:
+    """
+    확정된 구간(window_index)과 직전 구간으로 TurningPoint 생성
+
+    Args:
+        metrics: 해당 경기의 derive_window_metrics 결과 (팀, 구간)
+        curr_momentum: 변화 후 구간의 모멘텀
+    """
+    minute = window_index * WINDOW_SIZE
+    prev_home = window_metrics_from_arrays(metrics, 0, window_index - 1, match_data.home_team, WINDOW_SIZE)
+    prev_away = window_metrics_from_arrays(metrics, 1, window_index - 1, match_data.away_team, WINDOW_SIZE)
+    curr_home = window_metrics_from_arrays(metrics, 0, window_index, match_data.home_team, WINDOW_SIZE)
+    curr_away = window_metrics_from_arrays(metrics, 1, window_index, match_data.away_team, WINDOW_SIZE)
+
+    team_advantage = 'home' if curr_momentum > 0 else 'away'
     
-    # 변곡점 후보 탐지 (모멘텀 변화가 큰 지점)
-    for i in range(1, len(time_windows)):
-        prev_momentum = time_windows[i-1]['momentum']
-        curr_momentum = time_windows[i]['momentum']
-        momentum_change = abs(curr_momentum - prev_momentum)
-        
-        # 모멘텀 변화가 20 이상이면 후보
-        if momentum_change >= 20:
-            prev_home = time_windows[i-1]['home_metrics']
-            prev_away = time_windows[i-1]['away_metrics']
-            curr_home = time_windows[i]['home_metrics']
-            curr_away = time_windows[i]['away_metrics']
-            
-            # 변곡점 지표 확인
-            indicators = []
-            
-            # 1. 슈팅/xG 급증/급감
-            home_xg_change = curr_home.xg - prev_home.xg
-            away_xg_change = curr_away.xg - prev_away.xg
-            if abs(home_xg_change) >= 0.3 or abs(away_xg_change) >= 0.3:
-                indicators.append('xG_change')
-            
-            home_shots_change = curr_home.shots - prev_home.shots
-            away_shots_change = curr_away.shots - prev_away.shots
-            if abs(home_shots_change) >= 2 or abs(away_shots_change) >= 2:
-                indicators.append('shots_surge')
-            
-            # 2. 공격 지역 점유 변화
-            home_opp_half_change = curr_home.opponent_half_events - prev_home.opponent_half_events
-            away_opp_half_change = curr_away.opponent_half_events - prev_away.opponent_half_events
-            if abs(home_opp_half_change) >= 3 or abs(away_opp_half_change) >= 3:
-                indicators.append('attack_zone_change')
-            
-            # 3. 수비 이벤트 평균 위치 변화
-            home_defense_change = abs(curr_home.defense_avg_x - prev_home.defense_avg_x)
-            away_defense_change = abs(curr_away.defense_avg_x - prev_away.defense_avg_x)
-            if home_defense_change >= 5 or away_defense_change >= 5:
-                indicators.append('defense_line_shift')
-            
-            # 4. 패스 성공률 변화
-            home_pass_change = abs(curr_home.pass_success_rate - prev_home.pass_success_rate)
-            away_pass_change = abs(curr_away.pass_success_rate - prev_away.pass_success_rate)
-            if home_pass_change >= 15 or away_pass_change >= 15:
-                indicators.append('pass_pattern_change')
-            
-            # 2개 이상 충족 시 변곡점 확정
-            if len(indicators) >= 2:
-                team_advantage = 'home' if curr_momentum > 0 else 'away'
-                
-                # 변화 유형 결정
-                if 'xG_change' in indicators or 'shots_surge' in indicators:
-                    change_type = 'attack_surge'
-                elif 'defense_line_shift' in indicators:
-                    change_type = 'defense_breakdown'
-                else:
-                    change_type = 'momentum_shift'
-                
-                # 설명 생성 (간단한 버전, 나중에 explanation 모듈로 이동)
-                explanation = generate_simple_explanation(
-                    minute=time_windows[i]['minute'],
-                    team_advantage=team_advantage,
-                    indicators=indicators,
-                    prev_home=prev_home,
-                    prev_away=prev_away,
-                    curr_home=curr_home,
-                    curr_away=curr_away,
-                    home_team=match_data.home_team,
-                    away_team=match_data.away_team
-                )
-                
-                turning_point = TurningPoint(
-                    minute=time_windows[i]['minute'],
-                    team_advantage=team_advantage,
-                    change_type=change_type,
-                    indicators=indicators,
-                    explanation=explanation,
-                    metrics_before=prev_home if team_advantage == 'home' else prev_away,
-                    metrics_after=curr_home if team_advantage == 'home' else curr_away
-                )
-                
-                turning_points.append(turning_point)
+    # 변화 유형 결정
+    if 'xG_change' in indicators or 'shots_surge' in indicators:
+        change_type = 'attack_surge'
+    elif 'defense_line_shift' in indicators:
+        change_type = 'defense_breakdown'
+    else:
+        change_type = 'momentum_shift'
+    
+    # 설명 생성 (간단한 버전, 나중에 explanation 모듈로 이동)
+    explanation = generate_simple_explanation(
+        minute=minute,
+        team_advantage=team_advantage,
+        indicators=indicators,
+        prev_home=prev_home,
+        prev_away=prev_away,
+        curr_home=curr_home,
+        curr_away=curr_away,
+        home_team=match_data.home_team,
+        away_team=match_data.away_team
+    )
     
-    return turning_points
+    # 초 단위 변곡 시점 (10초 해상도 타임라인에서 모멘텀 변화가 가장 큰 시점)
+    period, time_seconds = locate_shift_second(match_data, minute)
+    
+    return TurningPoint(
+        minute=minute,
+        period=period,
+        time_seconds=time_seconds,
+        team_advantage=team_advantage,
+        change_type=change_type,
+        indicators=indicators,
+        explanation=explanation,
+        metrics_before=prev_home if team_advantage == 'home' else prev_away,
+        metrics_after=curr_home if team_advantage == 'home' else curr_away
+    )
 
 
 def generate_simple_explanation(
@@ -175,6 +287,9 @@ def generate_simple_explanation(
         else:
             explanations.append(f"패스 성공률이 급격히 하락하며 공격 흐름이 끊겼습니다")
     
+    if 'shape_centroid_shift' in indicators or 'shape_area_change' in indicators:
+        explanations.append(f"팀 대형(무게중심과 점유 면적)이 크게 바뀌었습니다")
+    
     base = f"{minute}분 이후"
     if explanations:
         return base + ", " + ", ".join(explanations) + "."
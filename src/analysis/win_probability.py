@@ -0,0 +1,185 @@
+"""
+분 단위 승리 확률 모델 (몬테카를로 포아송 시뮬레이션)
+
+각 분 시점의 현재 스코어와 남은 시간 동안의 기대 득점(xG 비율)으로
+남은 경기 결과를 수만~수십만 번 시뮬레이션하여 홈 승/무/원정 승 확률을 계산합니다.
+
+- 득점 비율은 그 시점까지 관측된 xG만 사용하고(사후 정보 없음) 리그 평균 사전값과 혼합합니다.
+- 모든 분 시점 × 모든 시뮬레이션을 하나의 (분, 시뮬레이션) 배열로 처리합니다.
+  포아송 표본은 균등 난수의 역누적분포(inverse CDF)로 뽑으며, 같은 난수를 모든 분 시점에
+  공유(common random numbers)하여 곡선이 시뮬레이션 잡음으로 흔들리지 않도록 합니다.
+"""
+from typing import Dict, Optional
+import numpy as np
+from src.data.models import MatchData
+from src.analysis.metrics import get_event_arrays, WINDOW_SUM_FIELDS
+
+# 정규 시간 (분)
+MATCH_LENGTH = 90
+# 리그 평균 팀당 경기 기대 득점 (사전값)
+PRIOR_XG_PER_MATCH = 1.3
+# 사전값의 무게 (관측 시간 몇 분에 해당하는지)
+PRIOR_WEIGHT_MINUTES = 30.0
+# 기본 시뮬레이션 횟수
+DEFAULT_SIMULATIONS = 100_000
+# 역누적분포 표에서 무시하는 꼬리 확률
+POISSON_TAIL = 1e-7
+
+XG_FIELD = WINDOW_SUM_FIELDS.index('xg')
+GOAL_FIELD = WINDOW_SUM_FIELDS.index('goals')
+
+
+def minute_totals(match_data: MatchData, match_length: int = MATCH_LENGTH) -> np.ndarray:
+    """
+    팀별 분 단위 xG/득점 합계
+
+    추가시간 이벤트는 마지막 분(match_length - 1)에 포함합니다.
+
+    Returns:
+        (필드(xg, goals), 팀(2), 분) 배열
+    """
+    arrays = get_event_arrays(match_data)
+    team = arrays['team']
+    valid = team >= 0
+    minute = np.clip(arrays['minute'][valid], 0, match_length - 1)
+    flat = team[valid].astype(np.int64) * match_length + minute
+    sums = arrays['sums'][valid]
+
+    return np.stack([
+        np.bincount(flat, weights=sums[:, field], minlength=2 * match_length).reshape(2, match_length)
+        for field in (XG_FIELD, GOAL_FIELD)
+    ])
+
+
+def estimate_remaining_xg(
+    match_data: MatchData,
+    match_length: int = MATCH_LENGTH,
+    prior_xg: float = PRIOR_XG_PER_MATCH,
+    prior_minutes: float = PRIOR_WEIGHT_MINUTES
+) -> Dict[str, np.ndarray]:
+    """
+    각 분 시점(0 ~ match_length)의 스코어와 남은 시간 기대 득점
+
+    m분 시점의 팀별 득점 비율 = (m분까지 xG + 사전 비율 × prior_minutes) / (m + prior_minutes)
+
+    Returns:
+        - minutes: (분 시점,)
+        - score: (팀(2), 분 시점) m분 시점까지의 득점
+        - remaining_xg: (팀(2), 분 시점) 남은 시간 기대 득점
+    """
+    xg, goals = minute_totals(match_data, match_length)
+    zeros = np.zeros((2, 1))
+    cumulative_xg = np.concatenate([zeros, np.cumsum(xg, axis=1)], axis=1)
+    score = np.concatenate([zeros, np.cumsum(goals, axis=1)], axis=1)
+
+    minutes = np.arange(match_length + 1)
+    prior_rate = prior_xg / match_length
+    rate = (cumulative_xg + prior_rate * prior_minutes) / (minutes + prior_minutes)
+
+    return {
+        'minutes': minutes,
+        'score': score,
+        'remaining_xg': rate * (match_length - minutes),
+    }
+
+
+def poisson_cdf_table(expected: np.ndarray, max_goals: int) -> np.ndarray:
+    """(..., max_goals) 포아송 누적분포 표 (마지막 열은 1로 고정)"""
+    pmf = np.empty(expected.shape + (max_goals,))
+    pmf[..., 0] = np.exp(-expected)
+    for k in range(1, max_goals):
+        pmf[..., k] = pmf[..., k - 1] * expected / k
+    cdf = np.cumsum(pmf, axis=-1)
+    cdf[..., -1] = 1.0
+    return cdf
+
+
+def _max_goals(expected: np.ndarray) -> int:
+    """가장 큰 기대 득점에서도 꼬리 확률이 POISSON_TAIL 미만이 되는 최대 득점 수"""
+    peak = float(expected.max(initial=0.0))
+    pmf = cdf = np.exp(-peak)
+    k = 0
+    while 1.0 - cdf > POISSON_TAIL and k < 50:
+        k += 1
+        pmf *= peak / k
+        cdf += pmf
+    return k + 1
+
+
+def simulate_win_probability(
+    score: np.ndarray,
+    remaining_xg: np.ndarray,
+    n_simulations: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = 0
+) -> Dict[str, np.ndarray]:
+    """
+    모든 분 시점의 남은 경기를 한 번에 시뮬레이션하여 결과 확률 계산
+
+    Args:
+        score: (팀(2), 분 시점) 현재 스코어
+        remaining_xg: (팀(2), 분 시점) 남은 시간 기대 득점
+        n_simulations: 시뮬레이션 횟수
+        seed: 난수 시드 (같은 입력이면 같은 곡선)
+
+    Returns:
+        {'home_win', 'draw', 'away_win'}: (분 시점,) 확률
+    """
+    rng = np.random.default_rng(seed)
+    uniforms = rng.random((2, 1, n_simulations), dtype=np.float32)
+    cdf = poisson_cdf_table(remaining_xg, _max_goals(remaining_xg)).astype(np.float32)
+
+    # (분 시점, 시뮬레이션) 최종 득실차: 난수가 k번째 누적확률을 넘을 때마다 득점 1 추가
+    difference = np.repeat(
+        (score[0] - score[1]).astype(np.int16)[:, None], n_simulations, axis=1
+    )
+    for k in range(cdf.shape[-1] - 1):
+        difference += uniforms[0] > cdf[0, :, k, None]
+        difference -= uniforms[1] > cdf[1, :, k, None]
+
+    home_win = np.count_nonzero(difference > 0, axis=1) / n_simulations
+    away_win = np.count_nonzero(difference < 0, axis=1) / n_simulations
+    return {
+        'home_win': home_win,
+        'draw': 1.0 - home_win - away_win,
+        'away_win': away_win,
+    }
+
+
+def compute_win_probability(
+    match_data: MatchData,
+    n_simulations: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = 0
+) -> Dict[str, np.ndarray]:
+    """
+    경기의 분 단위 승리 확률 곡선 (MatchData에 캐시)
+
+    Returns:
+        minutes, home_score, away_score, home_remaining_xg, away_remaining_xg,
+        home_win, draw, away_win - 모두 (분 시점,) 배열
+    """
+    def build(md: MatchData) -> Dict[str, np.ndarray]:
+        state = estimate_remaining_xg(md)
+        probabilities = simulate_win_probability(
+            state['score'], state['remaining_xg'], n_simulations, seed
+        )
+        return {
+            'minutes': state['minutes'],
+            'home_score': state['score'][0],
+            'away_score': state['score'][1],
+            'home_remaining_xg': state['remaining_xg'][0],
+            'away_remaining_xg': state['remaining_xg'][1],
+            **probabilities,
+        }
+
+    return match_data.get_derived(f'win_probability_{n_simulations}_{seed}', build)
+
+
+def win_probability_to_dict(win_probability: Dict[str, np.ndarray]) -> Dict[str, list]:
+    """API 응답용 변환 (확률은 소수 넷째 자리까지)"""
+    result = {}
+    for key, values in win_probability.items():
+        if key in ('minutes', 'home_score', 'away_score'):
+            result[key] = values.astype(int).tolist()
+        else:
+            result[key] = np.round(values, 4).tolist()
+    return result
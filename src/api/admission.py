@@ -0,0 +1,164 @@
+"""
+비싼 API 경로의 승인 제어 (동시 실행 제한 + 대기열 상한)
+
+경로 그룹(렌더링, 분석)마다 동시에 실행할 요청 수와 기다릴 수 있는 요청 수를 제한합니다.
+- 대기열까지 가득 차면 바로 429 (Too Many Requests)
+- 대기열에서 wait_timeout초 안에 차례가 오지 않으면 503 (Service Unavailable)
+두 경우 모두 최근 처리 시간으로 추정한 Retry-After 헤더를 붙입니다.
+
+부하가 몰려도 동시에 메모리에 올라가는 그림/경기 데이터 수가 상한을 넘지 않으므로
+OOM으로 프로세스가 죽는 대신 일부 요청을 거절하며 버팁니다. 제한은 서버 프로세스(워커)별입니다.
+제한하는 경로의 처리 함수는 동기 함수(def)로 두어 스레드 풀에서 실행되게 합니다.
+이벤트 루프에서 실행되면 한 번에 요청 하나만 처리되어 동시 실행 제한이 의미가 없습니다.
+
+거절 수, 대기 시간 분포, 현재 실행/대기 수는 render_metrics()로 Prometheus 텍스트 형식으로 내보냅니다.
+"""
+import asyncio
+import math
+import time
+from typing import Dict, List
+from fastapi import HTTPException
+
+# 결과 구분 (요청 수 카운터 라벨)
+ADMISSION_OUTCOMES = ('admitted', 'rejected_queue_full', 'rejected_timeout')
+# 대기 시간 히스토그램 구간 상한 (초)
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 처리 시간 이동 평균 가중치 (Retry-After 추정용)
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionLimiter:
+    """
+    경로 그룹 하나의 동시 실행 제한
+
+    FastAPI 의존성으로 사용합니다: @app.get(..., dependencies=[Depends(limiter)])
+
+    Args:
+        max_concurrent: 동시에 실행할 요청 수
+        max_waiting: 차례를 기다릴 수 있는 요청 수 (초과 시 429)
+        wait_timeout: 최대 대기 시간(초, 초과 시 503)
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_waiting: int, wait_timeout: float = 10.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.counts = {outcome: 0 for outcome in ADMISSION_OUTCOMES}
+        self.wait_bucket_counts = [0] * len(WAIT_BUCKETS)
+        self.wait_seconds_sum = 0.0
+        self.wait_count = 0
+        self.service_seconds = 1.0
+
+    def retry_after(self) -> int:
+        """지금 대기열이 모두 빠질 때까지의 추정 시간(초, 최소 1)"""
+        backlog = self.waiting + self.in_flight + 1
+        return max(1, math.ceil(self.service_seconds * backlog / self.max_concurrent))
+
+    def _reject(self, outcome: str, status_code: int, detail: str):
+        self.counts[outcome] += 1
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={'Retry-After': str(self.retry_after())}
+        )
+
+    def _observe_wait(self, seconds: float):
+        self.wait_seconds_sum += seconds
+        self.wait_count += 1
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.wait_bucket_counts[i] += 1
+
+    async def _acquire_slot(self):
+        """
+        wait_timeout초 안에 세마포어 얻기
+
+        시간 초과/취소와 획득이 겹치면 이미 얻은 허가를 돌려놓습니다 (wait_for만 쓰면 허가가 샐 수 있음).
+        """
+        acquiring = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            await asyncio.wait_for(asyncio.shield(acquiring), self.wait_timeout)
+        except BaseException:
+            acquiring.cancel()
+            acquiring.add_done_callback(self._release_if_acquired)
+            raise
+
+    def _release_if_acquired(self, acquiring: asyncio.Future):
+        if not acquiring.cancelled() and acquiring.exception() is None:
+            self._semaphore.release()
+
+    async def acquire(self):
+        """
+        실행 차례 얻기
+
+        Raises:
+            HTTPException: 대기열이 가득 찬 경우 (429) / 대기 시간 초과 (503)
+        """
+        if self.in_flight + self.waiting >= self.max_concurrent + self.max_waiting:
+            self._reject('rejected_queue_full', 429, f"요청이 많아 처리할 수 없습니다 ({self.name}). 잠시 후 다시 시도하세요.")
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._acquire_slot()
+        except asyncio.TimeoutError:
+            self._observe_wait(time.perf_counter() - started)
+            self._reject('rejected_timeout', 503, f"서버가 혼잡합니다 ({self.name}). 잠시 후 다시 시도하세요.")
+        finally:
+            self.waiting -= 1
+
+        self._observe_wait(time.perf_counter() - started)
+        self.counts['admitted'] += 1
+        self.in_flight += 1
+
+    def release(self, service_seconds: float):
+        self.in_flight -= 1
+        self.service_seconds += SERVICE_TIME_ALPHA * (service_seconds - self.service_seconds)
+        self._semaphore.release()
+
+    async def __call__(self):
+        await self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+
+def render_metrics(limiters: List[AdmissionLimiter], prefix: str = 'turning_point_admission') -> str:
+    """승인 제어 지표를 Prometheus 텍스트 형식으로 변환"""
+    lines = [
+        f"# HELP {prefix}_requests_total 경로 그룹별 승인/거절 요청 수",
+        f"# TYPE {prefix}_requests_total counter",
+    ]
+    for limiter in limiters:
+        for outcome, count in limiter.counts.items():
+            lines.append(f'{prefix}_requests_total{{route="{limiter.name}",outcome="{outcome}"}} {count}')
+
+    gauges: Dict[str, str] = {
+        'in_flight': "실행 중인 요청 수",
+        'waiting': "차례를 기다리는 요청 수",
+        'service_seconds': "최근 처리 시간 이동 평균(초)",
+    }
+    for attr, description in gauges.items():
+        lines += [f"# HELP {prefix}_{attr} {description}", f"# TYPE {prefix}_{attr} gauge"]
+        for limiter in limiters:
+            lines.append(f'{prefix}_{attr}{{route="{limiter.name}"}} {getattr(limiter, attr):g}')
+
+    lines += [
+        f"# HELP {prefix}_wait_seconds 실행 차례를 기다린 시간(초)",
+        f"# TYPE {prefix}_wait_seconds histogram",
+    ]
+    for limiter in limiters:
+        label = f'route="{limiter.name}"'
+        for bound, count in zip(WAIT_BUCKETS, limiter.wait_bucket_counts):
+            lines.append(f'{prefix}_wait_seconds_bucket{{{label},le="{bound:g}"}} {count}')
+        lines.append(f'{prefix}_wait_seconds_bucket{{{label},le="+Inf"}} {limiter.wait_count}')
+        lines.append(f'{prefix}_wait_seconds_sum{{{label}}} {limiter.wait_seconds_sum:.6f}')
+        lines.append(f'{prefix}_wait_seconds_count{{{label}}} {limiter.wait_count}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,461 @@
+"""
+백그라운드 렌더링 작업 큐
+
+오래 걸리는 그래프(히트맵, 선수 움직임, 라운드 대시보드)를 HTTP 요청 밖에서 그립니다.
+요청은 작업 ID만 받아 바로 반환하고, /jobs/{id}로 상태를 조회하거나 long-poll로 완료를 기다립니다.
+
+- 우선순위: live(진행 중 경기) 작업이 archive 작업보다 먼저 실행
+- 중복 제거: 같은 그래프(종류 + 파라미터 + 해당 경기 데이터 버전)는 대기/실행 중인 작업을 공유하고,
+  이미 그려 둔 그래프는 그림 캐시에서 바로 완료 처리 (캐시는 크기/보관 기간 상한을 넘으면 오래된 것부터 삭제)
+- 취소: 대기 중 작업은 실행되지 않고, 실행 중 작업은 결과만 버림 (그림은 캐시에 남음)
+- 실행: 작업자 스레드 수만큼만 동시에 렌더링하며, 렌더링 자체는 공용 프로세스 풀(src.analysis.process_pool)에서 수행
+  (pyplot 전역 상태는 스레드 안전하지 않고, 300dpi 그림 메모리를 서버 프로세스에서 분리).
+  풀의 작업자 프로세스가 죽으면(OOM 등) 해당 작업은 실패 처리하고 풀을 새로 만듭니다.
+"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import pandas as pd
+from pydantic import BaseModel, Field
+from src.analysis.turning_point import DETECTION_METHODS
+from src.analysis import process_pool
+from src.data.event_store import is_event_store, open_event_store
+from src.data.ingest import partition_path
+
+RENDER_KINDS = ('momentum', 'heatmap', 'movements', 'dashboard')
+PRIORITIES = {'live': 0, 'archive': 1}
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+# 그림 캐시 기본 상한 (전체 크기, 그린 뒤 보관 기간(초))
+DEFAULT_CACHE_BYTES = 1024 * 1024 * 1024
+DEFAULT_CACHE_AGE = 7 * 24 * 3600
+
+
+class RenderJobRequest(BaseModel):
+    """렌더링 작업 요청"""
+    kind: str = Field(..., pattern=f"^({'|'.join(RENDER_KINDS)})$", description="그래프 종류")
+    game_id: Optional[int] = Field(None, description="경기 ID (dashboard 제외 필수)")
+    turning_point_minute: Optional[int] = Field(None, description="변곡점 시점 (heatmap, movements 필수)")
+    game_day: Optional[int] = Field(None, description="라운드 번호 (dashboard 필수)")
+    method: str = Field("rules", pattern=f"^({'|'.join(DETECTION_METHODS)})$", description="변곡점 탐지 방법")
+    top_n: int = Field(5, ge=1, le=20, description="표시할 상위 선수 수 (movements)")
+    territory: bool = Field(False, description="영역 지배 격자 레이어 (heatmap)")
+    win_probability: bool = Field(False, description="승리 확률 곡선 (momentum)")
+    priority: str = Field("archive", pattern=f"^({'|'.join(PRIORITIES)})$", description="live 또는 archive")
+
+    def render_params(self) -> dict:
+        """그래프 결과를 결정하는 파라미터 (우선순위 제외)"""
+        required = {
+            'momentum': ('game_id',),
+            'heatmap': ('game_id', 'turning_point_minute'),
+            'movements': ('game_id', 'turning_point_minute'),
+            'dashboard': ('game_day',),
+        }[self.kind]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.kind} 작업에는 {', '.join(missing)} 값이 필요합니다.")
+
+        params = {name: getattr(self, name) for name in required}
+        params['method'] = self.method
+        if self.kind == 'movements':
+            params['top_n'] = self.top_n
+        if self.kind == 'heatmap':
+            params['territory'] = self.territory
+        if self.kind == 'momentum':
+            params['win_probability'] = self.win_probability
+        return params
+
+
+class JobQueueFull(Exception):
+    """대기 중 작업 수가 상한에 도달한 경우"""
+
+
+def render_figure(
+    kind: str,
+    params: dict,
+    raw_data_path: str,
+    match_info_path: str,
+    output_path: str
+):
+    """
+    그래프 하나 렌더링 (프로세스 풀 작업 단위, API 엔드포인트와 같은 그래프)
+
+    Raises:
+        FileNotFoundError: 경기 데이터가 없는 경우
+        LookupError: 해당 시점의 변곡점/선수 데이터나 라운드 경기가 없는 경우
+    """
+    from src.data.loader import load_match_by_id, load_match_info
+    from src.analysis.turning_point import detect_turning_points
+    from src.analysis.player_analysis import extract_player_activities
+    from src.visualization import plotter
+
+    if kind == 'dashboard':
+        from src.visualization.dashboard import round_game_ids, compute_round_timelines, plot_round_dashboard
+
+        game_day = params['game_day']
+        game_ids = round_game_ids(load_match_info(match_info_path), game_day)
+        timelines = compute_round_timelines(raw_data_path, match_info_path, game_ids, params['method'], parallel=False)
+        if not timelines:
+            raise LookupError(f"{game_day}라운드 경기를 찾을 수 없습니다.")
+        plot_round_dashboard(timelines, output_path, f"{game_day}라운드 경기 흐름")
+        return
+
+    match_data = load_match_by_id(raw_data_path, match_info_path, params['game_id'])
+    turning_points = detect_turning_points(match_data, params['method'])
+
+    if kind == 'momentum':
+        from src.analysis.win_probability import compute_win_probability
+
+        win_probability = compute_win_probability(match_data) if params['win_probability'] else None
+        plotter.plot_momentum_curve(match_data, turning_points, output_path, win_probability=win_probability)
+        return
+
+    minute = params['turning_point_minute']
+    target_tp = next((tp for tp in turning_points if abs(tp.minute - minute) <= 5), None)
+    if not target_tp:
+        raise LookupError(f"{minute}분 시점의 변곡점을 찾을 수 없습니다.")
+    player_activities = extract_player_activities(match_data, target_tp)
+    if not player_activities:
+        raise LookupError("해당 시점의 선수 데이터를 찾을 수 없습니다.")
+
+    if kind == 'heatmap':
+        plotter.plot_player_heatmap(
+            match_data, target_tp, player_activities, output_path, show_territory=params['territory']
+        )
+    else:
+        plotter.plot_player_movements(match_data, target_tp, player_activities, params['top_n'], output_path)
+
+
+def game_data_version(raw_data_path: Union[str, Path], game_id: int) -> str:
+    """
+    경기 하나의 데이터 버전
+
+    - 이벤트 저장소: 해당 경기 행의 내용 해시 (다른 경기 수집이나 압축에는 영향받지 않음)
+    - 파티션 디렉터리: 해당 경기 파티션 파일의 수정 시각/크기
+    - raw_data.csv: 파일 수정 시각/크기
+    """
+    path = Path(raw_data_path)
+    if is_event_store(path):
+        try:
+            frame = open_event_store(str(path)).game_frame(game_id)
+        except FileNotFoundError:
+            return 'missing'
+        return f"{int(pd.util.hash_pandas_object(frame, index=False).sum()) & 0xFFFFFFFFFFFFFFFF:x}"
+    if path.is_dir():
+        path = partition_path(path, game_id)
+    try:
+        stat = path.stat()
+    except OSError:
+        return 'missing'
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+class FigureCache:
+    """
+    작업 키별 PNG 파일 캐시 (렌더링 결과는 임시 파일에 쓴 뒤 원자적으로 교체)
+
+    Args:
+        max_bytes: 전체 크기 상한 (넘으면 가장 오래 조회되지 않은 그림부터 삭제)
+        max_age: 그린 뒤 보관 기간(초, None이면 제한 없음)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        max_age: Optional[float] = DEFAULT_CACHE_AGE
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def _expired(self, stat: os.stat_result, now: float) -> bool:
+        return self.max_age is not None and now - stat.st_mtime > self.max_age
+
+    def get(self, key: str) -> Optional[Path]:
+        """캐시된 그림 경로 (보관 기간이 지났으면 삭제 후 None, 조회 시각은 LRU 순서용으로 갱신)"""
+        path = self.path(key)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        now = time.time()
+        if self._expired(stat, now):
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path, (now, stat.st_mtime))
+        return path
+
+    def put(self, key: str, rendered_path: Path) -> Path:
+        """렌더링한 임시 파일을 캐시에 넣고 상한을 넘는 그림 정리"""
+        path = self.path(key)
+        rendered_path.replace(path)
+        self.prune()
+        return path
+
+    def prune(self):
+        """보관 기간이 지난 그림과, 크기 상한을 넘는 만큼 가장 오래 조회되지 않은 그림 삭제"""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.cache_dir.glob('*.png'):
+                if path.name.endswith('.tmp.png'):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if self._expired(stat, now):
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((stat.st_atime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+class RenderJob:
+    """렌더링 작업 상태 (같은 키의 요청은 한 작업을 공유)"""
+
+    def __init__(self, kind: str, params: dict, key: str, priority: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.key = key
+        self.priority = priority
+        self.state = 'queued'
+        self.cached = False
+        self.result_path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # 완료/실패/취소 시 설정 (long-poll 대기용)
+        self.future: Future = Future()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ('done', 'failed', 'cancelled')
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'priority': next(name for name, value in PRIORITIES.items() if value == self.priority),
+            'state': self.state,
+            'cached': self.cached,
+            'result_path': self.result_path,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class RenderJobQueue:
+    """
+    우선순위/중복 제거/취소를 지원하는 프로세스 내 렌더링 작업 큐
+
+    Args:
+        max_workers: 동시에 실행할 렌더링 수 (작업자 스레드 수, 공용 프로세스 풀의 작업자를 최대 이만큼 사용)
+        max_queued: 대기 가능한 작업 수 (초과 시 JobQueueFull)
+        max_history: 상태를 보관할 완료 작업 수
+    """
+
+    def __init__(
+        self,
+        cache: FigureCache,
+        raw_data_path: Union[str, Path],
+        match_info_path: Union[str, Path],
+        max_workers: int = 2,
+        max_queued: int = 100,
+        max_history: int = 1000
+    ):
+        self.cache = cache
+        self.raw_data_path = str(raw_data_path)
+        self.match_info_path = str(match_info_path)
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_history = max_history
+
+        self._jobs: "OrderedDict[str, RenderJob]" = OrderedDict()
+        self._active: Dict[str, RenderJob] = {}  # 키 → 대기/실행 중 작업
+        self._heap: List[tuple] = []  # (우선순위, 순번, 작업)
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+
+    def data_version(self, kind: str, params: dict) -> str:
+        """
+        그래프가 쓰는 경기 데이터의 버전 (해당 경기 데이터가 바뀌면 캐시 키가 달라짐)
+
+        라운드 대시보드는 라운드 모든 경기의 버전을 합칩니다. match_info는 스코어 등이 바뀔 수 있어 항상 포함합니다.
+        """
+        try:
+            stamps = [str(os.stat(self.match_info_path).st_mtime_ns)]
+        except OSError:
+            stamps = ['0']
+
+        if kind == 'dashboard':
+            from src.data.loader import load_match_info
+            from src.visualization.dashboard import round_game_ids
+
+            try:
+                game_ids = round_game_ids(load_match_info(self.match_info_path), params['game_day'])
+            except OSError:
+                game_ids = []
+        else:
+            game_ids = [params['game_id']]
+        stamps += [f"{game_id}:{game_data_version(self.raw_data_path, game_id)}" for game_id in game_ids]
+        return '-'.join(stamps)
+
+    def job_key(self, kind: str, params: dict) -> str:
+        payload = json.dumps(
+            {'kind': kind, 'params': params, 'data': self.data_version(kind, params)}, sort_keys=True
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def submit(self, request: RenderJobRequest) -> RenderJob:
+        """
+        작업 제출 (같은 작업이 대기/실행 중이면 그 작업, 캐시에 있으면 완료된 작업 반환)
+
+        Raises:
+            ValueError: 필수 파라미터가 없는 경우
+            JobQueueFull: 대기 중 작업 수가 상한에 도달한 경우
+        """
+        params = request.render_params()
+        priority = PRIORITIES[request.priority]
+        key = self.job_key(request.kind, params)
+
+        with self._condition:
+            job = self._active.get(key)
+            if job is not None:
+                # 더 급한 요청이 오면 대기 중 작업의 우선순위를 올림 (이전 힙 항목은 꺼낼 때 건너뜀)
+                if job.state == 'queued' and priority < job.priority:
+                    job.priority = priority
+                    heapq.heappush(self._heap, (priority, next(self._counter), job))
+                    self._condition.notify()
+                return job
+
+            job = RenderJob(request.kind, params, key, priority)
+            cached_path = self.cache.get(key)
+            if cached_path is not None:
+                job.cached = True
+                self._finish(job, 'done', result_path=str(cached_path))
+                self._remember(job)
+                return job
+
+            if sum(1 for active in self._active.values() if active.state == 'queued') >= self.max_queued:
+                raise JobQueueFull(f"대기 중인 렌더링 작업이 {self.max_queued}개를 넘었습니다.")
+
+            self._remember(job)
+            self._active[key] = job
+            heapq.heappush(self._heap, (priority, next(self._counter), job))
+            self._start_workers()
+            self._condition.notify()
+            return job
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[RenderJob]:
+        """작업 취소 (이미 끝난 작업은 그대로 반환)"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            self._active.pop(job.key, None)
+            self._finish(job, 'cancelled')
+            return job
+
+    async def wait(self, job: RenderJob, timeout: float) -> RenderJob:
+        """작업이 끝나거나 timeout초가 지날 때까지 이벤트 루프를 막지 않고 대기 (long-poll)"""
+        if not job.finished and timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def _remember(self, job: RenderJob):
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_history:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.finished:
+                break
+            del self._jobs[oldest_id]
+
+    def _finish(self, job: RenderJob, state: str, result_path: Optional[str] = None, error: Optional[str] = None):
+        job.state = state
+        job.result_path = result_path
+        job.error = error
+        job.finished_at = time.time()
+        if not job.future.done():
+            job.future.set_result(job)
+
+    def _start_workers(self):
+        if self._workers:
+            return
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"render-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_job(self) -> RenderJob:
+        with self._condition:
+            while True:
+                while self._heap:
+                    priority, _, job = heapq.heappop(self._heap)
+                    # 취소됐거나 우선순위가 바뀌어 다시 넣은 작업의 이전 항목은 건너뜀
+                    if job.state == 'queued' and priority == job.priority:
+                        job.state = 'running'
+                        job.started_at = time.time()
+                        return job
+                self._condition.wait()
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            output_path = self.cache.path(job.key)
+            tmp_path = output_path.with_name(f"{job.key}.{job.id}.tmp.png")
+            try:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                process_pool.submit(
+                    render_figure, job.kind, job.params,
+                    self.raw_data_path, self.match_info_path, str(tmp_path)
+                ).result()
+                state, result_path, error = 'done', str(self.cache.put(job.key, tmp_path)), None
+            except BrokenProcessPool:
+                # 풀은 다음 제출 때 새 풀로 교체됨
+                tmp_path.unlink(missing_ok=True)
+                state, result_path, error = 'failed', None, "렌더링 프로세스가 비정상 종료되었습니다."
+            except Exception as e:
+                tmp_path.unlink(missing_ok=True)
+                state, result_path, error = 'failed', None, str(e) or type(e).__name__
+
+            with self._condition:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+                if job.state == 'running':
+                    self._finish(job, state, result_path, error)
@@ -1,20 +1,34 @@
 """
 FastAPI 메인 애플리케이션
 """
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
+import asyncio
+import json
+import os
 from typing import List, Optional
 from pathlib import Path
 from src.data.models import MatchData
-from src.data.loader import load_match_by_id, list_available_matches
-from src.analysis.turning_point import detect_turning_points
+from src.data.loader import load_match_by_id, list_available_matches, load_match_info
+from src.analysis.turning_point import DETECTION_METHODS, detect_turning_points
+from src.analysis.win_probability import compute_win_probability
+from src.analysis.bootstrap import MAX_REPLICATES
+from src.analysis.territory import territory_to_dict
+from src.analysis.similarity import SIMILARITY_METRICS, open_similarity_index
+from src.analysis.season import open_season_aggregates
+from src.analysis.batch import BatchAnalysisRequest, select_game_ids, match_analysis_result, iter_batch_analysis
 from src.explanation.generator import ExplanationGenerator
 from src.visualization.plotter import (
     plot_momentum_curve, 
     create_turning_point_details,
     plot_player_heatmap,
-    plot_player_movements
+    plot_player_movements,
+    PYPLOT_LOCK
 )
+from src.visualization.plot_data import turning_point_details_data
+from src.visualization.dashboard import round_game_ids, compute_round_timelines_async, plot_round_dashboard
+from src.api.jobs import RenderJobRequest, FigureCache, RenderJobQueue, JobQueueFull
+from src.api.admission import AdmissionLimiter, render_metrics
 from src.analysis.player_analysis import (
     extract_player_activities,
     get_key_players,
@@ -23,8 +37,34 @@ from src.analysis.player_analysis import (
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-RAW_DATA_PATH = PROJECT_ROOT / "raw_data.csv"
-MATCH_INFO_PATH = PROJECT_ROOT / "match_info.csv"
+# 이벤트 데이터: raw_data.csv, 파티션 디렉터리, 또는 메모리 매핑 이벤트 저장소 디렉터리
+# (여러 워커 실행 시 src.data.event_store 저장소를 지정하면 워커들이 같은 파일을 공유)
+RAW_DATA_PATH = Path(os.environ.get("TURNING_POINT_RAW_DATA", PROJECT_ROOT / "raw_data.csv"))
+MATCH_INFO_PATH = Path(os.environ.get("TURNING_POINT_MATCH_INFO", PROJECT_ROOT / "match_info.csv"))
+# 유사 경기 검색 인덱스 (CLI나 증분 수집으로 미리 생성, 없으면 503)
+SIMILARITY_INDEX_PATH = Path(os.environ.get("TURNING_POINT_SIMILARITY_INDEX", PROJECT_ROOT / "similarity_index.npz"))
+# 시즌 팀/선수 집계 디렉터리 (CLI나 증분 수집으로 미리 생성, 없으면 503)
+SEASON_DIR = Path(os.environ.get("TURNING_POINT_SEASON_DIR", PROJECT_ROOT / "season"))
+# 백그라운드 렌더링 결과 그림 캐시 디렉터리와 동시 렌더링 수
+FIGURE_CACHE_DIR = Path(os.environ.get("TURNING_POINT_FIGURE_CACHE", PROJECT_ROOT / "figure_cache"))
+RENDER_WORKERS = int(os.environ.get("TURNING_POINT_RENDER_WORKERS", 2))
+FIGURE_CACHE_MAX_MB = int(os.environ.get("TURNING_POINT_FIGURE_CACHE_MAX_MB", 1024))
+FIGURE_CACHE_MAX_AGE = float(os.environ.get("TURNING_POINT_FIGURE_CACHE_MAX_AGE", 7 * 24 * 3600))
+# 경로 그룹별 동시 실행 수 (그림 렌더링 / 분석), 초과 요청은 대기열 상한까지 기다림
+RENDER_CONCURRENCY = int(os.environ.get("TURNING_POINT_RENDER_CONCURRENCY", 2))
+ANALYSIS_CONCURRENCY = int(os.environ.get("TURNING_POINT_ANALYSIS_CONCURRENCY", 4))
+BATCH_CONCURRENCY = int(os.environ.get("TURNING_POINT_BATCH_CONCURRENCY", 1))
+
+# 요청별 변곡점 탐지 방법 선택 (?method=cusum 등)
+DETECTION_METHOD_PATTERN = f"^({'|'.join(DETECTION_METHODS)})$"
+
+render_jobs = RenderJobQueue(
+    FigureCache(FIGURE_CACHE_DIR, FIGURE_CACHE_MAX_MB * 1024 * 1024, FIGURE_CACHE_MAX_AGE),
+    RAW_DATA_PATH, MATCH_INFO_PATH, RENDER_WORKERS
+)
+render_admission = AdmissionLimiter("render", RENDER_CONCURRENCY, max_waiting=2 * RENDER_CONCURRENCY)
+analysis_admission = AdmissionLimiter("analysis", ANALYSIS_CONCURRENCY, max_waiting=4 * ANALYSIS_CONCURRENCY)
+batch_admission = AdmissionLimiter("batch", BATCH_CONCURRENCY, max_waiting=2 * BATCH_CONCURRENCY)
 
 app = FastAPI(
     title="K리그 경기 변곡점 분석 API",
@@ -55,8 +95,100 @@ async def get_matches():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/analyze/{game_id}")
-async def analyze_match_by_id(game_id: int):
+@app.get("/matches/{game_id}/similar", dependencies=[Depends(analysis_admission)])
+def get_similar_matches(
+    game_id: int,
+    k: int = Query(5, ge=1, le=50, description="반환할 유사 경기 수"),
+    metric: str = Query("euclidean", pattern=f"^({'|'.join(SIMILARITY_METRICS)})$", description="거리 방식 (euclidean, lb_keogh)"),
+    allow_mirror: bool = Query(False, description="홈/원정을 뒤집은 흐름도 유사 경기로 인정")
+):
+    """
+    모멘텀 곡선이 비슷하게 흘러간 경기 검색
+    """
+    try:
+        index = open_similarity_index(SIMILARITY_INDEX_PATH)
+        return {
+            "game_id": game_id,
+            "metric": metric,
+            "similar_matches": index.query(game_id, k, metric, allow_mirror)
+        }
+    
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=503,
+            detail="유사 경기 인덱스가 아직 준비되지 않았습니다. `python -m src.analysis.similarity`나 증분 수집으로 먼저 생성하세요.",
+            headers={'Retry-After': '60'}
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"경기 ID {game_id}가 유사 경기 인덱스에 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def season_aggregates_not_ready() -> HTTPException:
+    """시즌 집계 파일이 아직 없을 때의 응답 (503, 집계는 요청 중에 만들지 않음)"""
+    return HTTPException(
+        status_code=503,
+        detail="시즌 집계가 아직 준비되지 않았습니다. `python -m src.analysis.season`이나 증분 수집으로 먼저 생성하세요.",
+        headers={'Retry-After': '60'}
+    )
+
+
+@app.get("/season/teams", dependencies=[Depends(analysis_admission)])
+def get_season_teams(
+    minute_from: int = Query(0, ge=0, le=90, description="집계 시작 분 (구간 시작 기준, 포함)"),
+    minute_to: int = Query(90, ge=0, le=90, description="집계 끝 분 (구간 시작 기준, 미포함)")
+):
+    """
+    팀별 시즌 집계 (예: minute_from=75 → 마지막 15분 평균 모멘텀)
+    """
+    try:
+        aggregates = open_season_aggregates(SEASON_DIR)
+        teams = aggregates.team_summary(minute_from, minute_to)
+        return {
+            "minute_from": minute_from,
+            "minute_to": minute_to,
+            "games": len(aggregates),
+            "teams": teams.to_dict('records')
+        }
+    
+    except FileNotFoundError:
+        raise season_aggregates_not_ready()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/season/players", dependencies=[Depends(analysis_admission)])
+def get_season_players(
+    team: Optional[str] = Query(None, description="팀 이름 (없으면 전체 선수)"),
+    top: int = Query(20, ge=1, le=500, description="반환할 선수 수")
+):
+    """
+    선수별 시즌 변곡점 기여도 순위
+    """
+    try:
+        aggregates = open_season_aggregates(SEASON_DIR)
+        players = aggregates.player_summary(team, top)
+        return {
+            "team": team,
+            "games": len(aggregates),
+            "players": players.to_dict('records')
+        }
+    
+    except FileNotFoundError:
+        raise season_aggregates_not_ready()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/analyze/{game_id}", dependencies=[Depends(analysis_admission)])
+def analyze_match_by_id(
+    game_id: int,
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)"),
+    win_probability: bool = Query(False, description="분 단위 승리 확률 곡선 포함 여부"),
+    bootstrap: int = Query(0, ge=0, le=MAX_REPLICATES, description="변곡점 신뢰도 계산용 부트스트랩 복제본 수 (0이면 생략)"),
+    shape_indicators: bool = Query(False, description="팀 대형 변화도 변곡점 지표로 사용 (rules 방법만)")
+):
     """
     경기 ID로 경기 데이터를 분석하여 변곡점 탐지 및 설명 생성
     """
@@ -68,45 +200,67 @@ async def analyze_match_by_id(game_id: int):
             game_id
         )
         
-        # 변곡점 탐지
-        turning_points = detect_turning_points(match_data)
-        
-        # 설명 생성
-        explanation_gen = ExplanationGenerator()
-        
-        # 각 변곡점에 대한 설명 개선
-        for tp in turning_points:
-            team_name = (
-                match_data.home_team if tp.team_advantage == 'home'
-                else match_data.away_team
-            )
-            tp.explanation = explanation_gen.generate_explanation(tp, team_name)
-        
-        # 전체 요약
-        summary = explanation_gen.generate_summary(
-            turning_points,
-            match_data.home_team,
-            match_data.away_team
+        return match_analysis_result(match_data, method, win_probability, bootstrap, shape_indicators)
+    
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"경기 ID {game_id}를 찾을 수 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/analyze/batch", dependencies=[Depends(batch_admission)])
+async def analyze_matches_batch(request: BatchAnalysisRequest):
+    """
+    여러 경기 일괄 분석 (NDJSON 스트리밍)
+
+    game_ids 또는 match_info 조건(date_from/date_to, team, game_day)으로 고른 경기를 병렬로 분석하고,
+    끝나는 순서대로 한 줄에 경기 하나씩(GET /analyze/{game_id} 형식, 실패 시 {"game_id", "error"}) 보냅니다.
+    """
+    try:
+        match_info = await asyncio.to_thread(load_match_info, str(MATCH_INFO_PATH))
+        game_ids = select_game_ids(match_info, request)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="경기 정보 파일을 찾을 수 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def ndjson_lines():
+        async for result in iter_batch_analysis(RAW_DATA_PATH, match_info, game_ids, request.analysis_options()):
+            yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+    
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Games": str(len(game_ids))}
+    )
+
+
+@app.get("/visualize/{game_id}/data", dependencies=[Depends(analysis_admission)])
+def visualize_match_data(
+    game_id: int,
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)"),
+    win_probability: bool = Query(False, description="승리 확률 곡선 데이터 포함 여부")
+):
+    """
+    경기 흐름 그래프 데이터 (이미지 대신 프런트엔드가 직접 그릴 JSON)
+    """
+    try:
+        match_data = load_match_by_id(
+            str(RAW_DATA_PATH),
+            str(MATCH_INFO_PATH),
+            game_id
         )
-        
-        # 변곡점 상세 정보
-        turning_point_details = [
-            create_turning_point_details(
-                tp,
-                match_data.home_team if tp.team_advantage == 'home' else match_data.away_team
-            )
-            for tp in turning_points
-        ]
+        turning_points = detect_turning_points(match_data, method)
         
         return {
-            "match_id": match_data.match_id,
-            "home_team": match_data.home_team,
-            "away_team": match_data.away_team,
-            "match_date": match_data.match_date.isoformat(),
-            "final_score": match_data.final_score,
-            "summary": summary,
-            "turning_points_count": len(turning_points),
-            "turning_points": turning_point_details
+            "game_id": game_id,
+            "momentum": plot_momentum_curve(
+                match_data,
+                turning_points,
+                win_probability=compute_win_probability(match_data) if win_probability else None,
+                data_only=True
+            ),
+            "turning_points": turning_point_details_data(match_data, turning_points)
         }
     
     except FileNotFoundError:
@@ -115,8 +269,8 @@ async def analyze_match_by_id(game_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/analyze")
-async def analyze_match(match_data: MatchData):
+@app.post("/analyze", dependencies=[Depends(analysis_admission)])
+def analyze_match(match_data: MatchData):
     """
     경기 데이터를 분석하여 변곡점 탐지 및 설명 생성
     """
@@ -164,10 +318,12 @@ async def analyze_match(match_data: MatchData):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/visualize/{game_id}")
-async def visualize_match_by_id(
+@app.get("/visualize/{game_id}", dependencies=[Depends(render_admission)])
+def visualize_match_by_id(
     game_id: int,
-    save_path: Optional[str] = Query(None, description="저장 경로 (기본값: momentum_curve_{game_id}.png)")
+    save_path: Optional[str] = Query(None, description="저장 경로 (기본값: momentum_curve_{game_id}.png)"),
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)"),
+    win_probability: bool = Query(False, description="승리 확률 곡선을 함께 그릴지 여부")
 ):
     """
     경기 ID로 경기 흐름 그래프 생성
@@ -180,12 +336,14 @@ async def visualize_match_by_id(
             game_id
         )
         
-        turning_points = detect_turning_points(match_data)
+        turning_points = detect_turning_points(match_data, method)
         
         if save_path is None:
             save_path = f"momentum_curve_{game_id}.png"
         
-        plot_momentum_curve(match_data, turning_points, save_path)
+        probability = compute_win_probability(match_data) if win_probability else None
+        with PYPLOT_LOCK:
+            plot_momentum_curve(match_data, turning_points, save_path, win_probability=probability)
         
         return {
             "message": "그래프가 생성되었습니다.",
@@ -199,8 +357,56 @@ async def visualize_match_by_id(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/analyze")
-async def analyze_match(match_data: MatchData):
+@app.get("/rounds/{game_day}/dashboard", dependencies=[Depends(render_admission)])
+async def visualize_round_dashboard(
+    game_day: int,
+    save_path: Optional[str] = Query(None, description="저장 경로 (기본값: round_{game_day}_dashboard.png)"),
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)")
+):
+    """
+    라운드(game_day) 전체 경기의 모멘텀 곡선을 한 그림에 작은 그래프로 생성
+
+    경기별 타임라인은 공용 프로세스 풀에서 일괄 계산하고, 계산과 렌더링 동안 이벤트 루프를 막지 않습니다.
+    그림은 pyplot 없이(Figure + FigureCanvasAgg) 스레드에서 그리므로 다른 렌더링과 동시에 실행해도 안전합니다.
+    """
+    try:
+        match_info = await asyncio.to_thread(load_match_info, str(MATCH_INFO_PATH))
+        game_ids = round_game_ids(match_info, game_day)
+        timelines = await compute_round_timelines_async(RAW_DATA_PATH, MATCH_INFO_PATH, game_ids, method)
+        if not timelines:
+            raise HTTPException(status_code=404, detail=f"{game_day}라운드 경기를 찾을 수 없습니다.")
+        
+        if save_path is None:
+            save_path = f"round_{game_day}_dashboard.png"
+        
+        await asyncio.to_thread(plot_round_dashboard, timelines, save_path, f"{game_day}라운드 경기 흐름")
+        
+        return {
+            "message": "라운드 대시보드가 생성되었습니다.",
+            "save_path": save_path,
+            "game_day": game_day,
+            "games": [
+                {
+                    "game_id": timeline['game_id'],
+                    "home_team": timeline['home_team'],
+                    "away_team": timeline['away_team'],
+                    "final_score": timeline['final_score'],
+                    "turning_points_count": len(timeline['turning_point_minutes'])
+                }
+                for timeline in timelines
+            ]
+        }
+    
+    except HTTPException:
+        raise
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{game_day}라운드 경기 데이터를 찾을 수 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/analyze", dependencies=[Depends(analysis_admission)])
+def analyze_match(match_data: MatchData):
     """
     직접 제공된 경기 데이터를 분석하여 변곡점 탐지 및 설명 생성
     (기존 API 호환성 유지)
@@ -249,15 +455,16 @@ async def analyze_match(match_data: MatchData):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/visualize")
-async def visualize_match(match_data: MatchData, save_path: str = "momentum_curve.png"):
+@app.post("/visualize", dependencies=[Depends(render_admission)])
+def visualize_match(match_data: MatchData, save_path: str = "momentum_curve.png"):
     """
     직접 제공된 경기 데이터로 경기 흐름 그래프 생성
     (기존 API 호환성 유지)
     """
     try:
         turning_points = detect_turning_points(match_data)
-        plot_momentum_curve(match_data, turning_points, save_path)
+        with PYPLOT_LOCK:
+            plot_momentum_curve(match_data, turning_points, save_path)
         
         return {
             "message": "그래프가 생성되었습니다.",
@@ -269,11 +476,12 @@ async def visualize_match(match_data: MatchData, save_path: str = "momentum_curv
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/analyze/{game_id}/players/{turning_point_minute}")
-async def analyze_turning_point_players(
+@app.get("/analyze/{game_id}/players/{turning_point_minute}", dependencies=[Depends(analysis_admission)])
+def analyze_turning_point_players(
     game_id: int,
     turning_point_minute: int,
-    top_n: int = Query(5, description="상위 선수 수")
+    top_n: int = Query(5, description="상위 선수 수"),
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)")
 ):
     """
     특정 변곡점 시점의 선수 분석
@@ -292,7 +500,7 @@ async def analyze_turning_point_players(
         )
         
         # 변곡점 탐지
-        turning_points = detect_turning_points(match_data)
+        turning_points = detect_turning_points(match_data, method)
         
         # 해당 시점의 변곡점 찾기
         target_tp = None
@@ -337,11 +545,43 @@ async def analyze_turning_point_players(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/visualize/{game_id}/heatmap/{turning_point_minute}")
-async def visualize_turning_point_heatmap(
+@app.get("/analyze/{game_id}/territory", dependencies=[Depends(analysis_admission)])
+def analyze_territory(
+    game_id: int,
+    minute: Optional[int] = Query(None, ge=0, description="해당 분이 속한 5분 구간만 반환 (생략 시 전체 구간)")
+):
+    """
+    5분 구간별 영역 지배 격자 (50 x 34, 홈 팀 공격 방향 기준)
+    
+    각 칸의 dominance는 -1(원정 우세) ~ 1(홈 우세)입니다.
+    """
+    try:
+        match_data = load_match_by_id(
+            str(RAW_DATA_PATH),
+            str(MATCH_INFO_PATH),
+            game_id
+        )
+        
+        return {
+            "match_id": match_data.match_id,
+            "home_team": match_data.home_team,
+            "away_team": match_data.away_team,
+            **territory_to_dict(match_data, minute)
+        }
+    
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"경기 ID {game_id}를 찾을 수 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/visualize/{game_id}/heatmap/{turning_point_minute}", dependencies=[Depends(render_admission)])
+def visualize_turning_point_heatmap(
     game_id: int,
     turning_point_minute: int,
-    save_path: Optional[str] = Query(None, description="저장 경로")
+    save_path: Optional[str] = Query(None, description="저장 경로"),
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)"),
+    territory: bool = Query(False, description="영역 지배 격자 레이어 표시 여부")
 ):
     """
     변곡점 시점의 선수 위치 히트맵 생성
@@ -360,7 +600,7 @@ async def visualize_turning_point_heatmap(
         )
         
         # 변곡점 탐지
-        turning_points = detect_turning_points(match_data)
+        turning_points = detect_turning_points(match_data, method)
         
         # 해당 시점의 변곡점 찾기
         target_tp = None
@@ -389,7 +629,10 @@ async def visualize_turning_point_heatmap(
             save_path = f"heatmap_{game_id}_{turning_point_minute}.png"
         
         # 히트맵 생성
-        plot_player_heatmap(match_data, target_tp, player_activities, save_path)
+        with PYPLOT_LOCK:
+            plot_player_heatmap(
+                match_data, target_tp, player_activities, save_path, show_territory=territory
+            )
         
         return {
             "message": "히트맵이 생성되었습니다.",
@@ -406,12 +649,13 @@ async def visualize_turning_point_heatmap(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/visualize/{game_id}/movements/{turning_point_minute}")
-async def visualize_player_movements(
+@app.get("/visualize/{game_id}/movements/{turning_point_minute}", dependencies=[Depends(render_admission)])
+def visualize_player_movements(
     game_id: int,
     turning_point_minute: int,
     top_n: int = Query(5, description="표시할 상위 선수 수"),
-    save_path: Optional[str] = Query(None, description="저장 경로")
+    save_path: Optional[str] = Query(None, description="저장 경로"),
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)")
 ):
     """
     변곡점 시점의 주요 선수 움직임 시각화
@@ -431,7 +675,7 @@ async def visualize_player_movements(
         )
         
         # 변곡점 탐지
-        turning_points = detect_turning_points(match_data)
+        turning_points = detect_turning_points(match_data, method)
         
         # 해당 시점의 변곡점 찾기
         target_tp = None
@@ -460,7 +704,8 @@ async def visualize_player_movements(
             save_path = f"movements_{game_id}_{turning_point_minute}.png"
         
         # 움직임 시각화
-        plot_player_movements(match_data, target_tp, player_activities, top_n, save_path)
+        with PYPLOT_LOCK:
+            plot_player_movements(match_data, target_tp, player_activities, top_n, save_path)
         
         return {
             "message": "선수 움직임 그래프가 생성되었습니다.",
@@ -477,6 +722,166 @@ async def visualize_player_movements(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def find_turning_point_activities(match_data: MatchData, method: str, turning_point_minute: int):
+    """
+    시점(±5분)의 변곡점과 선수 활동 조회
+
+    Raises:
+        HTTPException: 변곡점 또는 선수 데이터가 없는 경우 (404)
+    """
+    turning_points = detect_turning_points(match_data, method)
+    target_tp = next(
+        (tp for tp in turning_points if abs(tp.minute - turning_point_minute) <= 5), None
+    )
+    if not target_tp:
+        raise HTTPException(
+            status_code=404,
+            detail=f"{turning_point_minute}분 시점의 변곡점을 찾을 수 없습니다."
+        )
+    
+    player_activities = extract_player_activities(match_data, target_tp)
+    if not player_activities:
+        raise HTTPException(
+            status_code=404,
+            detail="해당 시점의 선수 데이터를 찾을 수 없습니다."
+        )
+    return target_tp, player_activities
+
+
+@app.get("/visualize/{game_id}/heatmap/{turning_point_minute}/data", dependencies=[Depends(analysis_admission)])
+def visualize_turning_point_heatmap_data(
+    game_id: int,
+    turning_point_minute: int,
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)"),
+    territory: bool = Query(False, description="영역 지배 격자 포함 여부")
+):
+    """
+    변곡점 히트맵 데이터 (위치 격자, 패스 화살표, 슈팅, 주요 선수 통계)
+    """
+    try:
+        match_data = load_match_by_id(
+            str(RAW_DATA_PATH),
+            str(MATCH_INFO_PATH),
+            game_id
+        )
+        target_tp, player_activities = find_turning_point_activities(
+            match_data, method, turning_point_minute
+        )
+        return plot_player_heatmap(
+            match_data, target_tp, player_activities, show_territory=territory, data_only=True
+        )
+    
+    except HTTPException:
+        raise
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"경기 ID {game_id}를 찾을 수 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/visualize/{game_id}/movements/{turning_point_minute}/data", dependencies=[Depends(analysis_admission)])
+def visualize_player_movements_data(
+    game_id: int,
+    turning_point_minute: int,
+    top_n: int = Query(5, ge=1, le=30, description="포함할 상위 선수 수"),
+    method: str = Query("rules", pattern=DETECTION_METHOD_PATTERN, description="변곡점 탐지 방법 (rules, cusum, pelt)")
+):
+    """
+    주요 선수 움직임 데이터 (선수별 위치 격자와 마커 배열)
+    """
+    try:
+        match_data = load_match_by_id(
+            str(RAW_DATA_PATH),
+            str(MATCH_INFO_PATH),
+            game_id
+        )
+        target_tp, player_activities = find_turning_point_activities(
+            match_data, method, turning_point_minute
+        )
+        return plot_player_movements(
+            match_data, target_tp, player_activities, top_n, data_only=True
+        )
+    
+    except HTTPException:
+        raise
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"경기 ID {game_id}를 찾을 수 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/jobs", status_code=202)
+async def submit_render_job(request: RenderJobRequest):
+    """
+    그래프 렌더링 작업 제출 (작업 ID를 바로 반환하고 렌더링은 백그라운드에서 수행)
+
+    같은 그래프가 대기/실행 중이면 그 작업을, 이미 그려 둔 그래프면 완료된 작업을 반환합니다.
+    """
+    try:
+        return render_jobs.submit(request).to_dict()
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def find_render_job(job_id: str):
+    """
+    Raises:
+        HTTPException: 작업이 없는 경우 (404)
+    """
+    job = render_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업 {job_id}를 찾을 수 없습니다.")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+async def get_render_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="완료될 때까지 기다릴 최대 시간(초, long-poll)")
+):
+    """
+    렌더링 작업 상태 조회 (queued, running, done, failed, cancelled)
+    """
+    job = find_render_job(job_id)
+    await render_jobs.wait(job, wait)
+    return job.to_dict()
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_render_job(job_id: str):
+    """
+    렌더링 작업 취소 (실행 중이면 결과만 버리며, 이미 끝난 작업은 그대로 반환)
+    """
+    find_render_job(job_id)
+    return render_jobs.cancel(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/figure")
+async def get_render_job_figure(job_id: str):
+    """
+    완료된 렌더링 작업의 PNG 파일
+    """
+    job = find_render_job(job_id)
+    if job.state != 'done':
+        raise HTTPException(status_code=409, detail=f"작업이 완료되지 않았습니다 (상태: {job.state}).")
+    if not Path(job.result_path).exists():
+        raise HTTPException(status_code=410, detail="그림이 캐시에서 삭제되었습니다. 작업을 다시 제출하세요.")
+    return FileResponse(job.result_path, media_type="image/png")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    승인 제어 지표 (Prometheus 텍스트 형식: 승인/거절 수, 대기 시간 분포, 실행/대기 중 요청 수)
+    """
+    return render_metrics([render_admission, analysis_admission, batch_admission])
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,356 @@
+"""
+메모리 매핑(memory-mapped) 이벤트 저장소
+
+여러 uvicorn 워커가 같은 데이터를 각자 파싱해 메모리에 올리지 않도록,
+원본 이벤트를 고정 길이 바이너리 레코드 파일(events.bin)로 한 번 변환해 두고
+모든 워커가 읽기 전용 np.memmap으로 공유합니다. (OS 페이지 캐시를 공유하므로
+워커 수를 늘려도 상주 메모리가 워커 수만큼 늘어나지 않습니다.)
+
+- events.bin (압축 후 events.{세대}.bin): 레코드 배열 (경기별로 연속 저장)
+- index.json: 현재 레코드 파일 이름, 경기별 (오프셋, 개수) 목록과 문자열 컬럼 사전(vocab)
+
+경기를 교체하면(append(replace_games=True)) 이전 레코드가 파일에 남으므로,
+commit()은 참조되지 않는 레코드 비율이 임계값을 넘으면 살아 있는 세그먼트만
+새 세대 파일로 다시 쓰고 index.json을 교체합니다 (읽는 워커는 기존 파일 매핑을 계속 사용 가능).
+전체 재생성(build_event_store)도 기존 파일을 비우지 않고 새 세대 파일에 쓴 뒤 index.json을 교체합니다.
+
+사용법:
+    python -m src.data.event_store raw_data.csv data/event_store
+    TURNING_POINT_RAW_DATA=data/event_store uvicorn src.api.main:app --workers 4
+"""
+import argparse
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+from src.data.ingest import DEFAULT_CHUNKSIZE, iter_raw_data_chunks
+
+EVENTS_FILE = 'events.bin'
+INDEX_FILE = 'index.json'
+# 참조되지 않는 레코드가 전체의 이 비율을 넘으면 commit() 때 압축
+COMPACTION_THRESHOLD = 0.25
+
+# 사전 인코딩하는 문자열 컬럼
+STRING_COLUMNS = ['team_name_ko', 'player_name_ko', 'type_name', 'result_name']
+
+EVENT_RECORD_DTYPE = np.dtype([
+    ('game_id', '<i4'),
+    ('action_id', '<i4'),
+    ('period_id', '<i1'),
+    ('time_seconds', '<f4'),
+    ('team_id', '<i4'),
+    ('team_name_ko', '<i4'),
+    ('player_name_ko', '<i4'),
+    ('type_name', '<i4'),
+    ('result_name', '<i4'),
+    ('start_x', '<f4'),
+    ('start_y', '<f4'),
+    ('end_x', '<f4'),
+    ('end_y', '<f4'),
+])
+
+
+def is_event_store(path: Union[str, Path]) -> bool:
+    """경로가 이벤트 저장소 디렉터리인지 확인"""
+    return (Path(path) / INDEX_FILE).exists()
+
+
+class EventStore:
+    """
+    읽기 전용 메모리 매핑 이벤트 저장소
+
+    index.json이 갱신되면(수집 작업 등) 다음 조회 시 자동으로 다시 매핑합니다.
+    """
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        self._lock = threading.Lock()
+        self._index_mtime: Optional[float] = None
+        # (레코드 memmap, 경기별 세그먼트, 문자열 컬럼 카테고리) - 항상 한 번에 교체
+        self._state: tuple = (np.empty(0, dtype=EVENT_RECORD_DTYPE), {}, {})
+        self.refresh()
+
+    def refresh(self) -> tuple:
+        """
+        index.json이 바뀌었으면 인덱스와 메모리 매핑을 다시 로드
+
+        새 상태를 모두 만든 뒤 잠금 안에서 한 번에 교체하므로, 다른 스레드는
+        이전 상태나 새 상태 중 하나만 봅니다 (레코드와 세그먼트가 섞이지 않음).
+
+        Returns:
+            현재 (레코드, 경기별 세그먼트, 카테고리) 상태
+        """
+        index_path = self.store_dir / INDEX_FILE
+        mtime = index_path.stat().st_mtime
+        if mtime == self._index_mtime:
+            return self._state
+
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+        games = {int(game_id): segments for game_id, segments in index['games'].items()}
+        categories = {column: pd.Index(values) for column, values in index['vocab'].items()}
+
+        n_records = index['n_records']
+        records = (
+            np.memmap(self.store_dir / index.get('events_file', EVENTS_FILE), dtype=EVENT_RECORD_DTYPE,
+                      mode='r', shape=(n_records,))
+            if n_records else np.empty(0, dtype=EVENT_RECORD_DTYPE)
+        )
+        with self._lock:
+            self._state = (records, games, categories)
+            self._index_mtime = mtime
+            return self._state
+
+    @property
+    def game_ids(self) -> List[int]:
+        _, games, _ = self.refresh()
+        return sorted(games)
+
+    @staticmethod
+    def _game_records(state: tuple, game_id: int) -> np.ndarray:
+        records, games, _ = state
+        segments = games.get(int(game_id))
+        if not segments:
+            raise FileNotFoundError(f"이벤트 저장소에 경기 {game_id}가 없습니다.")
+        if len(segments) == 1:
+            offset, count = segments[0]
+            return records[offset:offset + count]
+        return np.concatenate([records[o:o + c] for o, c in segments])
+
+    def game_records(self, game_id: int) -> np.ndarray:
+        """
+        경기 레코드 조회 (세그먼트가 하나면 복사 없이 memmap 뷰 반환)
+
+        Raises:
+            FileNotFoundError: 저장소에 없는 경기인 경우
+        """
+        return self._game_records(self.refresh(), game_id)
+
+    def game_frame(self, game_id: int) -> pd.DataFrame:
+        """경기 레코드를 로더가 사용하는 raw_data 형식 DataFrame으로 변환"""
+        state = self.refresh()
+        records = self._game_records(state, game_id)
+        categories = state[2]
+        data = {}
+        for name in EVENT_RECORD_DTYPE.names:
+            values = records[name]
+            if name in STRING_COLUMNS:
+                # -1 코드는 결측값 (Categorical이 NaN으로 처리)
+                data[name] = pd.Categorical.from_codes(values, categories=categories[name])
+            else:
+                data[name] = values
+        return pd.DataFrame(data)
+
+
+class EventStoreWriter:
+    """이벤트 저장소 작성기 (전체 생성 및 경기 단위 추가)"""
+
+    def __init__(self, store_dir: Union[str, Path], overwrite: bool = False):
+        """
+        Args:
+            overwrite: True면 기존 경기를 버리고 새로 생성. 기존 저장소가 있으면 사용 중인 레코드 파일은
+                건드리지 않고 새 세대 파일에 쓰며, commit()의 index.json 교체로 전환합니다
+                (워커가 매핑 중인 파일을 비우면 SIGBUS나 잘못된 값을 읽을 수 있음).
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.store_dir / INDEX_FILE
+
+        index = None
+        if index_path.exists():
+            with open(index_path, encoding='utf-8') as f:
+                index = json.load(f)
+
+        if overwrite or index is None:
+            if index is None:
+                self.generation = 0
+                self.events_file = EVENTS_FILE
+            else:
+                self.generation = index.get('generation', 0) + 1
+                self.events_file = f"events.{self.generation}.bin"
+                self.previous_events_file = index.get('events_file', EVENTS_FILE)
+            (self.store_dir / self.events_file).write_bytes(b'')
+            self.games: Dict[int, List[List[int]]] = {}
+            self.vocab: Dict[str, List[str]] = {column: [] for column in STRING_COLUMNS}
+            self.n_records = 0
+        else:
+            self.events_file = index.get('events_file', EVENTS_FILE)
+            self.games = {int(game_id): segments for game_id, segments in index['games'].items()}
+            self.vocab = index['vocab']
+            self.n_records = index['n_records']
+            self.generation = index.get('generation', 0)
+
+        self._codes = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in self.vocab.items()
+        }
+
+    def _encode(self, values: pd.Series, column: str) -> np.ndarray:
+        """문자열 컬럼을 사전 코드로 인코딩 (새 값은 사전에 추가)"""
+        codes = self._codes[column]
+        vocab = self.vocab[column]
+        values = values.astype(object).where(values.notna(), None)
+        for value in pd.unique(values.dropna().astype(str)):
+            if value not in codes:
+                codes[value] = len(vocab)
+                vocab.append(value)
+        # 결측값은 -1 코드
+        return pd.Categorical(values, categories=vocab).codes.astype(np.int32)
+
+    def _to_records(self, frame: pd.DataFrame) -> np.ndarray:
+        records = np.empty(len(frame), dtype=EVENT_RECORD_DTYPE)
+        for name in EVENT_RECORD_DTYPE.names:
+            if name in STRING_COLUMNS:
+                records[name] = self._encode(frame[name], name)
+            elif name in frame.columns:
+                records[name] = frame[name].to_numpy()
+            else:
+                records[name] = -1 if records.dtype[name].kind == 'i' else np.nan
+        return records
+
+    def append(self, frame: pd.DataFrame, replace_games: bool = False):
+        """
+        이벤트 행을 파일 끝에 추가하고 경기별 세그먼트 갱신
+
+        Args:
+            frame: raw_data 형식 행 (여러 경기 가능)
+            replace_games: True면 frame에 포함된 경기의 기존 세그먼트를 버리고 새로 등록
+                (이전 레코드는 참조되지 않으며 commit()의 압축 때 정리됨)
+        """
+        if frame.empty:
+            return
+        if replace_games:
+            for game_id in frame['game_id'].unique():
+                self.games.pop(int(game_id), None)
+
+        with open(self.store_dir / self.events_file, 'ab') as f:
+            for game_id, rows in frame.groupby('game_id', sort=False):
+                records = self._to_records(rows)
+                f.write(records.tobytes())
+
+                segments = self.games.setdefault(int(game_id), [])
+                # 청크 경계로 나뉜 같은 경기가 바로 이어서 기록되면 하나의 세그먼트로 병합
+                if segments and segments[-1][0] + segments[-1][1] == self.n_records:
+                    segments[-1][1] += len(records)
+                else:
+                    segments.append([self.n_records, len(records)])
+                self.n_records += len(records)
+
+    def remove(self, game_ids: Iterable[int]):
+        """경기 세그먼트 삭제 (레코드는 commit()의 압축 때 정리됨)"""
+        for game_id in game_ids:
+            self.games.pop(int(game_id), None)
+
+    @property
+    def dead_records(self) -> int:
+        """파일에 남아 있지만 어떤 경기 세그먼트도 참조하지 않는 레코드 수"""
+        live = sum(count for segments in self.games.values() for _, count in segments)
+        return self.n_records - live
+
+    def compact(self):
+        """
+        살아 있는 세그먼트만 경기별로 이어 새 세대 파일(events.{세대}.bin)에 다시 쓰기
+
+        index.json은 commit()에서 교체하며, 그 전까지 읽는 워커는 기존 파일을 그대로 사용합니다.
+        """
+        old_path = self.store_dir / self.events_file
+        records = (
+            np.memmap(old_path, dtype=EVENT_RECORD_DTYPE, mode='r', shape=(self.n_records,))
+            if self.n_records else np.empty(0, dtype=EVENT_RECORD_DTYPE)
+        )
+        generation = self.generation + 1
+        events_file = f"events.{generation}.bin"
+
+        games: Dict[int, List[List[int]]] = {}
+        n_records = 0
+        with open(self.store_dir / events_file, 'wb') as f:
+            # 경기 하나씩 복사 (최대 메모리는 가장 큰 경기 크기)
+            for game_id, segments in self.games.items():
+                count = 0
+                for offset, length in segments:
+                    f.write(records[offset:offset + length].tobytes())
+                    count += length
+                games[game_id] = [[n_records, count]]
+                n_records += count
+            f.flush()
+            os.fsync(f.fileno())
+        del records
+
+        self.previous_events_file = self.events_file
+        self.events_file, self.generation = events_file, generation
+        self.games, self.n_records = games, n_records
+
+    def commit(self, compact_threshold: Optional[float] = COMPACTION_THRESHOLD):
+        """
+        index.json 원자적 교체 (읽는 워커는 다음 조회 시 새 인덱스를 사용)
+
+        Args:
+            compact_threshold: 참조되지 않는 레코드 비율이 이 값을 넘으면 먼저 압축 (None이면 압축 안 함)
+        """
+        if (compact_threshold is not None and self.n_records
+                and self.dead_records > compact_threshold * self.n_records):
+            self.compact()
+
+        index = {
+            'n_records': self.n_records,
+            'events_file': self.events_file,
+            'generation': self.generation,
+            'games': {str(game_id): segments for game_id, segments in self.games.items()},
+            'vocab': self.vocab,
+        }
+        tmp_path = self.store_dir / (INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.store_dir / INDEX_FILE)
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        """
+        현재 파일과 직전 세대 파일을 제외한 레코드 파일 삭제
+
+        직전 세대는 이전 index.json을 막 읽은 워커가 매핑할 수 있도록 한 번 더 남겨 둡니다
+        (이미 매핑한 워커는 파일이 지워져도 기존 매핑을 계속 사용).
+        """
+        keep = {self.events_file, getattr(self, 'previous_events_file', None)}
+        for path in [self.store_dir / EVENTS_FILE, *self.store_dir.glob('events.*.bin')]:
+            if path.name not in keep and path.exists():
+                path.unlink()
+
+
+def build_event_store(
+    raw_data_path: Union[str, Path],
+    store_dir: Union[str, Path],
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> EventStore:
+    """raw_data.csv를 청크 단위로 읽어 이벤트 저장소 생성"""
+    writer = EventStoreWriter(store_dir, overwrite=True)
+    for chunk in iter_raw_data_chunks(raw_data_path, chunksize):
+        writer.append(chunk)
+    writer.commit()
+    return EventStore(store_dir)
+
+
+@lru_cache(maxsize=None)
+def open_event_store(store_dir: str) -> EventStore:
+    """프로세스당 1회만 열어 재사용하는 이벤트 저장소"""
+    return EventStore(store_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모리 매핑 이벤트 저장소 생성")
+    parser.add_argument('raw_data_path', help="원본 이벤트 CSV 경로")
+    parser.add_argument('store_dir', help="저장소 디렉터리")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="한 번에 읽을 행 수")
+    args = parser.parse_args()
+
+    store = build_event_store(args.raw_data_path, args.store_dir, args.chunksize)
+    print(f"{len(store.game_ids)}개 경기 저장 완료: {args.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+주간 증분 수집 모듈
+
+raw_data.csv / match_info.csv에 새 라운드가 추가되면, 경기별 행 해시를 저장된 매니페스트와 비교해
+새로 생기거나 바뀐 game_id만 골라 변환/분석하고 각 저장소에 반영합니다.
+
+- 파티션 디렉터리: 해당 경기 파티션 파일과 점유 체인 배열(chains/)만 다시 쓰고
+  팀별 시즌 집계(season_aggregates.csv)에서 해당 경기만 교체
+- 이벤트 저장소: EventStoreWriter.append(replace_games=True)로 해당 경기 세그먼트만 교체
+- 결과 저장소: 경기별 분석 결과 JSON (변곡점, 모멘텀)
+- 시즌 집계 / 유사 경기 인덱스: 해당 경기만 upsert
+
+원본에서 사라진 경기는 파티션/체인/결과 파일, 이벤트 저장소 인덱스, 시즌 집계, 유사 경기 인덱스,
+매니페스트에서 모두 삭제합니다.
+match_info에 없는 경기는 이벤트만 저장하고 분석하지 않으며, 매니페스트에 기록해 한 번만 보고합니다.
+
+원본 CSV는 해시 계산과 변경분 추출을 위해 청크 단위로 두 번 읽지만,
+변환/분석/저장 비용은 변경된 경기 수에만 비례합니다.
+
+사용법:
+    python -m src.data.incremental raw_data.csv match_info.csv --state-dir data \\
+        --partition-dir data/partitions --store-dir data/store
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from src.data.models import MatchData, TurningPoint
+from src.data.ingest import (
+    DEFAULT_CHUNKSIZE, iter_raw_data_chunks, partition_path, summarize_chunk, merge_partition_aggregates
+)
+from src.data.loader import load_match_info, convert_kleague_to_match_data
+
+MANIFEST_FILE = 'ingest_manifest.json'
+RESULTS_DIR = 'results'
+SEASON_DIR = 'season'
+SIMILARITY_INDEX_FILE = 'similarity_index.npz'
+
+
+def _combine_row_hashes(game_ids: pd.Series, row_hashes: pd.Series) -> pd.DataFrame:
+    """
+    경기별 행 해시를 순서와 무관하게 합산 (청크 경계에 걸친 경기도 같은 값)
+
+    64비트 해시를 상/하위 32비트로 나눠 int64로 더하므로 경기당 20억 행까지 넘치지 않습니다.
+    """
+    values = row_hashes.to_numpy(dtype=np.uint64)
+    frame = pd.DataFrame({
+        'game_id': game_ids.to_numpy(dtype=np.int64),
+        'rows': 1,
+        'low': (values & np.uint64(0xFFFFFFFF)).astype(np.int64),
+        'high': (values >> np.uint64(32)).astype(np.int64),
+    })
+    return frame.groupby('game_id').sum()
+
+
+def compute_game_hashes(
+    raw_data_path: Union[str, Path],
+    match_info_path: Union[str, Path],
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> Dict[int, str]:
+    """
+    경기별 내용 해시 {game_id: 해시 문자열}
+
+    이벤트 행(변환에 쓰는 컬럼)과 match_info 행을 함께 해시하므로
+    이벤트 정정이나 경기 정보(스코어 등) 수정도 변경으로 감지합니다.
+    """
+    totals = None
+    for chunk in iter_raw_data_chunks(raw_data_path, chunksize):
+        partial = _combine_row_hashes(chunk['game_id'], pd.util.hash_pandas_object(chunk, index=False))
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+
+    match_info = load_match_info(str(match_info_path))
+    info_hashes = dict(zip(
+        match_info['game_id'].astype(int),
+        pd.util.hash_pandas_object(match_info, index=False).to_numpy(dtype=np.uint64),
+    ))
+
+    if totals is None:
+        return {}
+    totals = totals.astype(np.int64)
+    return {
+        int(game_id): f"{row.rows:x}-{row.low:x}-{row.high:x}-{int(info_hashes.get(int(game_id), 0)):x}"
+        for game_id, row in totals.iterrows()
+    }
+
+
+def load_manifest(state_dir: Union[str, Path]) -> Dict[int, str]:
+    path = Path(state_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return {int(game_id): value for game_id, value in json.load(f).items()}
+
+
+def save_manifest(state_dir: Union[str, Path], manifest: Dict[int, str]):
+    """매니페스트 원자적 교체 (모든 저장소 반영이 끝난 뒤에만 호출)"""
+    path = Path(state_dir) / MANIFEST_FILE
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({str(game_id): value for game_id, value in sorted(manifest.items())}, f, indent=1)
+    tmp_path.replace(path)
+
+
+def detect_changed_games(
+    manifest: Dict[int, str],
+    hashes: Dict[int, str]
+) -> Dict[str, List[int]]:
+    """매니페스트 대비 새 경기(new) / 바뀐 경기(changed) / 사라진 경기(removed)"""
+    return {
+        'new': sorted(game_id for game_id in hashes if game_id not in manifest),
+        'changed': sorted(
+            game_id for game_id, value in hashes.items()
+            if game_id in manifest and manifest[game_id] != value
+        ),
+        'removed': sorted(game_id for game_id in manifest if game_id not in hashes),
+    }
+
+
+def read_game_rows(
+    raw_data_path: Union[str, Path],
+    game_ids: List[int],
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> pd.DataFrame:
+    """지정한 경기 행만 청크 단위로 골라 읽기 (메모리는 변경분 크기에 비례)"""
+    selected = set(game_ids)
+    frames = [
+        chunk[chunk['game_id'].isin(selected)]
+        for chunk in iter_raw_data_chunks(raw_data_path, chunksize)
+    ]
+    frames = [frame for frame in frames if not frame.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def result_path(results_dir: Union[str, Path], game_id: int) -> Path:
+    """경기별 분석 결과 파일 경로"""
+    return Path(results_dir) / f"game_{int(game_id)}.json"
+
+
+def save_analysis_result(
+    results_dir: Union[str, Path],
+    match_data: MatchData,
+    turning_points: List[TurningPoint]
+):
+    """경기 분석 결과(변곡점, 5분 구간 모멘텀) 저장"""
+    from src.analysis.turning_point import compute_window_momentum
+
+    window_starts, momentum = compute_window_momentum(match_data)
+    result = {
+        'game_id': int(match_data.match_id),
+        'home_team': match_data.home_team,
+        'away_team': match_data.away_team,
+        'final_score': match_data.final_score,
+        'window_starts': window_starts.tolist(),
+        'momentum': np.round(momentum, 2).tolist(),
+        'turning_points': [tp.model_dump(mode='json') for tp in turning_points],
+    }
+    path = result_path(results_dir, match_data.match_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+
+
+def load_analysis_result(results_dir: Union[str, Path], game_id: int) -> dict:
+    """
+    Raises:
+        FileNotFoundError: 해당 경기 결과가 없는 경우
+    """
+    path = result_path(results_dir, game_id)
+    if not path.exists():
+        raise FileNotFoundError(f"경기 분석 결과를 찾을 수 없습니다: {path}")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def incremental_ingest(
+    raw_data_path: Union[str, Path],
+    match_info_path: Union[str, Path],
+    state_dir: Union[str, Path],
+    partition_dir: Optional[Union[str, Path]] = None,
+    store_dir: Optional[Union[str, Path]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> Dict[str, List[int]]:
+    """
+    새로 생기거나 바뀐 경기만 수집/분석해 저장소에 반영
+
+    Args:
+        state_dir: 매니페스트, 결과 저장소(results/), 시즌 집계(season/),
+            유사 경기 인덱스(similarity_index.npz)를 두는 디렉터리
+        partition_dir: 경기별 파티션 디렉터리 (지정 시 파티션과 점유 체인 배열 갱신)
+        store_dir: 메모리 매핑 이벤트 저장소 디렉터리 (지정 시 갱신)
+
+    Returns:
+        detect_changed_games 결과 (new / changed / removed)와 skipped
+        (이벤트는 저장했지만 match_info에 없어 분석하지 않은 경기, 처음 발견된 실행에서만 보고)
+    """
+    from src.analysis.turning_point import detect_turning_points_batch
+    from src.analysis.season import SeasonAggregates, TEAM_WINDOWS_FILE
+    from src.analysis.similarity import MomentumIndex
+    from src.analysis.possession import CHAINS_DIR, chain_path, save_possession_chains
+    from src.data.event_store import EventStoreWriter
+
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = load_manifest(state_dir)
+    hashes = compute_game_hashes(raw_data_path, match_info_path, chunksize)
+    changes = detect_changed_games(manifest, hashes)
+    game_ids = changes['new'] + changes['changed']
+    removed = changes['removed']
+    if not game_ids and not removed:
+        changes['skipped'] = []
+        return changes
+
+    rows = read_game_rows(raw_data_path, game_ids, chunksize) if game_ids else pd.DataFrame()
+
+    if partition_dir is not None:
+        Path(partition_dir).mkdir(parents=True, exist_ok=True)
+        if not rows.empty:
+            for game_id, game_rows in rows.groupby('game_id', sort=False):
+                game_rows.to_csv(partition_path(partition_dir, game_id), index=False)
+        for game_id in removed:
+            partition_path(partition_dir, game_id).unlink(missing_ok=True)
+            chain_path(Path(partition_dir) / CHAINS_DIR, game_id).unlink(missing_ok=True)
+        merge_partition_aggregates(
+            partition_dir, summarize_chunk(rows) if not rows.empty else None, remove_games=removed
+        )
+
+    if store_dir is not None:
+        writer = EventStoreWriter(store_dir)
+        writer.remove(removed)
+        writer.append(rows, replace_games=True)
+        writer.commit()
+
+    matches = []
+    skipped: List[int] = []
+    if not rows.empty:
+        match_info = load_match_info(str(match_info_path))
+        games = dict(tuple(rows.groupby('game_id')))
+        known_games = set(match_info['game_id'].astype(int))
+        matches = [
+            convert_kleague_to_match_data(games[game_id], match_info, game_id)
+            for game_id in game_ids
+            if game_id in games and game_id in known_games
+        ]
+        # match_info에 없는 경기는 이벤트만 저장하고 분석하지 않음
+        skipped = [game_id for game_id in game_ids if game_id in games and game_id not in known_games]
+    changes['skipped'] = skipped
+    turning_points = detect_turning_points_batch(matches) if matches else []
+
+    for md, tps in zip(matches, turning_points):
+        save_analysis_result(state_dir / RESULTS_DIR, md, tps)
+        if partition_dir is not None:
+            save_possession_chains(Path(partition_dir) / CHAINS_DIR, md)
+    # 사라진 경기와, 전에 분석했지만 이제 match_info에 없는 경기의 분석 결과는 삭제
+    unanalyzed = removed + skipped
+    for game_id in unanalyzed:
+        result_path(state_dir / RESULTS_DIR, game_id).unlink(missing_ok=True)
+    if partition_dir is not None:
+        for game_id in skipped:
+            chain_path(Path(partition_dir) / CHAINS_DIR, game_id).unlink(missing_ok=True)
+
+    season_dir = state_dir / SEASON_DIR
+    aggregates = (
+        SeasonAggregates.load(season_dir) if (season_dir / TEAM_WINDOWS_FILE).exists()
+        else SeasonAggregates()
+    )
+    aggregates.remove(unanalyzed)
+    aggregates.upsert(matches, turning_points)
+    aggregates.save(season_dir)
+
+    index_path = state_dir / SIMILARITY_INDEX_FILE
+    index = MomentumIndex.load(index_path) if index_path.exists() else MomentumIndex.from_matches([])
+    index.remove(unanalyzed)
+    index.upsert(matches)
+    index.save(index_path)
+
+    # 모든 저장소 반영이 끝난 경기만 매니페스트에 기록 (중간 실패 시 다음 실행에서 재시도)
+    # match_info에 없어 건너뛴 경기도 기록해 다음 실행에서 다시 새 경기로 잡지 않음
+    # (해시에 match_info 행이 포함되므로 나중에 경기 정보가 추가되면 변경 경기로 다시 처리)
+    manifest.update({int(md.match_id): hashes[int(md.match_id)] for md in matches})
+    manifest.update({game_id: hashes[game_id] for game_id in skipped})
+    for game_id in removed:
+        manifest.pop(game_id, None)
+    save_manifest(state_dir, manifest)
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="새로 생기거나 바뀐 경기만 증분 수집/분석")
+    parser.add_argument('raw_data_path', help="원본 이벤트 CSV 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('--state-dir', default='data', help="매니페스트/결과/시즌 집계/유사 경기 인덱스 디렉터리")
+    parser.add_argument('--partition-dir', help="경기별 파티션 디렉터리 (지정 시 갱신)")
+    parser.add_argument('--store-dir', help="이벤트 저장소 디렉터리 (지정 시 갱신)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="한 번에 읽을 행 수 (최대 메모리 사용량 결정)")
+    args = parser.parse_args()
+
+    changes = incremental_ingest(
+        args.raw_data_path, args.match_info_path, args.state_dir,
+        args.partition_dir, args.store_dir, args.chunksize
+    )
+    print(
+        f"새 경기 {len(changes['new'])}개, 변경 경기 {len(changes['changed'])}개, "
+        f"삭제 경기 {len(changes['removed'])}개 반영 완료"
+    )
+    if changes['removed']:
+        print(f"원본에서 사라져 모든 저장소에서 삭제한 경기: {changes['removed']}")
+    if changes['skipped']:
+        print(f"match_info에 없어 분석하지 않은 경기 (경기 정보가 추가되면 다시 처리): {changes['skipped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+대용량(다시즌) raw_data.csv 청크 단위 수집 모듈
+
+pd.read_csv로 전체 파일을 object/float64로 올리지 않고,
+필요한 컬럼만 작은 dtype(category, int32, float32)으로 청크 단위로 읽어
+경기별 파티션 파일로 나누어 저장하고 시즌 집계를 점진적으로 갱신합니다.
+최대 메모리 사용량은 파일 크기와 무관하게 chunksize에 비례합니다.
+match_info.csv를 함께 주면 경기별 점유 체인 배열도 파티션 옆(chains/)에 저장합니다.
+
+사용법:
+    python -m src.data.ingest raw_data.csv data/partitions --chunksize 200000 --match-info match_info.csv
+"""
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
+import pandas as pd
+
+# 변환(convert_kleague_to_match_data)에 필요한 컬럼과 메모리 절약형 dtype
+RAW_DATA_DTYPES: Dict[str, str] = {
+    'game_id': 'int32',
+    'action_id': 'int32',
+    'period_id': 'int8',
+    'time_seconds': 'float32',
+    'team_id': 'int32',
+    'team_name_ko': 'category',
+    'player_name_ko': 'category',
+    'type_name': 'category',
+    'result_name': 'category',
+    'start_x': 'float32',
+    'start_y': 'float32',
+    'end_x': 'float32',
+    'end_y': 'float32',
+}
+
+DEFAULT_CHUNKSIZE = 200_000
+
+# 시즌 집계 컬럼 (팀별 누적)
+SEASON_AGGREGATE_COLUMNS = ['events', 'shots', 'goals', 'passes', 'successful_passes']
+# 경기별 팀 집계 (부분 수집 시 해당 경기 행만 교체) / 이를 합산한 팀별 시즌 집계
+GAME_AGGREGATES_FILE = 'game_aggregates.csv'
+SEASON_AGGREGATES_FILE = 'season_aggregates.csv'
+
+
+def iter_raw_data_chunks(
+    raw_data_path: Union[str, Path],
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    raw_data.csv를 필요한 컬럼만 작은 dtype으로 청크 단위 스트리밍
+
+    파일에 없는 선택 컬럼(action_id 등)은 건너뜁니다.
+    """
+    return pd.read_csv(
+        raw_data_path,
+        usecols=lambda column: column in RAW_DATA_DTYPES,
+        dtype=RAW_DATA_DTYPES,
+        chunksize=chunksize,
+    )
+
+
+def partition_path(partition_dir: Union[str, Path], game_id: int) -> Path:
+    """경기별 파티션 파일 경로"""
+    return Path(partition_dir) / f"game_{int(game_id)}.csv"
+
+
+def read_game_partition(partition_dir: Union[str, Path], game_id: int) -> pd.DataFrame:
+    """
+    경기 파티션 로드 (경기 1개 분량만 읽음)
+
+    Raises:
+        FileNotFoundError: 해당 경기 파티션이 없는 경우
+    """
+    path = partition_path(partition_dir, game_id)
+    if not path.exists():
+        raise FileNotFoundError(f"경기 파티션을 찾을 수 없습니다: {path}")
+    return pd.read_csv(path, dtype=RAW_DATA_DTYPES)
+
+
+def summarize_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """청크 하나의 경기별/팀별 시즌 집계 값 계산 ((game_id, team_name_ko) 인덱스)"""
+    type_name = chunk['type_name'].astype(str)
+    result_name = chunk['result_name'].astype(str)
+    is_pass = type_name.isin(['Pass', 'Carry'])
+
+    frame = pd.DataFrame({
+        'game_id': chunk['game_id'].astype('int64'),
+        'team_name_ko': chunk['team_name_ko'].astype(str),
+        'events': 1,
+        'shots': (type_name == 'Shot').astype('int32'),
+        'goals': ((type_name == 'Shot') & (result_name == 'Goal')).astype('int32'),
+        'passes': is_pass.astype('int32'),
+        'successful_passes': (is_pass & (result_name == 'Successful')).astype('int32'),
+    })
+    return frame.groupby(['game_id', 'team_name_ko'], sort=False)[SEASON_AGGREGATE_COLUMNS].sum()
+
+
+def merge_partition_aggregates(
+    partition_dir: Union[str, Path],
+    game_totals: Optional[pd.DataFrame] = None,
+    replace_all: bool = False,
+    remove_games: Iterable[int] = ()
+) -> pd.DataFrame:
+    """
+    경기별 팀 집계를 기존 집계에 병합하고 팀별 시즌 집계 다시 계산
+
+    game_totals에 있는 경기와 remove_games의 경기는 기존 행을 지우고 (replace_all이면 기존 행 전체),
+    game_totals 행을 덧붙인 뒤 팀별로 합산합니다. 두 파일 모두 임시 파일에 쓴 뒤 교체합니다.
+
+    Returns:
+        팀별 시즌 집계 DataFrame (games = 팀의 경기 수)
+    """
+    partition_dir = Path(partition_dir)
+    game_path = partition_dir / GAME_AGGREGATES_FILE
+    columns = ['game_id', 'team_name_ko'] + SEASON_AGGREGATE_COLUMNS
+
+    if game_totals is None:
+        game_totals = pd.DataFrame(columns=columns)
+    else:
+        game_totals = game_totals.reset_index()[columns]
+
+    if replace_all or not game_path.exists():
+        per_game = game_totals
+    else:
+        existing = pd.read_csv(game_path)
+        dropped = set(game_totals['game_id'].astype(int)) | {int(game_id) for game_id in remove_games}
+        per_game = pd.concat(
+            [existing[~existing['game_id'].isin(dropped)], game_totals], ignore_index=True
+        )
+    per_game = per_game.astype({name: 'int64' for name in ['game_id'] + SEASON_AGGREGATE_COLUMNS})
+    per_game = per_game.sort_values(['game_id', 'team_name_ko'])
+
+    totals = per_game.groupby('team_name_ko')[SEASON_AGGREGATE_COLUMNS].sum().astype('int64')
+    totals.insert(0, 'games', per_game.groupby('team_name_ko')['game_id'].nunique().reindex(totals.index))
+
+    for frame, path, index in ((per_game, game_path, False), (totals, partition_dir / SEASON_AGGREGATES_FILE, True)):
+        tmp_path = path.with_suffix('.csv.tmp')
+        frame.to_csv(tmp_path, index=index)
+        tmp_path.replace(path)
+    return totals
+
+
+def ingest_raw_data(
+    raw_data_path: Union[str, Path],
+    partition_dir: Union[str, Path],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    game_ids: Optional[set] = None,
+    match_info_path: Optional[Union[str, Path]] = None
+) -> pd.DataFrame:
+    """
+    raw_data.csv를 청크 단위로 읽어 경기별 파티션에 나누어 저장하고 시즌 집계 계산
+
+    Args:
+        raw_data_path: 원본 이벤트 CSV 경로
+        partition_dir: 경기별 파티션을 저장할 디렉터리
+        chunksize: 한 번에 읽을 행 수 (최대 메모리 사용량 결정)
+        game_ids: 지정 시 해당 경기만 파티션에 기록하고 시즌 집계에서도 해당 경기만 교체
+            (None이면 전체를 다시 집계)
+        match_info_path: 지정 시 이번에 쓴 경기의 점유 체인 배열을 partition_dir/chains/에 저장
+
+    Returns:
+        팀별 시즌 집계 DataFrame (partition_dir/season_aggregates.csv에도 저장)
+    """
+    partition_dir = Path(partition_dir)
+    partition_dir.mkdir(parents=True, exist_ok=True)
+
+    # 이번 수집에서 처음 쓰는 파티션은 기존 파일을 덮어씀 (이후 청크는 이어쓰기)
+    written = set()
+    game_totals = None
+
+    for chunk in iter_raw_data_chunks(raw_data_path, chunksize):
+        if game_ids is not None:
+            chunk = chunk[chunk['game_id'].isin(game_ids)]
+            if chunk.empty:
+                continue
+
+        for game_id, game_rows in chunk.groupby('game_id', sort=False):
+            first_write = game_id not in written
+            game_rows.to_csv(
+                partition_path(partition_dir, game_id),
+                mode='w' if first_write else 'a',
+                header=first_write,
+                index=False,
+            )
+            written.add(game_id)
+
+        # 청크 경계에 걸친 경기도 같은 (경기, 팀) 행으로 합산
+        summary = summarize_chunk(chunk)
+        game_totals = summary if game_totals is None else game_totals.add(summary, fill_value=0)
+
+    if match_info_path is not None:
+        save_partition_chains(partition_dir, match_info_path, sorted(written))
+    return merge_partition_aggregates(partition_dir, game_totals, replace_all=game_ids is None)
+
+
+def save_partition_chains(
+    partition_dir: Union[str, Path],
+    match_info_path: Union[str, Path],
+    game_ids: Iterable[int]
+) -> int:
+    """
+    경기 파티션을 하나씩 읽어 점유 체인 배열을 partition_dir/chains/에 저장
+
+    Returns:
+        저장한 경기 수 (match_info에 없는 경기는 건너뜀)
+    """
+    from src.data.loader import load_match_info, convert_kleague_to_match_data
+    from src.analysis.possession import CHAINS_DIR, save_possession_chains
+
+    match_info = load_match_info(str(match_info_path))
+    known_games = set(match_info['game_id'].astype(int))
+    saved = 0
+    for game_id in game_ids:
+        if int(game_id) not in known_games:
+            continue
+        rows = read_game_partition(partition_dir, game_id)
+        save_possession_chains(
+            Path(partition_dir) / CHAINS_DIR,
+            convert_kleague_to_match_data(rows, match_info, int(game_id))
+        )
+        saved += 1
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="raw_data.csv 청크 단위 파티션 수집")
+    parser.add_argument('raw_data_path', help="원본 이벤트 CSV 경로")
+    parser.add_argument('partition_dir', help="경기별 파티션 저장 디렉터리")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="한 번에 읽을 행 수 (최대 메모리 사용량 결정)")
+    parser.add_argument('--match-info', help="지정 시 경기별 점유 체인 배열도 저장 (match_info.csv 경로)")
+    args = parser.parse_args()
+
+    totals = ingest_raw_data(
+        args.raw_data_path, args.partition_dir, args.chunksize, match_info_path=args.match_info
+    )
+    print(f"{len(totals)}개 팀 집계 완료: {Path(args.partition_dir) / SEASON_AGGREGATES_FILE}")
+    print(totals.to_string())
+
+
+if __name__ == "__main__":
+    main()
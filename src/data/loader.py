@@ -1,10 +1,15 @@
 """
 K리그 실제 데이터 로더 및 변환 모듈
 """
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Optional, List
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, List
 from src.data.models import MatchData, MatchEvent
+from src.data.ingest import read_game_partition
+from src.data.event_store import is_event_store, open_event_store
+from src.data.xg import XGModel, get_default_xg_grid
 
 
 def load_match_info(match_info_path: str) -> pd.DataFrame:
@@ -13,7 +18,18 @@ def load_match_info(match_info_path: str) -> pd.DataFrame:
 
 
 def load_raw_data(raw_data_path: str, game_id: Optional[int] = None) -> pd.DataFrame:
-    """원본 경기 데이터 로드"""
+    """
+    원본 경기 데이터 로드
+
+    raw_data_path가 디렉터리이면 경기 1개 분량만 읽습니다.
+    - src.data.event_store 저장소: 메모리 매핑 파일에서 해당 경기 레코드 조회
+    - src.data.ingest 파티션 디렉터리: 해당 경기 파티션 파일 로드
+    """
+    if game_id and is_event_store(raw_data_path):
+        return open_event_store(str(raw_data_path)).game_frame(game_id)
+    if game_id and Path(raw_data_path).is_dir():
+        return read_game_partition(raw_data_path, game_id)
+    
     df = pd.read_csv(raw_data_path)
     if game_id:
         df = df[df['game_id'] == game_id]
@@ -60,28 +76,31 @@ def map_event_type(type_name: str) -> str:
 
 def estimate_xg_from_shot(shot_data: pd.Series) -> float:
     """
-    슈팅 데이터로부터 xG 추정
-    실제 xG 데이터가 없으므로 위치와 결과로 추정
+    슈팅 데이터로부터 xG 추정 (단일 슈팅용)
+    실제 xG 데이터가 없으므로 위치(거리/각도)로 추정하며, 결과(득점 여부)는 사용하지 않음
+    여러 슈팅은 estimate_xg_from_shots로 한 번에 계산하세요.
     """
-    x = shot_data.get('start_x', 50.0)
-    y = shot_data.get('start_y', 50.0)
-    result = shot_data.get('result_name', '')
-    
-    # 골대까지의 거리 계산 (x 좌표가 클수록 골대에 가까움)
-    distance_to_goal = 100 - x
-    
-    # 기본 xG (거리 기반)
-    base_xg = max(0.01, (100 - distance_to_goal) / 100 * 0.5)
-    
-    # 결과에 따른 조정
-    if result == 'Goal':
-        return 1.0
-    elif result == 'On Target':
-        return base_xg * 0.8
-    elif result == 'Off Target':
-        return base_xg * 0.3
-    else:
-        return base_xg * 0.1
+    x = shot_data.get('start_x', np.nan)
+    y = shot_data.get('start_y', np.nan)
+    return float(get_default_xg_grid()(np.array([x]), np.array([y]))[0])
+
+
+def estimate_xg_from_shots(
+    shots: pd.DataFrame,
+    xg_model: Optional[XGModel] = None
+) -> np.ndarray:
+    """
+    여러 슈팅의 xG를 벡터화하여 한 번에 추정
+
+    Args:
+        shots: start_x, start_y 컬럼을 가진 슈팅 데이터
+        xg_model: (x 배열, y 배열) → xG 배열 함수 (기본: 미리 계산된 위치 기반 xG 격자)
+    """
+    model = xg_model or get_default_xg_grid()
+    return model(
+        shots['start_x'].to_numpy(dtype=np.float64),
+        shots['start_y'].to_numpy(dtype=np.float64)
+    )
 
 
 def is_forward_pass(start_x: float, end_x: float) -> bool:
@@ -94,10 +113,14 @@ def is_forward_pass(start_x: float, end_x: float) -> bool:
 def convert_kleague_to_match_data(
     raw_data: pd.DataFrame,
     match_info: pd.DataFrame,
-    game_id: int
+    game_id: int,
+    xg_model: Optional[XGModel] = None
 ) -> MatchData:
     """
     K리그 원본 데이터를 MatchData로 변환
+
+    Args:
+        xg_model: 슈팅 xG 추정 함수 (기본: 위치 기반 xG 격자)
     """
     # 경기 정보 추출
     match_row = match_info[match_info['game_id'] == game_id].iloc[0]
@@ -111,6 +134,12 @@ def convert_kleague_to_match_data(
     # 해당 경기 데이터만 필터링
     game_data = raw_data[raw_data['game_id'] == game_id].copy()
     
+    # 슈팅 xG는 경기 전체 슈팅을 한 번에 계산
+    game_data['xg'] = np.nan
+    shot_mask = game_data['type_name'].map(map_event_type) == 'shot'
+    if shot_mask.any():
+        game_data.loc[shot_mask, 'xg'] = estimate_xg_from_shots(game_data[shot_mask], xg_model)
+    
     # 이벤트 변환
     events: List[MatchEvent] = []
     
@@ -158,7 +187,7 @@ def convert_kleague_to_match_data(
         # xG 계산 (슈팅인 경우)
         xg = None
         if event_type == 'shot':
-            xg = estimate_xg_from_shot(row)
+            xg = float(row['xg'])
         
         # 패스인 경우: 패스를 받은 선수 정보 찾기
         receiver_name = None
@@ -186,6 +215,8 @@ def convert_kleague_to_match_data(
             minute=minute,
             team=team,
             event_type=event_type,
+            period=int(row['period_id']),
+            time_seconds=float(row['time_seconds']),
             x=x if not pd.isna(x) else None,
             y=y if not pd.isna(y) else None,
             success=success,
@@ -202,8 +233,8 @@ def convert_kleague_to_match_data(
         
         events.append(event)
     
-    # 시간순 정렬
-    events.sort(key=lambda e: e.minute)
+    # 시간순 정렬 (분 단위 인덱스를 위해 분 기준, 같은 분 안에서는 초 단위 순서 유지)
+    events.sort(key=lambda e: (e.minute, e.period, e.time_seconds))
     
     return MatchData(
         match_id=str(game_id),
@@ -218,7 +249,8 @@ def convert_kleague_to_match_data(
 def load_match_by_id(
     raw_data_path: str,
     match_info_path: str,
-    game_id: int
+    game_id: int,
+    xg_model: Optional[XGModel] = None
 ) -> MatchData:
     """
     경기 ID로 경기 데이터 로드 및 변환
@@ -226,7 +258,41 @@ def load_match_by_id(
     raw_data = load_raw_data(raw_data_path, game_id)
     match_info = load_match_info(match_info_path)
     
-    return convert_kleague_to_match_data(raw_data, match_info, game_id)
+    return convert_kleague_to_match_data(raw_data, match_info, game_id, xg_model)
+
+
+def iter_matches(
+    raw_data_path: str,
+    match_info_path: str,
+    game_ids: Optional[Iterable[int]] = None,
+    xg_model: Optional[XGModel] = None
+) -> Iterator[MatchData]:
+    """
+    여러 경기를 순서대로 로드 및 변환
+
+    raw_data.csv는 한 번만 읽고, 파티션/이벤트 저장소 디렉터리는 경기별로 해당 분량만 읽습니다.
+    game_ids가 None이면 match_info의 모든 경기를 대상으로 합니다.
+    """
+    match_info = load_match_info(match_info_path)
+    if game_ids is None:
+        game_ids = match_info['game_id'].tolist()
+    
+    if Path(raw_data_path).is_dir():
+        for game_id in game_ids:
+            try:
+                raw_data = load_raw_data(raw_data_path, int(game_id))
+            except FileNotFoundError:
+                continue
+            yield convert_kleague_to_match_data(raw_data, match_info, int(game_id), xg_model)
+        return
+    
+    raw_data = load_raw_data(raw_data_path)
+    games = dict(tuple(raw_data.groupby('game_id')))
+    for game_id in game_ids:
+        game_data = games.get(int(game_id))
+        if game_data is None:
+            continue
+        yield convert_kleague_to_match_data(game_data, match_info, int(game_id), xg_model)
 
 
 def list_available_matches(match_info_path: str) -> pd.DataFrame:
@@ -1,8 +1,9 @@
 """
 경기 데이터 모델 정의
 """
-from pydantic import BaseModel
-from typing import List, Optional
+from bisect import bisect_left
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 
@@ -11,6 +12,8 @@ class MatchEvent(BaseModel):
     minute: int
     team: str
     event_type: str  # 'shot', 'pass', 'defense', 'possession'
+    period: Optional[int] = None  # 1: 전반, 2: 후반
+    time_seconds: Optional[float] = None  # 피리어드 시작 후 경과 시간(초, 추가시간 포함 원본 값)
     x: Optional[float] = None  # 필드 x 좌표 (0-100)
     y: Optional[float] = None  # 필드 y 좌표 (0-100)
     success: Optional[bool] = None
@@ -27,6 +30,97 @@ class MatchData(BaseModel):
     events: List[MatchEvent]
     final_score: Optional[dict] = None  # {'home': 2, 'away': 1}
 
+    # 팀별 분 단위 오프셋 인덱스 {team 또는 None(전체): (정렬된 이벤트, 분별 시작 오프셋)}
+    _minute_index: Optional[Dict[Optional[str], Tuple[List[MatchEvent], List[int]]]] = PrivateAttr(default=None)
+    _minute_index_key: Optional[Tuple[int, int]] = PrivateAttr(default=None)
+    # 이벤트에서 파생된 계산 결과 캐시 (열 배열, 타임라인 등)
+    _derived_cache: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _derived_cache_key: Optional[Tuple[int, int]] = PrivateAttr(default=None)
+
+    def get_derived(self, name: str, builder: Callable[['MatchData'], Any]) -> Any:
+        """
+        이벤트 목록에서 파생된 계산 결과를 경기당 1회만 생성하여 재사용
+
+        events 리스트가 교체되거나 길이가 바뀌면 캐시 전체를 비웁니다.
+        """
+        key = (id(self.events), len(self.events))
+        if self._derived_cache_key != key:
+            self._derived_cache = {}
+            self._derived_cache_key = key
+        if name not in self._derived_cache:
+            self._derived_cache[name] = builder(self)
+        return self._derived_cache[name]
+
+    def _get_minute_index(self) -> Dict[Optional[str], Tuple[List[MatchEvent], List[int]]]:
+        """
+        팀별 분 단위 오프셋 인덱스 반환 (최초 호출 시 1회 생성)
+
+        offsets[m]은 정렬된 이벤트 목록에서 minute >= m 인 첫 이벤트 위치이므로
+        [minute_start, minute_end) 구간은 offsets[minute_start]:offsets[minute_end] 슬라이스가 됩니다.
+        events 리스트가 교체되거나 길이가 바뀌면 다시 생성합니다.
+        """
+        key = (id(self.events), len(self.events))
+        if self._minute_index is not None and self._minute_index_key == key:
+            return self._minute_index
+
+        # 로더가 이미 분 기준으로 정렬하지만, 직접 생성된 데이터도 있으므로 안정 정렬로 보장
+        ordered = sorted(self.events, key=lambda e: e.minute)
+        max_minute = ordered[-1].minute if ordered else 0
+
+        partitions: Dict[Optional[str], List[MatchEvent]] = {None: ordered}
+        for event in ordered:
+            partitions.setdefault(event.team, []).append(event)
+
+        index = {}
+        for team, team_events in partitions.items():
+            minutes = [e.minute for e in team_events]
+            offsets = [bisect_left(minutes, m) for m in range(max_minute + 2)]
+            index[team] = (team_events, offsets)
+
+        self._minute_index = index
+        self._minute_index_key = key
+        return index
+
+    def _window_bounds(
+        self,
+        minute_start: int,
+        minute_end: int,
+        team: Optional[str]
+    ) -> Tuple[List[MatchEvent], int, int]:
+        """구간 [minute_start, minute_end)의 (팀 이벤트 목록, 시작, 끝) 오프셋 조회"""
+        index = self._get_minute_index()
+        if team not in index:
+            return [], 0, 0
+        team_events, offsets = index[team]
+        last = len(offsets) - 1
+        start = offsets[min(max(minute_start, 0), last)]
+        end = offsets[min(max(minute_end, 0), last)]
+        return team_events, start, max(start, end)
+
+    def window_events(
+        self,
+        minute_start: int,
+        minute_end: int,
+        team: Optional[str] = None
+    ) -> List[MatchEvent]:
+        """
+        [minute_start, minute_end) 구간의 이벤트 조회 (team이 None이면 양 팀 전체)
+
+        전체 이벤트를 스캔하지 않고 오프셋 조회 후 해당 구간만 슬라이스합니다.
+        """
+        team_events, start, end = self._window_bounds(minute_start, minute_end, team)
+        return team_events[start:end]
+
+    def count_window_events(
+        self,
+        minute_start: int,
+        minute_end: int,
+        team: Optional[str] = None
+    ) -> int:
+        """[minute_start, minute_end) 구간의 이벤트 수 (슬라이스 생성 없이 오프셋 차이로 계산)"""
+        _, start, end = self._window_bounds(minute_start, minute_end, team)
+        return end - start
+
 
 class TimeWindowMetrics(BaseModel):
     """5분 단위 지표"""
@@ -53,10 +147,13 @@ class MomentumScore(BaseModel):
 class TurningPoint(BaseModel):
     """변곡점"""
     minute: int
+    period: Optional[int] = None  # 초 단위 위치의 피리어드
+    time_seconds: Optional[float] = None  # 피리어드 내 변곡 시점(초)
     team_advantage: str  # 'home' or 'away'
     change_type: str  # 'momentum_shift', 'attack_surge', 'defense_breakdown'
     indicators: List[str]  # 변화 지표 목록
     explanation: str  # 팬 친화형 설명
     metrics_before: TimeWindowMetrics
     metrics_after: TimeWindowMetrics
+    confidence: Optional[float] = None  # 부트스트랩 복제본 중 변곡점이 재확정된 비율 (0~1)
 
@@ -0,0 +1,98 @@
+"""
+위치 기반 xG(기대득점) 추정 모듈
+
+슈팅 위치(start_x, start_y)만으로 골대까지의 거리와 골대를 바라보는 각도를 계산하여
+로지스틱 모델로 xG를 추정합니다. 결과(득점 여부)는 사용하지 않으므로 결과가 xG에 새지 않습니다.
+
+모델 값은 미리 계산한 2D 격자(lookup grid)에 저장해 두고,
+시즌 전체 슈팅을 한 번에 쌍선형 보간(bilinear interpolation)으로 조회합니다.
+"""
+from functools import lru_cache
+from typing import Callable
+import numpy as np
+
+# 좌표계: 0-100 정규화 좌표 (x=100이 상대 골대), 실제 거리 계산은 105 x 68m 경기장 기준
+PITCH_LENGTH = 105.0
+PITCH_WIDTH = 68.0
+GOAL_WIDTH = 7.32
+
+# 로지스틱 모델 계수: logit = 절편 + 각도(rad) 계수 × 각도 + 거리(m) 계수 × 거리
+XG_INTERCEPT = -0.5
+XG_ANGLE_COEF = 1.3855
+XG_DISTANCE_COEF = -0.1018
+
+# 좌표가 없는 슈팅에 사용할 기본 xG
+DEFAULT_SHOT_XG = 0.08
+
+# 위치 → xG 함수 형식 (x 배열, y 배열) → xG 배열
+XGModel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def shot_distance_and_angle(x: np.ndarray, y: np.ndarray):
+    """
+    슈팅 위치(0-100 좌표)에서 골대 중앙까지의 거리(m)와 골문을 바라보는 각도(rad) 계산
+    """
+    dx = (100.0 - np.asarray(x, dtype=np.float64)) * (PITCH_LENGTH / 100.0)
+    dy = (np.asarray(y, dtype=np.float64) - 50.0) * (PITCH_WIDTH / 100.0)
+
+    distance = np.hypot(dx, dy)
+    # 두 골대 기둥 사이의 각도 (골라인 위/뒤에서는 π 근처로 보정)
+    angle = np.arctan2(GOAL_WIDTH * dx, dx ** 2 + dy ** 2 - (GOAL_WIDTH / 2) ** 2)
+    angle = np.where(angle < 0, angle + np.pi, angle)
+    return distance, angle
+
+
+def location_xg(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """거리/각도 로지스틱 모델로 xG 직접 계산 (격자 생성용)"""
+    distance, angle = shot_distance_and_angle(x, y)
+    logit = XG_INTERCEPT + XG_ANGLE_COEF * angle + XG_DISTANCE_COEF * distance
+    return 1.0 / (1.0 + np.exp(-logit))
+
+
+class XGGrid:
+    """
+    미리 계산된 xG 격자와 벡터화된 쌍선형 보간 조회
+
+    Args:
+        resolution: 격자 간격 (0-100 좌표 단위)
+        model: 격자 값을 계산할 위치 → xG 함수 (기본: location_xg)
+    """
+
+    def __init__(self, resolution: float = 1.0, model: XGModel = location_xg):
+        self.resolution = resolution
+        self.axis = np.arange(0.0, 100.0 + resolution / 2, resolution)
+        grid_x, grid_y = np.meshgrid(self.axis, self.axis, indexing='ij')
+        self.values = model(grid_x, grid_y)  # (x, y)
+
+    def __call__(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        슈팅 위치 배열의 xG를 한 번에 조회
+
+        좌표가 없는(NaN) 슈팅은 DEFAULT_SHOT_XG를 반환합니다.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        missing = np.isnan(x) | np.isnan(y)
+
+        last = len(self.axis) - 1
+        fx = np.clip(np.nan_to_num(x) / self.resolution, 0, last)
+        fy = np.clip(np.nan_to_num(y) / self.resolution, 0, last)
+        ix = np.minimum(fx.astype(np.int64), last - 1)
+        iy = np.minimum(fy.astype(np.int64), last - 1)
+        tx = fx - ix
+        ty = fy - iy
+
+        v = self.values
+        xg = (
+            v[ix, iy] * (1 - tx) * (1 - ty) +
+            v[ix + 1, iy] * tx * (1 - ty) +
+            v[ix, iy + 1] * (1 - tx) * ty +
+            v[ix + 1, iy + 1] * tx * ty
+        )
+        return np.where(missing, DEFAULT_SHOT_XG, xg)
+
+
+@lru_cache(maxsize=None)
+def get_default_xg_grid() -> XGGrid:
+    """기본 xG 격자 (프로세스당 1회 생성)"""
+    return XGGrid()
@@ -0,0 +1,283 @@
+"""
+경기 흐름 애니메이션 내보내기
+
+모멘텀 곡선과 최근 5분 활동 히트맵이 분 단위로 변해 가는 짧은 클립(GIF/MP4)을 만듭니다.
+
+- 그림은 한 번만 만들고, 정적인 부분(축, 경기장)은 배경으로 한 번 렌더링해 둔 뒤
+  프레임마다 배경을 복원하고 움직이는 아티스트만 다시 그립니다 (blitting).
+- 구간 지표는 분 단위 합계를 한 번 계산해 두고, 프레임마다 새로 들어온 1분을 더하고
+  구간에서 빠지는 1분을 빼는 방식으로 갱신합니다.
+- 프레임은 스트리밍 작성기로 바로 내보냅니다 (ffmpeg가 있으면 파이프, 없으면 Pillow GIF).
+
+사용법:
+    python -m src.visualization.animation raw_data.csv match_info.csv 126288 --output match.gif
+"""
+import argparse
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Union
+import numpy as np
+from src.data.models import MatchData, TurningPoint
+from src.analysis.metrics import get_event_arrays, get_window_sum_array, derive_window_metrics, calculate_momentum_array
+from src.analysis.turning_point import WINDOW_SIZE
+
+MATCH_LENGTH = 90
+# 히트맵 격자 (x 칸, y 칸)
+ANIMATION_GRID = (20, 20)
+DEFAULT_FPS = 5
+
+
+def minute_position_grids(
+    match_data: MatchData,
+    grid_shape: tuple = ANIMATION_GRID,
+    match_length: int = MATCH_LENGTH
+) -> np.ndarray:
+    """
+    분 단위 팀별 위치 빈도 격자
+
+    원정 팀 좌표는 홈 팀 공격 방향 기준으로 뒤집습니다(영역 지배 격자와 같은 기준).
+
+    Returns:
+        (분, 팀(2), y 칸, x 칸) 배열
+    """
+    arrays = get_event_arrays(match_data)
+    n_x, n_y = grid_shape
+    team = arrays['team']
+    minute = arrays['minute']
+    valid = (
+        (team >= 0) & (minute >= 0) & (minute < match_length) &
+        ~np.isnan(arrays['x']) & ~np.isnan(arrays['y'])
+    )
+    team = team[valid].astype(np.int64)
+    away = team == 1
+    x = np.where(away, 100.0 - arrays['x'][valid], arrays['x'][valid])
+    y = np.where(away, 100.0 - arrays['y'][valid], arrays['y'][valid])
+
+    grid_x = np.clip((x / 100 * n_x).astype(np.int64), 0, n_x - 1)
+    grid_y = np.clip((y / 100 * n_y).astype(np.int64), 0, n_y - 1)
+    flat = ((minute[valid] * 2 + team) * n_y + grid_y) * n_x + grid_x
+    counts = np.bincount(flat, minlength=match_length * 2 * n_y * n_x)
+    return counts.reshape(match_length, 2, n_y, n_x).astype(float)
+
+
+class RollingWindow:
+    """
+    최근 window_size분 합계를 분 단위로 증분 갱신
+
+    per_minute: (분, ...) 분 단위 값 - advance(m)는 m분을 더하고 m - window_size분을 뺍니다.
+    """
+
+    def __init__(self, per_minute: np.ndarray, window_size: int = WINDOW_SIZE):
+        self.per_minute = per_minute
+        self.window_size = window_size
+        self.total = np.zeros(per_minute.shape[1:])
+
+    def advance(self, minute: int) -> np.ndarray:
+        self.total += self.per_minute[minute]
+        if minute >= self.window_size:
+            self.total -= self.per_minute[minute - self.window_size]
+        return self.total
+
+
+class FfmpegFrameWriter:
+    """RGBA 프레임을 ffmpeg 표준 입력으로 바로 흘려보내는 작성기 (.mp4 / .gif)"""
+
+    def __init__(self, path: Union[str, Path], width: int, height: int, fps: int):
+        path = Path(path)
+        codec = ['-pix_fmt', 'yuv420p'] if path.suffix == '.mp4' else []
+        self._process = subprocess.Popen(
+            [
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+                '-i', '-', *codec, str(path),
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, frame: np.ndarray):
+        self._process.stdin.write(frame.tobytes())
+
+    def close(self):
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError("ffmpeg 인코딩에 실패했습니다.")
+
+
+class PillowGifWriter:
+    """
+    ffmpeg가 없을 때 쓰는 GIF 작성기
+
+    프레임을 받는 즉시 256색 팔레트 이미지로 줄여(픽셀당 1바이트) 보관하고 닫을 때 파일로 씁니다.
+    """
+
+    def __init__(self, path: Union[str, Path], fps: int):
+        self.path = Path(path)
+        self.duration = int(round(1000 / fps))
+        self._frames: List = []
+
+    def write(self, frame: np.ndarray):
+        from PIL import Image
+
+        image = Image.fromarray(frame[:, :, :3])
+        self._frames.append(image.quantize(colors=256, method=Image.Quantize.MEDIANCUT))
+
+    def close(self):
+        if not self._frames:
+            return
+        first, *rest = self._frames
+        first.save(self.path, save_all=True, append_images=rest, duration=self.duration, loop=0)
+
+
+def open_frame_writer(path: Union[str, Path], width: int, height: int, fps: int):
+    """
+    출력 확장자에 맞는 스트리밍 프레임 작성기
+
+    Raises:
+        ValueError: 지원하지 않는 확장자
+        RuntimeError: ffmpeg 없이 MP4를 요청한 경우
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in ('.gif', '.mp4'):
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {suffix} (.gif, .mp4)")
+    if shutil.which('ffmpeg'):
+        return FfmpegFrameWriter(path, width, height, fps)
+    if suffix == '.mp4':
+        raise RuntimeError("MP4 내보내기에는 ffmpeg가 필요합니다.")
+    return PillowGifWriter(path, fps)
+
+
+def export_match_animation(
+    match_data: MatchData,
+    turning_points: List[TurningPoint],
+    output_path: Union[str, Path],
+    fps: int = DEFAULT_FPS,
+    dpi: int = 80,
+    match_length: int = MATCH_LENGTH
+) -> Dict[str, float]:
+    """
+    분 단위 모멘텀 곡선 + 최근 5분 활동 히트맵 애니메이션 내보내기
+
+    Returns:
+        프레임 수, 프레임당 평균/최대 렌더링 시간(ms), 전체 시간(초), 출력 경로
+    """
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from src.visualization.plotter import setup_korean_font, draw_pitch
+
+    setup_korean_font()
+    started = time.perf_counter()
+
+    # 분 단위 합계 → 최근 5분 구간 합계 / 위치 격자 (프레임마다 증분 갱신)
+    window_sums = RollingWindow(get_window_sum_array(match_data, 1, match_length).transpose(1, 0, 2))
+    position_window = RollingWindow(minute_position_grids(match_data, match_length=match_length))
+    turning_minutes = np.array([tp.minute for tp in turning_points], dtype=float)
+
+    # 그림은 한 번만 생성
+    fig = Figure(figsize=(12, 5), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax_curve, ax_pitch = fig.subplots(1, 2, gridspec_kw={'width_ratios': [3, 2]})
+    fig.suptitle(f'{match_data.home_team} vs {match_data.away_team}', fontsize=13, fontweight='bold')
+
+    ax_curve.set_xlim(0, match_length)
+    ax_curve.set_ylim(-110, 110)
+    ax_curve.axhline(0, color='black', linestyle='--', linewidth=1, alpha=0.6)
+    ax_curve.set_xlabel('시간(분)')
+    ax_curve.set_ylabel(f'모멘텀 (+: {match_data.home_team})')
+    ax_curve.grid(True, alpha=0.3)
+
+    ax_pitch.set_xlim(0, 100)
+    ax_pitch.set_ylim(0, 100)
+    ax_pitch.set_facecolor('#22312b')
+    ax_pitch.set_xticks([])
+    ax_pitch.set_yticks([])
+    ax_pitch.set_title(f'최근 {WINDOW_SIZE}분 활동 (파랑: {match_data.home_team})', fontsize=10)
+
+    # 움직이는 아티스트 (배경 렌더링에서 제외)
+    curve, = ax_curve.plot([], [], color='blue', lw=2)
+    head, = ax_curve.plot([], [], 'o', color='blue', markersize=6)
+    markers, = ax_curve.plot([], [], '*', color='gold', markersize=14, markeredgecolor='black')
+    clock = ax_curve.text(0.02, 0.95, '', transform=ax_curve.transAxes, fontsize=12,
+                          fontweight='bold', va='top')
+    # 활동이 없는(0) 칸은 마스킹해 투명하게 두어 잔디색 배경이 보이도록 함
+    heatmap = ax_pitch.imshow(np.ma.masked_all(ANIMATION_GRID[::-1]), origin='lower', extent=[0, 100, 0, 100],
+                              cmap=colormaps['coolwarm_r'].with_extremes(bad=(0.0, 0.0, 0.0, 0.0)),
+                              vmin=-1, vmax=1, alpha=0.75, interpolation='nearest', zorder=1)
+    # 경기장 선은 채우기 없이 히트맵 위에 그림
+    pitch = draw_pitch(ax_pitch, 'heatmap', zorder=2)
+    pitch.set_facecolor('none')
+    animated = [heatmap, pitch, curve, markers, head, clock]
+    for artist in animated:
+        artist.set_animated(True)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+    writer = open_frame_writer(output_path, width, height, fps)
+
+    minutes = np.arange(match_length)
+    momentum = np.zeros(match_length)
+    frame_times = []
+    try:
+        for minute in minutes:
+            frame_start = time.perf_counter()
+
+            window = window_sums.advance(minute)
+            metrics = derive_window_metrics(window[:, None, :])
+            momentum[minute] = calculate_momentum_array(metrics)[0]
+
+            grid = position_window.advance(minute)
+            scale = max(grid.max(), 1.0)
+            balance = (grid[0] - grid[1]) / scale
+            heatmap.set_data(np.ma.masked_where((grid[0] == 0) & (grid[1] == 0), balance))
+
+            curve.set_data(minutes[:minute + 1], momentum[:minute + 1])
+            head.set_data([minute], [momentum[minute]])
+            shown = turning_minutes[turning_minutes <= minute]
+            markers.set_data(shown, momentum[np.minimum(shown.astype(int), match_length - 1)])
+            clock.set_text(f"{minute + 1}'")
+
+            canvas.restore_region(background)
+            for artist in animated:
+                fig.draw_artist(artist)
+            writer.write(np.asarray(canvas.buffer_rgba()))
+            frame_times.append(time.perf_counter() - frame_start)
+    finally:
+        writer.close()
+
+    frame_ms = np.array(frame_times) * 1000
+    return {
+        'frames': len(frame_times),
+        'mean_frame_ms': round(float(frame_ms.mean()), 2),
+        'max_frame_ms': round(float(frame_ms.max()), 2),
+        'total_seconds': round(time.perf_counter() - started, 2),
+        'output_path': str(output_path),
+    }
+
+
+def main():
+    from src.data.loader import load_match_by_id
+    from src.analysis.turning_point import detect_turning_points
+
+    parser = argparse.ArgumentParser(description="경기 흐름 애니메이션(GIF/MP4) 내보내기")
+    parser.add_argument('raw_data_path', help="raw_data.csv, 파티션 또는 이벤트 저장소 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('game_id', type=int, help="경기 ID")
+    parser.add_argument('--output', help="출력 경로 (.gif 또는 .mp4, 기본값: match_{game_id}.gif)")
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS, help="초당 프레임 수 (1프레임 = 1분)")
+    args = parser.parse_args()
+
+    match_data = load_match_by_id(args.raw_data_path, args.match_info_path, args.game_id)
+    output = args.output or f"match_{args.game_id}.gif"
+    stats = export_match_animation(match_data, detect_turning_points(match_data), output, args.fps)
+    print(
+        f"{stats['frames']}프레임 저장 완료: {stats['output_path']} "
+        f"(프레임당 평균 {stats['mean_frame_ms']}ms, 최대 {stats['max_frame_ms']}ms, "
+        f"전체 {stats['total_seconds']}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+라운드 대시보드 모듈
+
+한 라운드(game_day)의 모든 경기 모멘텀 곡선을 하나의 그림에 작은 그래프(small multiples)로 그립니다.
+
+- 경기별 타임라인(5분 구간 모멘텀, 변곡점)은 경기를 작업자 수만큼 묶어 공용 프로세스 풀에서 계산하고,
+  묶음 안에서는 detect_turning_points_batch로 규칙을 한 번에 평가합니다.
+- 파티션/이벤트 저장소 디렉터리는 작업자가 자기 경기만 읽고,
+  raw_data.csv는 부모 프로세스가 해당 라운드 행만 한 번 골라 작업자에게 나눠 줍니다.
+- 작업자에는 그림을 그리는 데 필요한 작은 결과(dict)만 돌려받아 부모에서 한 번에 렌더링합니다.
+  렌더링은 pyplot 전역 상태 없이 Figure + FigureCanvasAgg로 하므로 API 스레드에서 동시에 그려도 안전합니다.
+
+사용법:
+    python -m src.visualization.dashboard raw_data.csv match_info.csv 1 --output round_1.png
+"""
+import argparse
+import asyncio
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from src.data.loader import load_match_info, convert_kleague_to_match_data, iter_matches
+from src.analysis import process_pool
+
+# 한 줄에 놓을 경기 수
+DASHBOARD_COLUMNS = 3
+
+
+def round_game_ids(match_info: pd.DataFrame, game_day: int) -> List[int]:
+    """라운드에 속한 경기 ID (경기 시작 시각 순)"""
+    games = match_info[match_info['game_day'] == game_day]
+    return games.sort_values(['game_date', 'game_id'])['game_id'].astype(int).tolist()
+
+
+def _timeline_chunk(
+    raw_data_path: str,
+    match_info_path: str,
+    game_ids: List[int],
+    method: str,
+    rows: Optional[pd.DataFrame] = None
+) -> List[dict]:
+    """
+    경기 묶음의 타임라인 계산 (프로세스 풀 작업 단위)
+
+    rows를 주면 그 행에서 경기를 변환하고, 없으면 raw_data_path에서 경기별로 읽습니다.
+    """
+    from src.analysis.turning_point import compute_window_momentum, detect_turning_points, detect_turning_points_batch
+
+    if rows is not None:
+        match_info = load_match_info(match_info_path)
+        games = dict(tuple(rows.groupby('game_id')))
+        matches = [
+            convert_kleague_to_match_data(games[game_id], match_info, game_id)
+            for game_id in game_ids if game_id in games
+        ]
+    else:
+        matches = list(iter_matches(raw_data_path, match_info_path, game_ids))
+
+    if method == 'rules':
+        turning_points = detect_turning_points_batch(matches)
+    else:
+        turning_points = [detect_turning_points(md, method) for md in matches]
+
+    timelines = []
+    for md, tps in zip(matches, turning_points):
+        minutes, momentum = compute_window_momentum(md)
+        timelines.append({
+            'game_id': int(md.match_id),
+            'home_team': md.home_team,
+            'away_team': md.away_team,
+            'final_score': md.final_score,
+            'minutes': minutes.tolist(),
+            'momentum': np.round(momentum, 2).tolist(),
+            'turning_point_minutes': [tp.minute for tp in tps],
+        })
+    return timelines
+
+
+def _round_chunks(
+    raw_data_path: str,
+    game_ids: List[int],
+    parallel: bool
+) -> List[tuple]:
+    """작업 단위 (경기 묶음, 묶음 행 또는 None) 목록 - 데이터가 없으면 빈 목록"""
+    from src.data.incremental import read_game_rows
+
+    # raw_data.csv는 라운드 행만 한 번 골라 읽고, 디렉터리는 작업자가 경기별로 읽음
+    rows = None if Path(raw_data_path).is_dir() else read_game_rows(raw_data_path, game_ids)
+    if rows is not None and rows.empty:
+        return []
+
+    workers = min(len(game_ids), process_pool.PROCESS_POOL_WORKERS) if parallel else 1
+    chunks = [list(chunk) for chunk in np.array_split(game_ids, workers) if len(chunk)]
+    return [
+        (chunk, None if rows is None else rows[rows['game_id'].isin(chunk)])
+        for chunk in chunks
+    ]
+
+
+def _in_game_order(timelines: List[dict], game_ids: List[int]) -> List[dict]:
+    order = {game_id: i for i, game_id in enumerate(game_ids)}
+    return sorted(timelines, key=lambda timeline: order[timeline['game_id']])
+
+
+def compute_round_timelines(
+    raw_data_path: Union[str, Path],
+    match_info_path: Union[str, Path],
+    game_ids: List[int],
+    method: str = 'rules',
+    parallel: bool = True
+) -> List[dict]:
+    """
+    여러 경기의 타임라인을 프로세스 풀에서 일괄 계산
+
+    Args:
+        parallel: False면 현재 프로세스에서 한 묶음으로 계산
+
+    Returns:
+        game_ids 순서의 타임라인 dict 목록 (데이터가 없는 경기는 제외)
+    """
+    raw_data_path, match_info_path = str(raw_data_path), str(match_info_path)
+    if not game_ids:
+        return []
+
+    chunks = _round_chunks(raw_data_path, game_ids, parallel)
+    if len(chunks) <= 1:
+        timelines = [
+            timeline for chunk, rows in chunks
+            for timeline in _timeline_chunk(raw_data_path, match_info_path, chunk, method, rows)
+        ]
+    else:
+        futures = [
+            process_pool.submit(_timeline_chunk, raw_data_path, match_info_path, chunk, method, rows)
+            for chunk, rows in chunks
+        ]
+        timelines = [timeline for future in futures for timeline in future.result()]
+    return _in_game_order(timelines, game_ids)
+
+
+async def compute_round_timelines_async(
+    raw_data_path: Union[str, Path],
+    match_info_path: Union[str, Path],
+    game_ids: List[int],
+    method: str = 'rules',
+    parallel: bool = True
+) -> List[dict]:
+    """
+    compute_round_timelines의 비동기 버전 (API용)
+
+    행 읽기와 단일 묶음 계산은 스레드에서, 여러 묶음은 프로세스 풀 future를 기다려
+    이벤트 루프를 막지 않습니다.
+    """
+    raw_data_path, match_info_path = str(raw_data_path), str(match_info_path)
+    if not game_ids:
+        return []
+
+    chunks = await asyncio.to_thread(_round_chunks, raw_data_path, game_ids, parallel)
+    if len(chunks) <= 1:
+        results = [
+            await asyncio.to_thread(_timeline_chunk, raw_data_path, match_info_path, chunk, method, rows)
+            for chunk, rows in chunks
+        ]
+    else:
+        results = await asyncio.gather(*[
+            asyncio.wrap_future(
+                process_pool.submit(_timeline_chunk, raw_data_path, match_info_path, chunk, method, rows)
+            )
+            for chunk, rows in chunks
+        ])
+    return _in_game_order([timeline for result in results for timeline in result], game_ids)
+
+
+def plot_round_dashboard(
+    timelines: List[dict],
+    save_path: str,
+    title: str = '라운드 경기 흐름',
+    columns: int = DASHBOARD_COLUMNS,
+    dpi: int = 150
+):
+    """
+    라운드 경기들의 모멘텀 곡선을 공통 축/스타일의 작은 그래프로 한 그림에 그리기
+
+    양수(파랑)는 홈 팀, 음수(빨강)는 원정 팀 우세이며 별은 변곡점입니다.
+    pyplot을 쓰지 않으므로 여러 스레드에서 동시에 호출해도 됩니다.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from src.visualization.plotter import setup_korean_font
+
+    setup_korean_font()
+
+    columns = max(1, min(columns, len(timelines)))
+    rows = max(1, math.ceil(len(timelines) / columns))
+    fig = Figure(figsize=(4.2 * columns, 2.8 * rows + 0.8))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(rows, columns, sharex=True, sharey=True, squeeze=False)
+
+    for ax, timeline in zip(axes.flat, timelines):
+        minutes = np.asarray(timeline['minutes'])
+        momentum = np.asarray(timeline['momentum'])
+        ax.plot(minutes, momentum, color='blue', lw=1.5)
+        ax.fill_between(minutes, momentum, 0, where=momentum > 0, color='blue', alpha=0.3, interpolate=True)
+        ax.fill_between(minutes, momentum, 0, where=momentum < 0, color='red', alpha=0.3, interpolate=True)
+        ax.axhline(0, color='black', linestyle='--', linewidth=0.8, alpha=0.6)
+
+        tp_minutes = np.asarray(timeline['turning_point_minutes'], dtype=int)
+        tp_minutes = tp_minutes[tp_minutes // 5 < len(momentum)]
+        if len(tp_minutes):
+            ax.scatter(tp_minutes, momentum[tp_minutes // 5], c='gold', s=80, marker='*',
+                       edgecolors='black', lw=0.8, zorder=5)
+
+        score = timeline['final_score']
+        ax.set_title(
+            f"{timeline['home_team']} {score['home']}-{score['away']} {timeline['away_team']}",
+            fontsize=10, fontweight='bold'
+        )
+        ax.grid(True, alpha=0.3)
+
+    for ax in axes.flat[len(timelines):]:
+        ax.set_visible(False)
+
+    axes[0, 0].set_xlim(0, 90)
+    axes[0, 0].set_ylim(-110, 110)
+    fig.suptitle(title, fontsize=14, fontweight='bold')
+    fig.supxlabel('시간(분)')
+    fig.supylabel('모멘텀 (+: 홈 / -: 원정)')
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="라운드(game_day) 경기 흐름 대시보드 생성")
+    parser.add_argument('raw_data_path', help="raw_data.csv, 파티션 또는 이벤트 저장소 경로")
+    parser.add_argument('match_info_path', help="match_info.csv 경로")
+    parser.add_argument('game_day', type=int, help="라운드 번호")
+    parser.add_argument('--output', help="출력 경로 (기본값: round_{game_day}_dashboard.png)")
+    parser.add_argument('--method', default='rules', help="변곡점 탐지 방법 (rules, cusum, pelt)")
+    args = parser.parse_args()
+
+    game_ids = round_game_ids(load_match_info(args.match_info_path), args.game_day)
+    timelines = compute_round_timelines(args.raw_data_path, args.match_info_path, game_ids, args.method)
+    if not timelines:
+        parser.error(f"{args.game_day}라운드 경기 데이터를 찾을 수 없습니다.")
+
+    output = args.output or f"round_{args.game_day}_dashboard.png"
+    plot_round_dashboard(timelines, output, f"{args.game_day}라운드 경기 흐름")
+    print(f"{len(timelines)}경기 대시보드 저장 완료: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+그래프 데이터 모듈 (matplotlib 없이 차트 데이터만 계산)
+
+웹 프런트엔드가 직접 차트를 그릴 수 있도록 plotter의 각 그래프가 쓰는 값을
+작은 JSON으로 반환합니다.
+
+- 좌표는 소수 첫째 자리(0-100 좌표 기준 0.1)로 양자화
+- 점/화살표 목록은 객체 배열 대신 열(column) 배열 ({'x': [...], 'y': [...]})
+- 히트맵은 [y 칸][x 칸] 정수 격자
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from src.data.models import MatchData, TurningPoint
+from src.analysis.turning_point import compute_window_momentum
+from src.analysis.player_analysis import PlayerActivity, get_key_players
+
+# 좌표 양자화 자릿수 (0-100 좌표 기준)
+COORDINATE_DECIMALS = 1
+# 선수 움직임 마커 범주 (범주 코드 = 순서)
+MARKER_CATEGORIES = ('shot', 'successful_pass', 'failed_pass', 'defense')
+# 변곡점 주변 분석 범위 (분, 전후 각각)
+TIME_WINDOW = 5
+# 변곡점 전후 지표 양자화 자릿수 (없는 지표는 그대로)
+METRIC_DECIMALS = {'possession': 1, 'xg': 3, 'pass_success_rate': 1}
+
+
+def _quantize(values, decimals: int = COORDINATE_DECIMALS) -> list:
+    return np.round(np.asarray(values, dtype=float), decimals).tolist()
+
+
+def _marker_category(event) -> int:
+    """이벤트의 MARKER_CATEGORIES 범주 코드 (해당 없으면 -1)"""
+    if event.x is None or event.y is None:
+        return -1
+    if event.event_type == 'shot':
+        return 0
+    if event.event_type == 'pass':
+        if event.success is True:
+            return 1
+        if event.success is False:
+            return 2
+        return -1
+    if event.event_type == 'defense':
+        return 3
+    return -1
+
+
+def player_marker_arrays(activity: PlayerActivity) -> Dict[str, np.ndarray]:
+    """
+    선수 이벤트를 한 번만 훑어 마커 배열 생성
+
+    Returns:
+        - x, y: 이벤트 좌표 (좌표 없으면 NaN)
+        - category: MARKER_CATEGORIES 범주 코드 (해당 없음 -1)
+    """
+    events = activity.events
+    n = len(events)
+    x = np.fromiter((np.nan if e.x is None else e.x for e in events), dtype=float, count=n)
+    y = np.fromiter((np.nan if e.y is None else e.y for e in events), dtype=float, count=n)
+    category = np.fromiter((_marker_category(e) for e in events), dtype=np.int8, count=n)
+    return {'x': x, 'y': y, 'category': category}
+
+
+def position_grid(x: np.ndarray, y: np.ndarray, grid_size: int = 20) -> np.ndarray:
+    """
+    좌표를 (grid_size, grid_size) 격자 빈도로 집계 ([y 칸, x 칸], 경기장 밖 좌표 제외)
+    """
+    inside = (x >= 0) & (x <= 100) & (y >= 0) & (y <= 100)
+    grid_x = np.minimum((x[inside] / 100 * grid_size).astype(np.int64), grid_size - 1)
+    grid_y = np.minimum((y[inside] / 100 * grid_size).astype(np.int64), grid_size - 1)
+    counts = np.bincount(grid_y * grid_size + grid_x, minlength=grid_size * grid_size)
+    return counts.reshape(grid_size, grid_size).astype(float)
+
+
+def shot_goal_x(event, home_team: str) -> int:
+    """
+    슈팅 방향의 골대 x 좌표
+
+    데이터는 항상 왼쪽→오른쪽으로 통일되어 있으므로
+    전반: 홈팀은 오른쪽(x=100), 원정팀은 왼쪽(x=0) / 후반: 반대
+    """
+    is_home_team = event.team == home_team
+    if event.minute < 45:
+        return 100 if is_home_team else 0
+    return 0 if is_home_team else 100
+
+
+def select_turning_point_events(window_events: list, minute: int, limit: int = 5) -> list:
+    """변곡점 ±2분의 슈팅/패스/수비 이벤트를 중요도(슈팅 > 패스 > 수비), 시점 근접 순으로 최대 limit개"""
+    events = [
+        e for e in window_events
+        if abs(e.minute - minute) <= 2
+        and e.event_type in ['shot', 'pass', 'defense']
+        and e.x is not None and e.y is not None
+    ]
+    event_priority = {'shot': 3, 'pass': 2, 'defense': 1}
+    events.sort(key=lambda e: (event_priority.get(e.event_type, 0), -abs(e.minute - minute)), reverse=True)
+    return events[:limit]
+
+
+def _pass_arrows(passes: list) -> Dict[str, list]:
+    """끝 좌표가 있는 패스의 화살표 열 배열 {'x0', 'y0', 'x1', 'y1'}"""
+    arrows = [
+        (e.x, e.y, e.metadata.get('end_x'), e.metadata.get('end_y'))
+        for e in passes
+        if e.metadata and e.metadata.get('end_x') is not None and e.metadata.get('end_y') is not None
+    ]
+    columns = np.array(arrows, dtype=float).reshape(-1, 4)
+    return {name: _quantize(columns[:, k]) for k, name in enumerate(('x0', 'y0', 'x1', 'y1'))}
+
+
+def momentum_curve_data(
+    match_data: MatchData,
+    turning_points: List[TurningPoint],
+    win_probability: Optional[Dict[str, np.ndarray]] = None
+) -> dict:
+    """plot_momentum_curve 데이터: 5분 구간 모멘텀, 변곡점 마커, (선택) 분 단위 승리 확률"""
+    minutes, momentum = compute_window_momentum(match_data)
+    marked = [tp for tp in turning_points if tp.minute // 5 < len(momentum)]
+
+    data = {
+        'home_team': match_data.home_team,
+        'away_team': match_data.away_team,
+        'minutes': minutes.tolist(),
+        'momentum': _quantize(momentum),
+        'turning_points': {
+            'minute': [tp.minute for tp in marked],
+            'momentum': _quantize([momentum[tp.minute // 5] for tp in marked]),
+            'team_advantage': [tp.team_advantage for tp in marked],
+        },
+    }
+    if win_probability is not None:
+        data['win_probability'] = {
+            'minutes': win_probability['minutes'].astype(int).tolist(),
+            'home_win': _quantize(win_probability['home_win'], 3),
+            'draw': _quantize(win_probability['draw'], 3),
+            'away_win': _quantize(win_probability['away_win'], 3),
+        }
+    return data
+
+
+def turning_point_details_data(match_data: MatchData, turning_points: List[TurningPoint]) -> dict:
+    """create_turning_point_details 목록을 열 배열로 변환 (변곡점 순서, 전후 지표는 양자화)"""
+    # plotter가 이 모듈을 불러오므로 함수 안에서 import
+    from src.visualization.plotter import (
+        TURNING_POINT_DETAIL_FIELDS, TURNING_POINT_METRIC_FIELDS, create_turning_point_details
+    )
+
+    details = [
+        create_turning_point_details(
+            tp, match_data.home_team if tp.team_advantage == 'home' else match_data.away_team
+        )
+        for tp in turning_points
+    ]
+    columns = {field: [d[field] for d in details] for field in TURNING_POINT_DETAIL_FIELDS}
+    for attribute in ('metrics_before', 'metrics_after'):
+        columns[attribute] = {}
+        for field in TURNING_POINT_METRIC_FIELDS:
+            values = [d[attribute][field] for d in details]
+            decimals = METRIC_DECIMALS.get(field)
+            columns[attribute][field] = values if decimals is None else _quantize(values, decimals)
+    return columns
+
+
+def player_heatmap_data(
+    match_data: MatchData,
+    turning_point: TurningPoint,
+    player_activities: Dict[str, PlayerActivity],
+    show_territory: bool = False,
+    bins: int = 20
+) -> dict:
+    """
+    plot_player_heatmap 데이터
+
+    Returns:
+        - heatmap: 전체 선수 위치 [y 칸][x 칸] 빈도 격자
+        - lines: 공격/수비 라인 x 좌표
+        - passes: 성공(최대 20개)/실패(최대 10개) 패스 화살표
+        - shots: 슈팅 위치, xG, 골대 방향 x 좌표
+        - players: 영향도 상위 5명 평균 위치와 통계 (측면 표)
+        - events: 번호를 붙이는 변곡점 핵심 이벤트 (최대 5개)
+        - territory: (show_territory) 변곡점 구간 영역 지배 격자 (우세 팀 공격 방향 기준)
+    """
+    minute_start = max(0, turning_point.minute - TIME_WINDOW)
+    minute_end = min(90, turning_point.minute + TIME_WINDOW)
+    target_team = (
+        match_data.home_team if turning_point.team_advantage == 'home'
+        else match_data.away_team
+    )
+    window_events = match_data.window_events(minute_start, minute_end, target_team)
+
+    positions = [p for activity in player_activities.values() for p in activity.positions]
+    positions = np.array(positions, dtype=float).reshape(-1, 2)
+    heatmap = position_grid(positions[:, 0], positions[:, 1], bins).astype(int)
+
+    attack_x = [e.x for e in window_events if e.event_type in ['shot', 'pass'] and e.x is not None]
+    defense_x = [e.x for e in window_events if e.event_type == 'defense' and e.x is not None]
+
+    passes = [e for e in window_events if e.event_type == 'pass' and e.x is not None and e.y is not None]
+    shots = [e for e in window_events if e.event_type == 'shot' and e.x is not None and e.y is not None]
+
+    key_players = [
+        (name, activity, score)
+        for name, activity, score in get_key_players(player_activities, top_n=5)
+        if activity.positions
+    ]
+    averages = np.array([np.mean(activity.positions, axis=0) for _, activity, _ in key_players]).reshape(-1, 2)
+
+    turning_point_events = select_turning_point_events(window_events, turning_point.minute)
+
+    data = {
+        'team': target_team,
+        'minute': turning_point.minute,
+        'change_type': turning_point.change_type,
+        'heatmap': {'bins': bins, 'counts': heatmap.tolist()},
+        'lines': {
+            'attack_x': round(float(np.mean(attack_x)), COORDINATE_DECIMALS) if attack_x else None,
+            'defense_x': round(float(np.mean(defense_x)), COORDINATE_DECIMALS) if defense_x else None,
+        },
+        'passes': {
+            'successful': _pass_arrows([e for e in passes if e.success is True][:20]),
+            'failed': _pass_arrows([e for e in passes if e.success is False][:10]),
+        },
+        'shots': {
+            'x': _quantize([e.x for e in shots]),
+            'y': _quantize([e.y for e in shots]),
+            'xg': _quantize([e.xg or 0.0 for e in shots], 3),
+            'goal_x': [shot_goal_x(e, match_data.home_team) for e in shots],
+        },
+        'players': {
+            'name': [name for name, _, _ in key_players],
+            'avg_x': _quantize(averages[:, 0]),
+            'avg_y': _quantize(averages[:, 1]),
+            'shots': [activity.shots for _, activity, _ in key_players],
+            'passes': [activity.passes for _, activity, _ in key_players],
+            'defense': [activity.defense_actions for _, activity, _ in key_players],
+            'xg': _quantize([activity.xg_contribution for _, activity, _ in key_players], 3),
+            'impact': [score for _, _, score in key_players],
+        },
+        'events': {
+            'x': _quantize([e.x for e in turning_point_events]),
+            'y': _quantize([e.y for e in turning_point_events]),
+            'event_type': [e.event_type for e in turning_point_events],
+            'player': [(e.metadata or {}).get('player_name', '') for e in turning_point_events],
+            'xg': _quantize([e.xg or 0.0 for e in turning_point_events], 3),
+        },
+    }
+
+    if show_territory:
+        from src.analysis.territory import get_territory_grid, territory_for_team
+
+        territory = get_territory_grid(match_data)
+        window_index = min(turning_point.minute // 5, len(territory['window_starts']) - 1)
+        dominance = territory_for_team(territory['dominance'][window_index], turning_point.team_advantage)
+        data['territory'] = np.round(dominance, 2).tolist()
+    return data
+
+
+def player_movements_data(
+    match_data: MatchData,
+    turning_point: TurningPoint,
+    player_activities: Dict[str, PlayerActivity],
+    top_n: int = 5,
+    grid_size: int = 20
+) -> dict:
+    """
+    plot_player_movements 데이터
+
+    선수별 위치 격자([y 칸][x 칸])와 마커 열 배열(x, y, category: MARKER_CATEGORIES 인덱스)
+    """
+    target_team = (
+        match_data.home_team if turning_point.team_advantage == 'home'
+        else match_data.away_team
+    )
+    players = []
+    for player_name, activity, impact_score in get_key_players(player_activities, top_n):
+        positions = np.array(activity.positions, dtype=float).reshape(-1, 2)
+        markers = player_marker_arrays(activity)
+        keep = markers['category'] >= 0
+        players.append({
+            'name': player_name,
+            'shots': activity.shots,
+            'passes': activity.passes,
+            'defense': activity.defense_actions,
+            'xg': round(activity.xg_contribution, 3),
+            'impact': impact_score,
+            'grid': position_grid(positions[:, 0], positions[:, 1], grid_size).astype(int).tolist(),
+            'markers': {
+                'x': _quantize(markers['x'][keep]),
+                'y': _quantize(markers['y'][keep]),
+                'category': markers['category'][keep].tolist(),
+            },
+        })
+    return {
+        'team': target_team,
+        'minute': turning_point.minute,
+        'categories': list(MARKER_CATEGORIES),
+        'players': players,
+    }
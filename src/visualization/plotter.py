@@ -1,80 +1,187 @@
 """
 경기 흐름 시각화 모듈
 """
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import matplotlib.font_manager as fm
-import matplotlib.gridspec as gridspec
-from matplotlib.table import Table
+import threading
+from functools import lru_cache
 import numpy as np
-import seaborn as sns
 from typing import List, Dict, Optional
 from src.data.models import MatchData, MomentumScore, TurningPoint
-from src.analysis.metrics import calculate_time_window_metrics, calculate_momentum_score
+from src.analysis.turning_point import compute_window_momentum
 from src.analysis.player_analysis import PlayerActivity
+from src.analysis.territory import get_territory_grid, territory_for_team
+from src.visualization.plot_data import (
+    momentum_curve_data,
+    player_heatmap_data,
+    player_movements_data,
+    player_marker_arrays,
+    position_grid,
+    select_turning_point_events,
+    shot_goal_x,
+)
 
-# 한글 폰트 설정
-def setup_korean_font():
-    """한글 폰트 설정"""
-    # macOS에서 사용 가능한 한글 폰트 목록
-    korean_fonts = ['AppleGothic', 'NanumGothic', 'Malgun Gothic', 'NanumBarunGothic']
-    
-    # 시스템에 설치된 폰트 확인
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
-    
-    # 사용 가능한 한글 폰트 찾기
-    for font in korean_fonts:
+# 그리기 라이브러리 (matplotlib, seaborn)는 API/CLI 시작을 늦추지 않도록
+# 첫 렌더링 때 load_plotting_libraries()에서 불러옵니다.
+plt = None
+mpatches = None
+gridspec = None
+sns = None
+
+# pyplot 전역 상태(현재 그림, rcParams)는 스레드 안전하지 않으므로
+# 한 프로세스 안의 여러 스레드(API 스레드 풀 등)에서 그릴 때는 이 잠금으로 한 번에 하나씩 그립니다.
+PYPLOT_LOCK = threading.Lock()
+
+# 우선순위 순 한글 폰트 후보 (macOS / 나눔 / Windows)
+KOREAN_FONTS = ['AppleGothic', 'NanumGothic', 'Malgun Gothic', 'NanumBarunGothic']
+
+
+@lru_cache(maxsize=None)
+def find_korean_font() -> Optional[str]:
+    """설치된 한글 폰트 이름 (프로세스당 한 번만 탐색)"""
+    import matplotlib.font_manager as fm
+
+    available_fonts = {f.name for f in fm.fontManager.ttflist}
+    for font in KOREAN_FONTS:
         if font in available_fonts:
-            plt.rcParams['font.family'] = font
-            plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
             return font
     
     # 한글 폰트를 찾지 못한 경우 경고
     print("경고: 한글 폰트를 찾을 수 없습니다. 한글이 깨질 수 있습니다.")
-    plt.rcParams['axes.unicode_minus'] = False
     return None
 
-# 모듈 로드 시 한글 폰트 설정
-setup_korean_font()
+
+# 한글 폰트 설정
+def setup_korean_font():
+    """한글 폰트 설정 (seaborn 스타일 적용 등으로 rcParams가 바뀐 뒤 다시 호출 가능)"""
+    import matplotlib
+
+    font = find_korean_font()
+    if font:
+        matplotlib.rcParams['font.family'] = font
+    matplotlib.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+    return font
+
+
+def load_plotting_libraries():
+    """첫 렌더링 때 matplotlib/seaborn을 불러오고 한글 폰트 설정 (이후 호출은 바로 반환)"""
+    global plt, mpatches, gridspec, sns
+    if plt is not None:
+        return
+
+    import matplotlib.pyplot as pyplot
+    import matplotlib.patches as patches
+    import matplotlib.gridspec as grid
+    import seaborn
+
+    mpatches, gridspec, sns = patches, grid, seaborn
+    plt = pyplot
+    setup_korean_font()
+
+
+# 경기장 스타일
+# - heatmap: 잔디색 필드와 테두리, 하프라인, 센터 서클, 페널티 박스 (히트맵 상세 그래프)
+# - movements: 점선 하프라인, 페널티 박스, 20 단위 보조 격자 (선수 움직임 그래프)
+PITCH_STYLES = ('heatmap', 'movements')
+
+
+@lru_cache(maxsize=None)
+def _pitch_geometry(style: str):
+    """
+    경기장 선 경로와 선별 속성 (0-100 좌표, 프로세스당 한 번만 생성)
+
+    Returns:
+        (경로 목록, 선 종류 목록, 선 굵기 목록, 선 색상 목록, 채우기 색상 목록)
+    """
+    from matplotlib.path import Path
+
+    def rectangle(x0, y0, width, height):
+        return Path([(x0, y0), (x0 + width, y0), (x0 + width, y0 + height), (x0, y0 + height), (x0, y0)])
+
+    white = (1.0, 1.0, 1.0, 0.6)
+    no_fill = (0.0, 0.0, 0.0, 0.0)
+    halfway = Path([(50, 0), (50, 100)])
+    penalty_boxes = [rectangle(0, 20, 20, 60), rectangle(80, 20, 20, 60)]
+
+    if style == 'heatmap':
+        circle = Path.circle((50, 50), 10)
+        lines = [
+            # 필드 (#22312b 잔디색 채우기 + 흰 테두리)
+            (rectangle(0, 0, 100, 100), 'solid', 2.0, (1.0, 1.0, 1.0, 1.0), (0.133, 0.192, 0.169, 1.0)),
+            (halfway, 'solid', 1.5, white, no_fill),
+            (circle, 'solid', 1.5, white, no_fill),
+            *[(box, 'solid', 1.5, white, no_fill) for box in penalty_boxes],
+        ]
+    elif style == 'movements':
+        grid_color = (0.69, 0.69, 0.69, 0.2)
+        grid_lines = [
+            (Path([(v, 0), (v, 100)]), 'dashed', 0.8, grid_color, no_fill) for v in range(0, 101, 20)
+        ] + [
+            (Path([(0, v), (100, v)]), 'dashed', 0.8, grid_color, no_fill) for v in range(0, 101, 20)
+        ]
+        lines = [
+            *grid_lines,
+            (halfway, 'dashed', 1.5, white, no_fill),
+            *[(box, 'solid', 1.5, white, no_fill) for box in penalty_boxes],
+        ]
+    else:
+        raise ValueError(f"지원하지 않는 경기장 스타일입니다: {style}")
+
+    paths, linestyles, linewidths, colors, facecolors = zip(*lines)
+    return list(paths), list(linestyles), list(linewidths), list(colors), list(facecolors)
+
+
+def draw_pitch(ax, style: str = 'heatmap', zorder: float = 1):
+    """
+    캐시된 경기장 선을 축에 컬렉션 하나로 추가
+
+    선 경로는 한 번만 만들어 재사용하고, 축마다 아티스트 하나(PathCollection)만 그리므로
+    여러 변곡점/선수를 연속 렌더링해도 경기장 그리기 비용이 거의 들지 않습니다.
+    """
+    from matplotlib.collections import PathCollection
+
+    paths, linestyles, linewidths, colors, facecolors = _pitch_geometry(style)
+    pitch = PathCollection(
+        paths,
+        facecolors=facecolors,
+        edgecolors=colors,
+        linewidths=linewidths,
+        linestyles=linestyles,
+        zorder=zorder,
+    )
+    ax.add_collection(pitch, autolim=False)
+    return pitch
 
 
 def plot_momentum_curve(
     match_data: MatchData,
     turning_points: List[TurningPoint],
-    save_path: str = None
+    save_path: str = None,
+    win_probability: Optional[Dict[str, np.ndarray]] = None,
+    data_only: bool = False
 ):
     """
     모멘텀 곡선 및 변곡점 시각화 (개선된 버전)
+
+    win_probability(compute_win_probability 결과)를 주면 보조 축에 분 단위 승리 확률 곡선을 함께 그립니다.
+    data_only=True면 그리지 않고 차트 데이터(plot_data.momentum_curve_data)만 반환합니다.
     """
+    if data_only:
+        return momentum_curve_data(match_data, turning_points, win_probability)
+    
+    load_plotting_libraries()
+    
     # seaborn 스타일 설정
     sns.set_style("whitegrid")
     sns.set_palette("husl")
     plt.rcParams['font.size'] = 12
     plt.rcParams['font.weight'] = 'bold'
     
-    # 한글 폰트 설정 (기존 함수 활용)
+    # seaborn 스타일이 글꼴 설정을 덮어쓰므로 한글 폰트 다시 적용 (탐색 결과는 캐시)
     setup_korean_font()
     
-    events = match_data.events
-    
-    # 5분 단위 모멘텀 점수 계산
-    minutes = []
-    momentum_scores = []
-    
-    for minute in range(0, 90, 5):
-        minute_end = min(minute + 5, 90)
-        
-        home_metrics = calculate_time_window_metrics(
-            events, match_data.home_team, minute, minute_end
-        )
-        away_metrics = calculate_time_window_metrics(
-            events, match_data.away_team, minute, minute_end
-        )
-        
-        momentum = calculate_momentum_score(home_metrics, away_metrics)
-        
-        minutes.append(minute)
-        momentum_scores.append(momentum)
+    # 5분 단위 모멘텀 점수 계산 (모든 구간을 배열 연산으로 한 번에)
+    minute_array, momentum_array = compute_window_momentum(match_data)
+    minutes = minute_array.tolist()
+    momentum_scores = momentum_array.tolist()
     
     # 그래프 생성 (개선된 크기)
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -143,7 +250,22 @@ def plot_momentum_curve(
     home_patch = mpatches.Patch(color='blue', alpha=0.4, label=match_data.home_team)
     away_patch = mpatches.Patch(color='red', alpha=0.4, label=match_data.away_team)
     turning_patch = mpatches.Patch(color='gold', label='변곡점')
-    ax.legend(handles=[home_patch, away_patch, turning_patch], 
+    legend_handles = [home_patch, away_patch, turning_patch]
+
+    # 승리 확률 곡선 (보조 축, 0-100%)
+    if win_probability is not None:
+        prob_ax = ax.twinx()
+        prob_minutes = win_probability['minutes']
+        home_line, = prob_ax.plot(prob_minutes, win_probability['home_win'] * 100,
+                                  color='navy', lw=1.5, linestyle=':', label=f'{match_data.home_team} 승리 확률')
+        away_line, = prob_ax.plot(prob_minutes, win_probability['away_win'] * 100,
+                                  color='darkred', lw=1.5, linestyle=':', label=f'{match_data.away_team} 승리 확률')
+        prob_ax.set_ylim(0, 100)
+        prob_ax.set_ylabel('승리 확률(%)', fontsize=14, fontweight='bold')
+        prob_ax.grid(False)
+        legend_handles += [home_line, away_line]
+
+    ax.legend(handles=legend_handles, 
              loc='upper left', frameon=True, fancybox=True, shadow=True, fontsize=11)
     
     plt.tight_layout()
@@ -156,6 +278,13 @@ def plot_momentum_curve(
     plt.close()
 
 
+# 변곡점 상세 정보 필드 (순서대로) / 전후 구간 지표 필드
+TURNING_POINT_DETAIL_FIELDS = (
+    'minute', 'period', 'time_seconds', 'team', 'change_type', 'indicators', 'explanation', 'confidence',
+)
+TURNING_POINT_METRIC_FIELDS = ('possession', 'shots', 'xg', 'pass_success_rate')
+
+
 def create_turning_point_details(
     turning_point: TurningPoint,
     team_name: str
@@ -163,32 +292,23 @@ def create_turning_point_details(
     """
     변곡점 상세 정보 딕셔너리 생성
     """
-    return {
-        'minute': turning_point.minute,
-        'team': team_name,
-        'change_type': turning_point.change_type,
-        'indicators': turning_point.indicators,
-        'explanation': turning_point.explanation,
-        'metrics_before': {
-            'possession': turning_point.metrics_before.possession,
-            'shots': turning_point.metrics_before.shots,
-            'xg': turning_point.metrics_before.xg,
-            'pass_success_rate': turning_point.metrics_before.pass_success_rate,
-        },
-        'metrics_after': {
-            'possession': turning_point.metrics_after.possession,
-            'shots': turning_point.metrics_after.shots,
-            'xg': turning_point.metrics_after.xg,
-            'pass_success_rate': turning_point.metrics_after.pass_success_rate,
-        }
+    details = {
+        field: team_name if field == 'team' else getattr(turning_point, field)
+        for field in TURNING_POINT_DETAIL_FIELDS
     }
+    for attribute in ('metrics_before', 'metrics_after'):
+        window = getattr(turning_point, attribute)
+        details[attribute] = {field: getattr(window, field) for field in TURNING_POINT_METRIC_FIELDS}
+    return details
 
 
 def plot_player_heatmap(
     match_data: MatchData,
     turning_point: TurningPoint,
     player_activities: Dict[str, PlayerActivity],
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    show_territory: bool = False,
+    data_only: bool = False
 ):
     """
     변곡점 시점의 상세한 선수 활동 히트맵 생성
@@ -202,27 +322,38 @@ def plot_player_heatmap(
         turning_point: 변곡점 정보
         player_activities: 선수별 활동 정보
         save_path: 저장 경로
+        show_territory: 영역 지배 격자 레이어 표시 여부
+        data_only: True면 그리지 않고 차트 데이터(plot_data.player_heatmap_data)만 반환
     """
+    if data_only:
+        return player_heatmap_data(match_data, turning_point, player_activities, show_territory)
+    
     # 기본 히트맵 함수 호출 (matplotlib 사용)
-    return plot_player_heatmap_basic(match_data, turning_point, player_activities, save_path)
+    return plot_player_heatmap_basic(
+        match_data, turning_point, player_activities, save_path, show_territory
+    )
 
 
 def plot_player_heatmap_basic(
     match_data: MatchData,
     turning_point: TurningPoint,
     player_activities: Dict[str, PlayerActivity],
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    show_territory: bool = False
 ):
     """
     개선된 히트맵 시각화
     - 변곡점과 주요 선수 위치를 최우선으로 강조
     - 단순화된 색상 팔레트
     - 좌측 70% 필드, 우측 30% 통계/설명
+    - show_territory: 변곡점 구간의 영역 지배 격자 레이어 (파랑: 우세 팀, 빨강: 상대 팀)
     """
     if not player_activities:
         print("히트맵을 생성할 선수 데이터가 없습니다.")
         return
     
+    load_plotting_libraries()
+    
     # 변곡점 시점 주변 이벤트 추출
     time_window = 5
     minute_start = max(0, turning_point.minute - time_window)
@@ -233,24 +364,11 @@ def plot_player_heatmap_basic(
         else match_data.away_team
     )
     
-    # 해당 시간대의 이벤트 필터링
-    window_events = [
-        e for e in match_data.events
-        if minute_start <= e.minute < minute_end
-        and e.team == target_team
-    ]
+    # 해당 시간대의 이벤트 조회 (분 단위 인덱스)
+    window_events = match_data.window_events(minute_start, minute_end, target_team)
     
-    # 변곡점 관련 이벤트 추출 (변곡점 번호 표시용)
-    turning_point_events = [
-        e for e in window_events
-        if abs(e.minute - turning_point.minute) <= 2
-        and e.event_type in ['shot', 'pass', 'defense']
-        and e.x is not None and e.y is not None
-    ]
-    # 중요도 순으로 정렬 (슈팅 > 패스 > 수비)
-    event_priority = {'shot': 3, 'pass': 2, 'defense': 1}
-    turning_point_events.sort(key=lambda e: (event_priority.get(e.event_type, 0), -abs(e.minute - turning_point.minute)), reverse=True)
-    turning_point_events = turning_point_events[:5]  # 최대 5개만 표시
+    # 변곡점 관련 이벤트 추출 (변곡점 번호 표시용, 중요도 순 최대 5개)
+    turning_point_events = select_turning_point_events(window_events, turning_point.minute)
     
     # 그래프 생성 - GridSpec으로 레이아웃 구성 (70:30), 높이 증가 (모든 카드가 들어오도록)
     fig = plt.figure(figsize=(18, 13))
@@ -266,20 +384,18 @@ def plot_player_heatmap_basic(
     ax_side.set_facecolor('#ffffff')
     ax_side.axis('off')
     
-    # 축구장 필드 그리기 (단순화)
-    field_rect = mpatches.Rectangle((0, 0), 100, 100, linewidth=2, 
-                                   edgecolor='white', facecolor='#22312b', zorder=0)
-    ax.add_patch(field_rect)
-    ax.plot([50, 50], [0, 100], 'w-', linewidth=1.5, alpha=0.6, zorder=1)
-    center_circle = plt.Circle((50, 50), 10, fill=False, edgecolor='white', 
-                              linewidth=1.5, alpha=0.6, zorder=1)
-    ax.add_patch(center_circle)
-    penalty_left = mpatches.Rectangle((0, 20), 20, 60, fill=False, 
-                                     edgecolor='white', linewidth=1.5, alpha=0.6, zorder=1)
-    ax.add_patch(penalty_left)
-    penalty_right = mpatches.Rectangle((80, 20), 20, 60, fill=False, 
-                                      edgecolor='white', linewidth=1.5, alpha=0.6, zorder=1)
-    ax.add_patch(penalty_right)
+    # 축구장 필드 그리기 (캐시된 경기장 선, 배경은 축 색상)
+    draw_pitch(ax, 'heatmap')
+    
+    # 영역 지배 레이어 (우세 팀 공격 방향 기준, 히트맵 아래에 표시)
+    if show_territory:
+        territory = get_territory_grid(match_data)
+        window_index = min(turning_point.minute // 5, len(territory['window_starts']) - 1)
+        dominance = territory_for_team(
+            territory['dominance'][window_index], turning_point.team_advantage
+        )
+        ax.imshow(dominance, origin='lower', extent=[0, 100, 0, 100], cmap='coolwarm_r',
+                  vmin=-1, vmax=1, alpha=0.3, interpolation='nearest', zorder=1)
     
     # 전체 히트맵 생성 (단색 그라디언트: 연한 노랑 → 진한 빨강)
     all_x, all_y = [], []
@@ -348,17 +464,8 @@ def plot_player_heatmap_basic(
     # 전후반 및 홈/원정팀에 따라 슈팅 방향 결정
     shots = [e for e in window_events if e.event_type == 'shot' and e.x is not None and e.y is not None]
     for shot_event in shots:
-        # 전반/후반 판단 (minute 기준)
-        is_first_half = shot_event.minute < 45
-        is_home_team = shot_event.team == match_data.home_team
-        
-        # 슈팅 방향 결정 (데이터는 항상 왼쪽→오른쪽으로 통일되어 있음)
-        # 전반: 홈팀은 오른쪽(x=100), 원정팀은 왼쪽(x=0)
-        # 후반: 홈팀은 왼쪽(x=0), 원정팀은 오른쪽(x=100)
-        if is_first_half:
-            goal_x = 100 if is_home_team else 0
-        else:
-            goal_x = 0 if is_home_team else 100
+        # 슈팅 방향 결정 (전후반 및 홈/원정팀 기준 골대)
+        goal_x = shot_goal_x(shot_event, match_data.home_team)
         goal_y = 50
         
         # xG에 따라 색상과 크기 결정 (따뜻한색 계열)
@@ -857,12 +964,26 @@ def plot_player_heatmap_basic(
     plt.close()
 
 
+# 선수 움직임 마커 범주별 스타일 (순서는 plot_data.MARKER_CATEGORIES 범주 코드와 같음)
+MOVEMENT_MARKERS = (
+    ('shot', dict(c='red', marker='*', s=200, edgecolors='black', linewidths=1.5,
+                  alpha=0.9, zorder=10, label='슈팅')),
+    ('successful_pass', dict(c='#00CED1', marker='s', s=80, edgecolors='white', linewidths=1,
+                             alpha=0.8, zorder=9, label='성공한 패스')),
+    ('failed_pass', dict(c='#FF8C00', marker='x', s=100, linewidths=2,
+                         alpha=0.7, zorder=8, label='실패한 패스')),
+    ('defense', dict(c='green', marker='^', s=80, edgecolors='white', linewidths=1,
+                     alpha=0.8, zorder=8, label='수비')),
+)
+
+
 def plot_player_movements(
     match_data: MatchData,
     turning_point: TurningPoint,
     player_activities: Dict[str, PlayerActivity],
     top_n: int = 5,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    data_only: bool = False
 ):
     """
     주요 선수들의 움직임 패턴 시각화
@@ -873,7 +994,11 @@ def plot_player_movements(
         player_activities: 선수별 활동 정보
         top_n: 표시할 상위 선수 수
         save_path: 저장 경로
+        data_only: True면 그리지 않고 차트 데이터(plot_data.player_movements_data)만 반환
     """
+    if data_only:
+        return player_movements_data(match_data, turning_point, player_activities, top_n)
+    
     if not player_activities:
         print("시각화할 선수 데이터가 없습니다.")
         return
@@ -886,6 +1011,8 @@ def plot_player_movements(
         print("주요 선수를 찾을 수 없습니다.")
         return
     
+    load_plotting_libraries()
+    
     # 서브플롯 생성
     n_players = len(key_players)
     cols = min(3, n_players)
@@ -908,65 +1035,21 @@ def plot_player_movements(
         # 선수 위치 히트맵 (단순하게)
         if activity.positions:
             positions = np.array(activity.positions)
-            x_positions = positions[:, 0]
-            y_positions = positions[:, 1]
-            
-            # 히트맵 그리드 생성
-            grid_size = 20
-            heatmap_data = np.zeros((grid_size, grid_size))
-            
-            for x, y in zip(x_positions, y_positions):
-                if 0 <= x <= 100 and 0 <= y <= 100:
-                    grid_x = int(x / 100 * grid_size)
-                    grid_y = int(y / 100 * grid_size)
-                    grid_x = min(grid_x, grid_size - 1)
-                    grid_y = min(grid_y, grid_size - 1)
-                    heatmap_data[grid_y, grid_x] += 1
+            heatmap_data = position_grid(positions[:, 0], positions[:, 1])
             
             # 히트맵 플롯
             im = ax.imshow(heatmap_data, cmap='YlOrRd', interpolation='gaussian',
                           extent=[0, 100, 0, 100], aspect='auto', alpha=0.6)
             
-            # 이벤트 타입별 마커 (더 명확하게)
-            shots = [e for e in activity.events if e.event_type == 'shot' and e.x is not None and e.y is not None]
-            successful_passes = [e for e in activity.events if e.event_type == 'pass' and e.success is True and e.x is not None and e.y is not None]
-            failed_passes = [e for e in activity.events if e.event_type == 'pass' and e.success is False and e.x is not None and e.y is not None]
-            defense_actions = [e for e in activity.events if e.event_type == 'defense' and e.x is not None and e.y is not None]
-            
-            # 슈팅 (별 모양, 빨강)
-            if shots:
-                shot_x = [e.x for e in shots]
-                shot_y = [e.y for e in shots]
-                ax.scatter(shot_x, shot_y, c='red', marker='*', s=200, 
-                          edgecolors='black', linewidths=1.5, alpha=0.9, zorder=10, label='슈팅')
-            
-            # 성공한 패스 (파란 사각형)
-            if successful_passes:
-                pass_x = [e.x for e in successful_passes]
-                pass_y = [e.y for e in successful_passes]
-                ax.scatter(pass_x, pass_y, c='#00CED1', marker='s', s=80, 
-                          edgecolors='white', linewidths=1, alpha=0.8, zorder=9, label='성공한 패스')
-            
-            # 실패한 패스 (주황 X)
-            if failed_passes:
-                fail_x = [e.x for e in failed_passes]
-                fail_y = [e.y for e in failed_passes]
-                ax.scatter(fail_x, fail_y, c='#FF8C00', marker='x', s=100, 
-                          linewidths=2, alpha=0.7, zorder=8, label='실패한 패스')
-            
-            # 수비 액션 (초록 삼각형)
-            if defense_actions:
-                def_x = [e.x for e in defense_actions]
-                def_y = [e.y for e in defense_actions]
-                ax.scatter(def_x, def_y, c='green', marker='^', s=80, 
-                          edgecolors='white', linewidths=1, alpha=0.8, zorder=8, label='수비')
+            # 이벤트 타입별 마커: 범주마다 scatter 한 번 (이벤트 수와 무관하게 축당 최대 4개 아티스트)
+            markers = player_marker_arrays(activity)
+            for code, (_, style) in enumerate(MOVEMENT_MARKERS):
+                selected = markers['category'] == code
+                if selected.any():
+                    ax.scatter(markers['x'][selected], markers['y'][selected], **style)
         
-        # 필드 라인
-        ax.axvline(x=50, color='white', linestyle='--', linewidth=1.5, alpha=0.6)
-        ax.add_patch(mpatches.Rectangle((0, 20), 20, 60, fill=False, 
-                                       edgecolor='white', linewidth=1.5, alpha=0.6))
-        ax.add_patch(mpatches.Rectangle((80, 20), 20, 60, fill=False, 
-                                       edgecolor='white', linewidth=1.5, alpha=0.6))
+        # 필드 라인과 보조 격자 (캐시된 경기장 선)
+        draw_pitch(ax, 'movements')
         
         # 제목
         stats_text = (
@@ -982,7 +1065,6 @@ def plot_player_movements(
         ax.set_xlim(0, 100)
         ax.set_ylim(0, 100)
         ax.invert_yaxis()
-        ax.grid(True, alpha=0.2, linestyle='--')
         
         # 범례 추가 (첫 번째 서브플롯에만)
         if idx == 0:
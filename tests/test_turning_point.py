@@ -0,0 +1,110 @@
+"""
+변곡점 규칙 평가 회귀 테스트
+
+배열 연산으로 바꾼 evaluate_turning_point_rules / detect_turning_points_batch가
+기존 구간별 루프(calculate_time_window_metrics + calculate_momentum_score)와
+같은 구간, 같은 지표를 확정하는지 확인합니다.
+"""
+from typing import List, Tuple
+
+import pytest
+
+from src.data.models import MatchData
+from src.main import create_sample_match_data
+from src.analysis.metrics import calculate_time_window_metrics, calculate_momentum_score
+from src.analysis.shape import SHAPE_FIELDS, get_team_shape
+from src.analysis.turning_point import (
+    INDICATOR_RULES,
+    SHAPE_INDICATOR_RULES,
+    SHAPE_THRESHOLDS,
+    TURNING_POINT_THRESHOLDS,
+    WINDOW_SIZE,
+    detect_turning_points_batch,
+)
+
+MATCH_LENGTH = 90
+
+
+def labeled_sample_match() -> MatchData:
+    """
+    샘플 경기의 이벤트 팀 이름('홈팀'/'원정팀')을 경기 팀 이름으로 맞춘 복사본
+
+    create_sample_match_data는 이벤트 팀 이름이 home_team/away_team과 달라
+    그대로는 모든 구간 지표가 0이 되어 변곡점이 확정되지 않습니다.
+    """
+    match_data = create_sample_match_data()
+    names = {'홈팀': match_data.home_team, '원정팀': match_data.away_team}
+    events = [e.model_copy(update={'team': names.get(e.team, e.team)}) for e in match_data.events]
+    return match_data.model_copy(update={'events': events})
+
+
+def reference_turning_points(match_data, use_shape: bool = False) -> List[Tuple[int, str, List[str]]]:
+    """기존 구간별 루프로 계산한 (구간 시작 분, 우세 팀, 지표 목록)"""
+    limits = {**TURNING_POINT_THRESHOLDS, **SHAPE_THRESHOLDS}
+    rules = INDICATOR_RULES + SHAPE_INDICATOR_RULES if use_shape else INDICATOR_RULES
+    shape = get_team_shape(match_data, WINDOW_SIZE) if use_shape else None
+
+    windows = []
+    for minute in range(0, MATCH_LENGTH, WINDOW_SIZE):
+        minute_end = min(minute + WINDOW_SIZE, MATCH_LENGTH)
+        home = calculate_time_window_metrics(match_data.events, match_data.home_team, minute, minute_end)
+        away = calculate_time_window_metrics(match_data.events, match_data.away_team, minute, minute_end)
+        windows.append((home, away, calculate_momentum_score(home, away)))
+
+    def value(i: int, team_index: int, name: str) -> float:
+        if name in SHAPE_FIELDS:
+            return float(shape[team_index, i, SHAPE_FIELDS.index(name)])
+        return float(getattr(windows[i][team_index], name))
+
+    result = []
+    for i in range(1, len(windows)):
+        curr_momentum = windows[i][2]
+        if abs(curr_momentum - windows[i - 1][2]) < limits['momentum_change']:
+            continue
+        indicators = [
+            indicator for indicator, name in rules
+            if any(abs(value(i, t, name) - value(i - 1, t, name)) >= limits[name] for t in (0, 1))
+        ]
+        if len(indicators) >= limits['min_indicators']:
+            team_advantage = 'home' if curr_momentum > 0 else 'away'
+            result.append((i * WINDOW_SIZE, team_advantage, indicators))
+    return result
+
+
+def summarize(turning_points) -> List[Tuple[int, str, List[str]]]:
+    return [(tp.minute, tp.team_advantage, tp.indicators) for tp in turning_points]
+
+
+@pytest.mark.parametrize('use_shape', [False, True])
+def test_sample_match_unchanged(use_shape):
+    match_data = create_sample_match_data()
+
+    actual = summarize(detect_turning_points_batch([match_data], use_shape)[0])
+
+    assert actual == reference_turning_points(match_data, use_shape)
+
+
+@pytest.mark.parametrize('use_shape', [False, True])
+def test_batch_matches_per_window_loop(use_shape):
+    match_data = labeled_sample_match()
+
+    expected = reference_turning_points(match_data, use_shape)
+    actual = summarize(detect_turning_points_batch([match_data], use_shape)[0])
+
+    assert expected, "샘플 경기에서 변곡점이 하나도 확정되지 않았습니다"
+    assert actual == expected
+
+
+@pytest.mark.parametrize('use_shape', [False, True])
+def test_batch_of_matches_equals_single_matches(use_shape):
+    sample = labeled_sample_match()
+    thinned = sample.model_copy(update={
+        'match_id': 'sample_thinned',
+        'events': [e for e in sample.events if e.minute % 7 != 3],
+    })
+    matches = [sample, thinned]
+
+    batch = detect_turning_points_batch(matches, use_shape)
+
+    for match_data, turning_points in zip(matches, batch):
+        assert summarize(turning_points) == reference_turning_points(match_data, use_shape)